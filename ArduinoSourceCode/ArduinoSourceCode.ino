@@ -7,8 +7,8 @@
  *  
  *  Created By:    Devon C. Hartlen, EIT
  *  Date:          13-Jun-2018
- *  Modified By:   
- *  Date:          
+ *  Modified By:   agent
+ *  Date:          17-Oct-2026
 */
 
 // Include libraries
@@ -21,15 +21,34 @@ Adafruit_LiquidCrystal lcd(0);
 // Generator voltage pin (Analog 5)
 const int pinGenerator = A5;
 
+// Serial output format. Must match "Select Serial Format" in the acquisition
+// script. 0 = ASCII, one "sequence,micros,voltage" line per sample at 115200
+// baud. 1 = binary frames of raw ADC counts at 115200 baud. Every sample is
+// numbered and timestamped so the acquisition script can detect lost samples
+// and rebuild the true time axis.
+#define BINARY_MODE 0
+
 // Define refresh frequencies. Units of hertz (1/s)
+#if BINARY_MODE
+int samplingFreq = 500;   // How often data is read from pin
+#else
 int samplingFreq = 100;   // How often data is read from pin
+#endif
 int displayFreq = 5;      // How often LCD screen is updated
 
-// Define millisecond counters for interrupt based sampling
+// Define microsecond counters for interrupt based sampling, and millisecond
+// counters for display updates
+unsigned long currentMicros = 0;
+unsigned long nextSampleMicros = 0;
+unsigned long samplePeriodMicros = 0;
+unsigned long sampleMicros = 0;    // time the current sample was due
+const unsigned long maxLagMicros = 20000;  // skip samples if this far behind
 unsigned long currentMillis = 0;
-unsigned long lastSampleMillis = 0;
 unsigned long lastDisplayMillis = 0;
 
+// Number of samples taken since power up. Sent with every sample
+unsigned long sampleSequence = 0;
+
 // Initialize voltage variables
 int vNew = 0;   // newly read voltage (bits)
 int vOld = 0;   // previous voltage used for filtering (bits)
@@ -37,6 +56,17 @@ float vAct = 0.0;  // actual voltage converted to volts
 float alpha = 0.995; // Low pass filter constant
 float b2v = 3.3/1024.0; // bits (arduino native 2^10 bits) to volts (V/bit)
 
+// Binary frame layout: sync header (0xA5 0x5A), sample count (1 byte),
+// sequence number of the first sample (uint32), micros() when the first
+// sample was taken (uint32), sampling period in microseconds (uint16),
+// samples as ADC counts (uint16), and a checksum (sum of all bytes after the
+// sync header, modulo 256). All values little-endian.
+#define SAMPLES_PER_FRAME 10  // Must match samplesPerFrame in SerialProtocol.py
+uint16_t frameSamples[SAMPLES_PER_FRAME]; // samples waiting to be sent (bits)
+int nFrameSamples = 0;        // number of samples currently in frameSamples
+unsigned long frameSequence = 0;  // sequence number of the frame's first sample
+unsigned long frameMicros = 0;    // micros() of the frame's first sample
+
 // This section contains initialization codes
 void setup() {
   // Initialize LCD screen size (uses 16x2 display)
@@ -47,10 +77,10 @@ void setup() {
   lcd.print("Loading...");
 
   // Set up serial communication
-  Serial.begin(9600);
+  Serial.begin(115200);
 
-  // Convert both frequencies to millis
-  samplingFreq = 1000/samplingFreq;
+  // Convert sampling frequency to micros and display frequency to millis
+  samplePeriodMicros = 1000000UL/samplingFreq;
   displayFreq = 1000/displayFreq;
 
   // Delay for suspense
@@ -60,25 +90,61 @@ void setup() {
   lcd.clear();
   lcd.setCursor(4,0);
   lcd.print("VOLTAGE:");
+
+  // First sample is due now
+  nextSampleMicros = micros();
 }  // end void setup
 
 
 // put your main code here, to run repeatedly:
 void loop() {
+  currentMicros = micros(); // retreive current micros
   currentMillis = millis(); // retreive current millis
   
-  // Check interrupt for sampling and send over serial. 
-  if ((currentMillis - lastSampleMillis) > samplingFreq) {
+  // Check interrupt for sampling and send over serial. Wraparound safe.
+  if ((long)(currentMicros - nextSampleMicros) >= 0) {
+    // If the loop fell far behind (e.g. serial output blocked), skip the
+    // missed samples rather than bunching them together. Skipped samples
+    // still use up sequence numbers, so the gap is counted as lost. A
+    // partly filled binary frame is abandoned, as its samples must be
+    // evenly spaced; its sequence numbers show as lost too
+    if ((currentMicros - nextSampleMicros) > maxLagMicros) {
+      unsigned long nSkipped = (currentMicros - nextSampleMicros)/samplePeriodMicros;
+      sampleSequence += nSkipped;
+      nextSampleMicros += nSkipped*samplePeriodMicros;
+      nFrameSamples = 0;
+    }
+    // Timestamp with the time the sample was due, so samples are exactly
+    // evenly spaced. Short delays (e.g. LCD updates) are caught up on
+    sampleMicros = nextSampleMicros;
+    nextSampleMicros += samplePeriodMicros;
     // Read voltage (bits) from analog pin
     vNew = analogRead(pinGenerator);
     // Converting bits to volts.
     vAct = vNew*b2v;
     //Saving old voltage for next iteration (in bits)
     vOld = vNew;
-    // print the actual voltage to serial
+#if BINARY_MODE
+    // Queue the raw reading and send once a frame is full
+    if (nFrameSamples == 0) {
+      frameSequence = sampleSequence;
+      frameMicros = sampleMicros;
+    }
+    frameSamples[nFrameSamples] = vNew;
+    nFrameSamples++;
+    if (nFrameSamples == SAMPLES_PER_FRAME) {
+      sendFrame();
+      nFrameSamples = 0;
+    }
+#else
+    // print the sequence number, time and actual voltage to serial
+    Serial.print(sampleSequence);
+    Serial.print(',');
+    Serial.print(sampleMicros);
+    Serial.print(',');
     Serial.println(vAct);
-    // Update lastSampleMillis to trigger next iterupt
-    lastSampleMillis = currentMillis;
+#endif
+    sampleSequence++;
   } // end interrupt for serial print
 
   // Check interrupt for lcd display update. No math here, all done above.
@@ -95,3 +161,25 @@ void loop() {
   } // end interrupt for lcd display
 
 }
+
+
+// Send one binary frame of queued samples over serial
+void sendFrame() {
+  // Arduino is little-endian, so multi-byte values are copied as is
+  uint8_t header[13] = {0xA5, 0x5A, SAMPLES_PER_FRAME};
+  uint16_t period = samplePeriodMicros;
+  memcpy(header + 3, &frameSequence, 4);
+  memcpy(header + 7, &frameMicros, 4);
+  memcpy(header + 11, &period, 2);
+  // Checksum covers everything after the sync header
+  uint8_t checksum = 0;
+  for (int i = 2; i < 13; i++) {
+    checksum += header[i];
+  }
+  for (int i = 0; i < SAMPLES_PER_FRAME; i++) {
+    checksum += lowByte(frameSamples[i]) + highByte(frameSamples[i]);
+  }
+  Serial.write(header, 13);
+  Serial.write((uint8_t*)frameSamples, 2*SAMPLES_PER_FRAME);
+  Serial.write(checksum);
+}
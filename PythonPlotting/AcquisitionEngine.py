@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+"""
+Acquisition engine for the wind turbine plotter, independent of any GUI.
+Connects to the arduinos (or opens recordings for replay, or connects to
+data shared by another plotter), and filters, records and indexes incoming
+data and computes its statistics, power, energy and spectrum, one
+TurbineChannel per turbine. The raw data can also be shared over the
+network (see StreamServer.py). The GUI calls process() once per display
+frame; a script, test or benchmark can call it from a plain loop instead,
+with no Qt or arduino required.
+
+Run directly to acquire from the command line, e.g.
+
+    python AcquisitionEngine.py /dev/ttyACM0 --duration 10 --record
+    python AcquisitionEngine.py /dev/ttyACM0 --duration 3600 --serve
+    python AcquisitionEngine.py --connect teacher-pc:47800
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: pyserial, numpy, SerialReader.py, SerialProtocol.py,
+          SignalFilters.py, SessionRecorder.py, SessionReplay.py,
+          TurbineChannel.py, PerformanceMonitor.py, SpectrumAnalyzer.py,
+          StreamServer.py, NetworkSource.py
+
+"""
+
+import argparse
+import os
+import time
+import serial
+from SerialReader import SerialReader
+from SignalFilters import ExponentialFilter
+from SerialProtocol import AsciiDecoder, PROTOCOL_TYPES, checkConnection
+from SessionRecorder import defaultRecordingPath
+from SessionReplay import ReplaySource
+from TurbineChannel import TurbineChannel
+from PerformanceMonitor import PerformanceMonitor
+from SpectrumAnalyzer import SpectrumAnalyzer, SpectrumWorker
+from StreamServer import StreamServer, DEFAULT_PORT
+from NetworkSource import connectStream
+
+
+class ConnectionFailed(IOError):
+    """No arduino sending the expected format was found on a port (or no
+    shared data at a network address)"""
+#------------------------------------------------------------------------------
+    def __init__(self, portName):
+        super(ConnectionFailed, self).__init__("Connection Failed on %s" % portName)
+        self.portName = portName
+
+
+class AcquisitionEngine(object):
+    """Acquires, filters, records and indexes data for several turbines.
+
+    Typical use is openSerialChannels (or openReplayChannels), optionally
+    startRecording, start, then process repeatedly until stop.
+    """
+    # Serial read timeout used by the reader threads. Short so stop is responsive
+    readerTimeout = 0.1
+    # Time allowed for each arduino to send a first valid sample
+    connectionTimeout = 5.0
+
+#------------------------------------------------------------------------------
+    def __init__(self, protocolType=AsciiDecoder, signalFilter=None):
+        """Engine constructor. signalFilter is copied for each channel"""
+        # Serial format sent by the arduinos
+        self.protocolType = protocolType
+        # Low pass filter applied to input data
+        if signalFilter is None:
+            signalFilter = ExponentialFilter(beta=0.150)
+        self.signalFilter = signalFilter
+        # Length of the statistics window (seconds), and load resistance
+        # (ohms) the turbines' power is delivered to
+        self.statisticsWindow = 10.0
+        self.loadResistance = 10.0
+        # Spectrum frame length (samples) and commutator ripples per rotor
+        # revolution. Frames overlap by three quarters
+        self.fftSize = 256
+        self.ripplesPerRevolution = 6
+        # Runs spectrum analysis in the background. None while disabled
+        self.spectrumWorker = None
+        # Shares raw data with other plotters. None while not sharing
+        self.streamServer = None
+        # One channel per turbine being acquired or replayed
+        self.channels = []
+        # Instrumentation shared by all channels. Off until enabled
+        self.monitor = PerformanceMonitor()
+
+#------------------------------------------------------------------------------
+    def openSerialChannels(self, portNames, progress=None):
+        """Connects to each arduino and creates its reader thread. progress,
+        if given, is called with each port name before it is checked.
+        Raises ConnectionFailed if any port has no arduino sending the
+        expected format, leaving no ports open"""
+        # All readers share one start time so their data lines up
+        startTime = time.time()
+        channels = []
+        for portName in portNames:
+            if progress is not None:
+                progress(portName)
+            # Connect to the com port and read until one sample is decoded
+            serialPort = None
+            try:
+                serialPort = serial.Serial(portName, self.protocolType.baudRate,
+                                           timeout=self.connectionTimeout)
+                if not checkConnection(serialPort, self.protocolType(),
+                                       self.connectionTimeout):
+                    raise ConnectionFailed(portName)
+            except (serial.SerialException, OSError):
+                # Close this port, if it was opened, and those already checked
+                if serialPort is not None:
+                    serialPort.close()
+                for channel in channels:
+                    channel.serialPort.close()
+                raise ConnectionFailed(portName)
+
+            # Background thread which drains the serial port
+            serialPort.timeout = self.readerTimeout
+            reader = SerialReader(serialPort, self.protocolType(), startTime=startTime,
+                                  monitor=self.monitor)
+            channels.append(TurbineChannel(portName, reader, self.signalFilter.copy(),
+                                           serialPort, self.monitor,
+                                           self.protocolType.nominalRate,
+                                           self.statisticsWindow, self.loadResistance))
+
+        # flush serial inputs so far
+        for channel in channels:
+            channel.serialPort.flushInput()
+        self.channels = channels
+        self.setupSpectrum()
+        self.setupStream()
+
+#------------------------------------------------------------------------------
+    def openReplayChannels(self, recordings, speed=1.0):
+        """Creates a replay channel for each (name, records) recording"""
+        self.channels = [TurbineChannel(name, ReplaySource(records, speed),
+                                        self.signalFilter.copy(), monitor=self.monitor,
+                                        statisticsWindow=self.statisticsWindow,
+                                        loadResistance=self.loadResistance)
+                         for name, records in recordings]
+        self.setupSpectrum()
+        self.setupStream()
+
+#------------------------------------------------------------------------------
+    def openNetworkChannels(self, address):
+        """Connects to data shared by another plotter at 'host:port', with a
+        channel per turbine it is acquiring. Raises ConnectionFailed if
+        nothing is being shared there"""
+        try:
+            connection = connectStream(address, self.connectionTimeout)
+        except (OSError, ValueError):
+            raise ConnectionFailed(address)
+        if len(connection.sources) == 0:
+            # Sharing, but not acquiring yet
+            connection.stop()
+            raise ConnectionFailed(address)
+        self.channels = [TurbineChannel("%s/%s" % (address, name), source,
+                                        self.signalFilter.copy(), monitor=self.monitor,
+                                        statisticsWindow=self.statisticsWindow,
+                                        loadResistance=self.loadResistance)
+                         for name, source in zip(connection.channelNames, connection.sources)]
+        self.setupSpectrum()
+        self.setupStream()
+
+#------------------------------------------------------------------------------
+    def startRecording(self, folder):
+        """Opens a new, time stamped recording file per turbine in folder.
+        Raises OSError if the files cannot be created"""
+        os.makedirs(folder, exist_ok=True)
+        for channel in self.channels:
+            filePath = defaultRecordingPath(folder, channel.dataSource.startTime,
+                                            channel.name if len(self.channels) > 1 else None)
+            channel.startRecording(filePath)
+
+#------------------------------------------------------------------------------
+    def setFilter(self, signalFilter):
+        """Replace the filter. The new filter starts from the next sample.
+        Each channel gets its own copy so filter state is not shared"""
+        self.signalFilter = signalFilter
+        for channel in self.channels:
+            channel.signalFilter = signalFilter.copy()
+
+#------------------------------------------------------------------------------
+    def setLoadResistance(self, loadResistance):
+        """Change the load resistance (ohms). Applies from the next sample;
+        energy generated so far is kept"""
+        self.loadResistance = loadResistance
+        for channel in self.channels:
+            channel.powerMeter.loadResistance = loadResistance
+
+#------------------------------------------------------------------------------
+    def setStatisticsWindow(self, windowSeconds):
+        """Change the length of the statistics window (seconds). Windowed
+        statistics restart from the next sample; energy is kept"""
+        self.statisticsWindow = windowSeconds
+        for channel in self.channels:
+            channel.statistics.setWindow(windowSeconds)
+
+#------------------------------------------------------------------------------
+    def enableSpectrum(self, enabled):
+        """Start or stop spectrum analysis of every channel"""
+        if enabled and self.spectrumWorker is None:
+            self.spectrumWorker = SpectrumWorker(monitor=self.monitor)
+            self.spectrumWorker.start()
+        elif not enabled and self.spectrumWorker is not None:
+            self.spectrumWorker.stop()
+            self.spectrumWorker = None
+        self.setupSpectrum()
+
+#------------------------------------------------------------------------------
+    def setSpectrumParameters(self, fftSize, ripplesPerRevolution):
+        """Change the spectrum frame length (samples) and the ripples per
+        revolution used to estimate RPM. Spectra restart from the next sample"""
+        self.fftSize = fftSize
+        self.ripplesPerRevolution = ripplesPerRevolution
+        self.setupSpectrum()
+
+#------------------------------------------------------------------------------
+    def setupSpectrum(self):
+        """Give each channel a new spectrum analyzer and the worker, or
+        neither while the spectrum is disabled"""
+        for channel in self.channels:
+            if self.spectrumWorker is None:
+                channel.spectrum = None
+            else:
+                channel.spectrum = SpectrumAnalyzer(self.fftSize, self.fftSize//4,
+                                                    ripplesPerRevolution=self.ripplesPerRevolution)
+            channel.spectrumWorker = self.spectrumWorker
+
+#------------------------------------------------------------------------------
+    def startServer(self, port=DEFAULT_PORT, host=''):
+        """Share every channel's raw data with other plotters on port.
+        Raises OSError if the port cannot be opened"""
+        if self.streamServer is None:
+            self.streamServer = StreamServer(port, host)
+            self.streamServer.start()
+        self.setupStream()
+
+#------------------------------------------------------------------------------
+    def stopServer(self):
+        """Stop sharing data and disconnect all other plotters"""
+        if self.streamServer is not None:
+            self.streamServer.stop()
+            self.streamServer = None
+        self.setupStream()
+
+#------------------------------------------------------------------------------
+    def setupStream(self):
+        """Tell the stream server's clients about the current channels, and
+        give each channel the server, or None while not sharing"""
+        if self.streamServer is not None and len(self.channels) > 0:
+            self.streamServer.setChannels([channel.name for channel in self.channels],
+                                          self.channels[0].dataSource.startTime)
+        for i, channel in enumerate(self.channels):
+            channel.streamServer = self.streamServer
+            channel.streamIndex = i
+
+#------------------------------------------------------------------------------
+    def start(self):
+        """Start background acquisition (or the replay clocks)"""
+        for channel in self.channels:
+            channel.start()
+
+#------------------------------------------------------------------------------
+    def process(self):
+        """Filter, record and index everything each reader thread received
+        (or each replay released) since the last call. Returns the number of
+        new samples"""
+        nNew = 0
+        for channel in self.channels:
+            nNew += channel.process()
+        return nNew
+
+#------------------------------------------------------------------------------
+    def sourceError(self):
+        """Return (channel name, description) of the first data source which
+        failed (e.g. a lost serial port), or None"""
+        for channel in self.channels:
+            if channel.dataSource.errorMessage is not None:
+                return channel.name, channel.dataSource.errorMessage
+        return None
+
+#------------------------------------------------------------------------------
+    def finished(self):
+        """True once every data source has run out of data (replays only)"""
+        return all(channel.dataSource.finished for channel in self.channels)
+
+#------------------------------------------------------------------------------
+    def collectCounters(self):
+        """Copy each data source's loss counters into the monitor"""
+        for channel in self.channels:
+            self.monitor.setCounter("%s dropped samples" % channel.name,
+                                    channel.dataSource.droppedSamples)
+            decoder = getattr(channel.dataSource, 'decoder', None)
+            for attribute in ['badLines', 'badFrames']:
+                if hasattr(decoder, attribute):
+                    self.monitor.setCounter("%s %s" % (channel.name, attribute),
+                                            getattr(decoder, attribute))
+            # Gaps in the sketch's sequence numbers
+            sampleClock = getattr(channel.dataSource, 'sampleClock', None)
+            for attribute in ['missingSamples', 'gaps', 'resyncs']:
+                if hasattr(sampleClock, attribute):
+                    self.monitor.setCounter("%s %s" % (channel.name, attribute),
+                                            getattr(sampleClock, attribute))
+        # Batches dropped for other plotters which could not keep up
+        if self.streamServer is not None:
+            self.monitor.setCounter("stream dropped batches",
+                                    self.streamServer.totalDroppedBatches())
+            self.monitor.setGauge("stream clients", self.streamServer.clientCount())
+
+#------------------------------------------------------------------------------
+    def stop(self):
+        """Stop reader threads, close com ports and output files"""
+        for channel in self.channels:
+            channel.stop()
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        """Discard all channels' history and peaks, ready for the next run"""
+        for channel in self.channels:
+            channel.reset()
+        # Fresh analyzers, so analysis still queued from the old run is
+        # harmlessly applied to the old ones
+        self.setupSpectrum()
+
+
+#------------------------------------------------------------------------------
+def main():
+    """Acquire from the command line and print the readings"""
+    parser = argparse.ArgumentParser(description="Acquire turbine voltages without the GUI")
+    parser.add_argument('ports', nargs='*', help="serial port of each arduino")
+    parser.add_argument('--connect', metavar='HOST:PORT',
+                        help="acquire data shared by another plotter instead of arduinos")
+    parser.add_argument('--serve', metavar='PORT', type=int, nargs='?', const=DEFAULT_PORT,
+                        help="share the data with other plotters on PORT (default %d)"
+                             % DEFAULT_PORT)
+    parser.add_argument('--format', choices=[p.name for p in PROTOCOL_TYPES],
+                        default=AsciiDecoder.name, help="serial format sent by the arduinos")
+    parser.add_argument('--duration', type=float, default=10.0, help="seconds to acquire")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="seconds between printed readings")
+    parser.add_argument('--load', type=float, default=10.0,
+                        help="load resistance (ohms) for power and energy")
+    parser.add_argument('--spectrum', action='store_true',
+                        help="also print the dominant ripple frequency and rotor speed")
+    parser.add_argument('--record', metavar='FOLDER', nargs='?',
+                        const=os.path.join(os.path.expanduser('~'), 'WindTurbineRecordings'),
+                        help="record to FOLDER (default ~/WindTurbineRecordings)")
+    parser.add_argument('--profile', metavar='FILE',
+                        help="save a performance report (JSON) to FILE on exit")
+    args = parser.parse_args()
+
+    protocolType = [p for p in PROTOCOL_TYPES if p.name == args.format][0]
+    engine = AcquisitionEngine(protocolType)
+    engine.loadResistance = args.load
+    engine.monitor.enabled = args.profile is not None
+    if not args.ports and not args.connect:
+        parser.error("give the arduinos' serial ports, or --connect")
+    try:
+        if args.connect:
+            engine.openNetworkChannels(args.connect)
+        else:
+            engine.openSerialChannels(args.ports,
+                                      lambda portName: print("Checking %s for arduino..." % portName))
+    except ConnectionFailed as err:
+        print("%s. Check Port and Arduino." % err)
+        return 1
+    engine.enableSpectrum(args.spectrum)
+    if args.serve is not None:
+        engine.startServer(args.serve)
+        print("Sharing data on port %d" % engine.streamServer.port)
+    if args.record:
+        engine.startRecording(args.record)
+    engine.start()
+
+    tStop = time.time() + args.duration
+    try:
+        while time.time() < tStop and engine.sourceError() is None:
+            time.sleep(args.interval)
+            engine.process()
+            print(", ".join("%s = %0.3f V (max %0.3f V, rms %0.3f V, %0.2f mW, %0.3f J, "
+                            "%d samples)" %
+                            (channel.name, channel.latestVolts, channel.maxVolts,
+                             channel.statistics.rms(), 1e3*channel.powerMeter.averagePower(),
+                             channel.powerMeter.energy, len(channel.pyramid))
+                            for channel in engine.channels))
+            if args.spectrum:
+                print(", ".join("%s ripple %0.1f Hz, %0.0f RPM" %
+                                (channel.name, channel.spectrum.dominantFrequency,
+                                 channel.spectrum.rpm())
+                                for channel in engine.channels))
+    except KeyboardInterrupt:
+        pass
+    engine.stop()
+    engine.enableSpectrum(False)
+    engine.stopServer()
+    if args.profile:
+        engine.collectCounters()
+        engine.monitor.export(args.profile)
+    if engine.sourceError() is not None:
+        print("Connection Lost on %s: %s" % engine.sourceError())
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -6,43 +6,109 @@ distrubution.
 
     Created By:   D.C. Hartlen, EIT
     Created On:   16-JUN-2018
-    Modified By:  
-    Modified On:  
+    Modified By:  agent
+    Modified On:  17-OCT-2026
 
 Requires: PoltDataGUI.py (contains all Qt objects and layout)
+          AcquisitionEngine.py (GUI independent acquisition and processing)
+          SerialReader.py (background serial acquisition thread)
+          DecimationPyramid.py (min/max index for plotting long histories)
+          RenderScheduler.py (display rate frame clock)
+          SignalFilters.py (stateful low pass filters)
+          SerialProtocol.py (ASCII and binary serial format decoders)
+          SampleClock.py (sample time reconstruction and loss detection)
+          SessionRecorder.py (streams acquired data to file)
+          SessionReplay.py (replays recorded data)
+          TurbineChannel.py (per turbine acquisition state)
+          PerformanceMonitor.py (hot path instrumentation)
+          StreamingStats.py (windowed statistics, power and energy)
+          SpectrumAnalyzer.py (incremental STFT, dominant frequency and RPM)
+          PortScanner.py (background serial port discovery)
+          SessionExporter.py (exports recordings to CSV, Parquet or HDF5)
+          StreamServer.py (shares live data with other plotters)
+          NetworkSource.py (receives data shared by another plotter)
+
+Run with --startup-time to print how long startup took, as JSON, and exit.
+SciPy and the serial port list are loaded in the background once the window
+is up, so neither delays it.
 
 """
 
+import time
+# Time the script started, before the imports, to measure startup
+startTime = time.perf_counter()
 import PlotDataGUI  # This imports py script containing all GUI elements
-from PyQt5 import QtGui, QtCore, QtWidgets
+from PyQt5 import QtCore, QtWidgets
 import pyqtgraph as pg
 import sys
-import numpy as np
-import time
-import serial
-import serial.tools.list_ports
+import os
+import socket
+import threading
+import multiprocessing
+from AcquisitionEngine import AcquisitionEngine, ConnectionFailed
+from DecimationPyramid import MinMaxPyramid
+from RenderScheduler import RenderScheduler
+import SignalFilters
+from SignalFilters import FILTER_TYPES
+from SerialProtocol import PROTOCOL_TYPES
+from SessionRecorder import openRecording
+from PortScanner import PortScanner
+from SessionExporter import EXPORT_FORMATS, exportRecordings
+from StreamServer import DEFAULT_PORT
 
 
-class PlottingApp(QtGui.QMainWindow, PlotDataGUI.Ui_MainWindow):
+class PlottingApp(QtWidgets.QMainWindow, PlotDataGUI.Ui_MainWindow):
     """Define class which handles all GUI interaction"""
     # Define class specific, shared variables
     firstRunFlag = True
     runningFlag = False
-    # Qt specific input to allor for updating
-    updateTimer = QtCore.QTimer()
+    # Rate the plot and readouts are redrawn (frames per second), independent
+    # of the sample rate. Adjustable via dialog box
+    displayRate = 30
+    # Emitted from the indexing thread once a recording is fully indexed
+    recordingIndexed = QtCore.pyqtSignal()
+    # Emitted from the port scanning thread with each new list of ports
+    portsFound = QtCore.pyqtSignal(object)
+    # Emitted from the export thread as each recording is exported
+    recordingExported = QtCore.pyqtSignal(object)
 
-    dataArray = np.zeros(1)     # Input data array
-    currentMaxVolts = 0         # Tracks max voltage
     stationaryBeforeScroll = 500    # Number of data points visable on screen
-    iTicker = 0     # Iteration counter. Used to fill array before scrolling starts
+    nominalSampleRate = 100.0   # Hz, sketch default. Only sizes the empty plot
+
+    # Com ports found so far. Listed in the background after startup and
+    # whenever one is plugged in or removed
+    availablePorts = []
+    # Selected com ports. Several ports (one per turbine) may be selected at
+    # once. Until one is selected via dialog box (or the command line), the
+    # last port found is used
+    arduinoPorts = []
+    portsChosenFlag = False
+
+    # Folder new recordings are saved to. Adjustable via dialog box
+    recordingFolder = os.path.join(os.path.expanduser('~'), 'WindTurbineRecordings')
 
-    # Set a default com port (the last one). Adjustable via dialog box
-    availablePorts = serial.tools.list_ports.comports()
-    nPorts = len(availablePorts)
-    arduinoPort = availablePorts[-1].device
+    # Recorded sessions opened for review/replay, as (name, memory mapped
+    # records). When any are open, they replace the arduinos as the data
+    # sources. Adjustable via dialog box
+    replayRecordings = []
+    replaySpeed = 1.0
+    browsingFlag = False    # True while whole recordings are shown for review
+    replaySpeeds = [1.0, 2.0, 5.0, 10.0, 100.0]
 
-    # Low pass filter coef. Adjustable via dialog box
-    beta = 0.150
+    # Address ('host:port') of another plotter sharing its live data. When
+    # set, its turbines replace the arduinos as the data sources. Adjustable
+    # via dialog box
+    sharedDataAddress = None
+
+    # Seconds between performance overlay updates
+    performanceInterval = 1.0
+
+    # Frame lengths (samples) offered for the spectrum
+    fftSizes = [64, 128, 256, 512, 1024, 2048]
+
+    # Curve colours, one per turbine. The first turbine keeps the original
+    # blue curve and orange max line
+    curveColours = ['b', 'r', (0, 150, 0), 'm', 'c', 'k']
 
 #------------------------------------------------------------------------------    
     def __init__(self, parent=None):
@@ -55,19 +121,54 @@ class PlottingApp(QtGui.QMainWindow, PlotDataGUI.Ui_MainWindow):
         # Setup the GUI
         self.setupUi(self)
 
+        # Acquires and processes data for all turbines. Its serial format
+        # (timestamped ASCII by default, Legacy ASCII for older sketches) and
+        # filter are adjustable via dialog box
+        self.engine = AcquisitionEngine()
+        # Min/max indices of the data on display, one per curve. These are
+        # either the channels' histories or those of recordings under review
+        self.displayPyramids = []
+
+        # Frame clock. New data is processed at the start of every frame and
+        # all widget updates are applied together at the end
+        self.renderScheduler = RenderScheduler(self.displayRate, self)
+        # Many messages are written to the status bar directly. Keep the
+        # scheduler aware of them, so the running status replaces them
+        self.statusbar.messageChanged.connect(self.StatusChanged)
+
         # Define information about the plot window specifically
         self.mainPlotWindow.plotItem.showGrid(True, True, 0.7)
-        self.mainPlotWindow.setRange(xRange=[0, self.stationaryBeforeScroll], yRange=[0,0.8]) 
-        self.mainPlotWindow.setLabels(left = 'Voltage (V)',bottom = 'Time')
+        self.mainPlotWindow.setRange(xRange=[0, self.stationaryBeforeScroll/self.nominalSampleRate],
+                                     yRange=[0,0.8]) 
+        self.mainPlotWindow.setLabels(left = 'Voltage (V)',bottom = 'Time (s)')
 
-        # Define a maximum voltage reached line
-        self.maxVoltsLine = pg.InfiniteLine(angle=0)
-        self.maxVoltsLine.setPen(color="FFA500", width=2)
-        self.mainPlotWindow.addItem(self.maxVoltsLine)
+        # Name each turbine's curve
+        self.plotLegend = self.mainPlotWindow.addLegend()
 
-        # Define the voltage curve to be plotted (in front of max voltage)
-        self.voltageCurve = self.mainPlotWindow.plot()
-        self.voltageCurve.setPen('b',width=2)
+        # Spectrum of each turbine's raw voltage, and a spectrogram of the
+        # first turbine's. Hidden until switched on
+        self.spectrumPlotWindow.plotItem.showGrid(True, True, 0.7)
+        self.spectrumPlotWindow.setLabels(left='Amplitude (V)', bottom='Frequency (Hz)')
+        self.spectrogramPlotWindow.setLabels(left='Frequency (Hz)', bottom='Time (s)')
+        self.spectrogramImage = pg.ImageItem()
+        self.spectrogramImage.setColorMap(pg.colormap.get('viridis'))
+        self.spectrogramPlotWindow.addItem(self.spectrogramImage)
+        self.spectrumPanel.hide()
+
+        # Voltage curves and maximum voltage reached lines, one per turbine
+        self.voltageCurves = []
+        self.maxVoltsLines = []
+        self.spectrumCurves = []
+        self.SetupCurves(self.arduinoPorts[:1])
+
+        # Redraw the visible part of the data whenever zoomed or panned. Stop
+        # following live data once the user moves the view with the mouse
+        self.mainPlotWindow.sigXRangeChanged.connect(self.RequestRedraw)
+        self.mainPlotWindow.getViewBox().sigRangeChangedManually.connect(
+            lambda mask: self.actionFollowLiveData.setChecked(False))
+
+        # Redraw a recording under review at full detail once indexed
+        self.recordingIndexed.connect(self.RequestRedraw)
 
         # Print to status bar
         self.statusbar.showMessage('Ready to go!')
@@ -81,11 +182,13 @@ class PlottingApp(QtGui.QMainWindow, PlotDataGUI.Ui_MainWindow):
         # Define action for the reset button.
         self.resetPlots.clicked.connect(self.resetUI)
 
-        # Define a timer object to run method Update Ticker every timeout
-        self.updateTimer.timeout.connect(self.UpdatePlot)
+        # Process new data at the start of every display frame
+        self.renderScheduler.frameStarted.connect(self.UpdatePlot)
 
         # Initialize the max voltage 
-        self.maxVoltsOut.insert("%0.3f" % self.currentMaxVolts)
+        self.maxVoltsOut.insert("%0.3f" % 0)
+        # Initialize the statistics, power and energy readouts
+        self.ShowStatistics()
         
         # Define an message box to open when about/information in menu bar is selected
         self.actionAbout.triggered.connect(self.AboutMessage)
@@ -96,59 +199,217 @@ class PlottingApp(QtGui.QMainWindow, PlotDataGUI.Ui_MainWindow):
         # Define a dialog box to select the appropriate COM Port
         self.actionSelectCOMPort.triggered.connect(self.dialogSelectPort)
 
+        # Define a dialog box to open a recorded session for review and replay
+        self.actionOpenRecording.triggered.connect(self.dialogOpenRecording)
+
+        # Define a dialog box to connect to data shared by another plotter,
+        # and a toggle to share this plotter's data with others
+        self.actionConnectToSharedData.triggered.connect(self.dialogConnectToSharedData)
+        self.actionShareLiveData.triggered.connect(self.toggleShareLiveData)
+
+        # Define a dialog box to set how fast recordings are replayed
+        self.actionSetReplaySpeed.triggered.connect(self.dialogReplaySpeed)
+
+        # Define a dialog box to select the serial format sent by the arduino
+        self.actionSelectSerialFormat.triggered.connect(self.dialogSerialFormat)
+
         # Define a dialog box to change filter parameters
         self.actionSetFilterCoef.triggered.connect(self.dialogFilterParams)
 
+        # Define dialog boxes to set the load resistance and statistics window
+        self.actionSetLoadResistance.triggered.connect(self.dialogLoadResistance)
+        self.actionSetStatisticsWindow.triggered.connect(self.dialogStatisticsWindow)
+
+        # Define a dialog box to change the display rate
+        self.actionSetDisplayRate.triggered.connect(self.dialogDisplayRate)
+
+        # Jump back to the latest data when following is turned back on
+        self.actionFollowLiveData.triggered.connect(self.toggleFollowLiveData)
+
+        # Show or hide the spectrum, and a dialog box to set its parameters
+        self.actionShowSpectrum.triggered.connect(self.toggleSpectrum)
+        self.actionSetSpectrumParams.triggered.connect(self.dialogSpectrumParams)
+
+        # Performance overlay drawn over the top left of the plot, and a
+        # summary next to the status bar. Both hidden until switched on
+        self.performanceOverlay = QtWidgets.QLabel(self.mainPlotWindow)
+        self.performanceOverlay.setStyleSheet("background-color: rgba(255, 255, 255, 210);"
+                                              "color: black; font-family: monospace;"
+                                              "padding: 4px;")
+        self.performanceOverlay.setAttribute(QtCore.Qt.WA_TransparentForMouseEvents)
+        self.performanceOverlay.move(60, 10)
+        self.performanceOverlay.hide()
+        self.performanceStatus = QtWidgets.QLabel()
+        self.statusbar.addPermanentWidget(self.performanceStatus)
+        self.performanceStatus.hide()
+        self.performanceTimer = QtCore.QTimer(self)
+        self.performanceTimer.setInterval(int(1000*self.performanceInterval))
+        self.performanceTimer.timeout.connect(self.ShowPerformance)
+        # Start of the previous frame, to measure the actual display rate
+        self.lastFrameStart = None
+
+        # Show or hide the performance monitor
+        self.actionShowPerformance.triggered.connect(self.togglePerformance)
+
+        # Define a dialog box to save the performance report
+        self.actionExportPerformance.triggered.connect(self.dialogExportPerformance)
+
+        # Define a dialog box to select where recordings are saved
+        self.actionSelectRecordingFolder.triggered.connect(self.dialogRecordingFolder)
+
+        # Define dialog boxes to export recordings to other file formats. The
+        # export runs in the background, reporting each file as it finishes
+        self.actionExportRecordings.triggered.connect(self.dialogExportRecordings)
+        self.recordingExported.connect(self.ShowExported)
+        self.exportThread = None
+        self.nExportsPending = 0
+
+        # List the com ports in the background, and again every few seconds
+        # to notice arduinos being plugged in or removed
+        self.portsFound.connect(self.ShowPorts)
+        self.portScanner = PortScanner(self.portsFound.emit)
+        self.portScanner.start()
+
+        # Load SciPy (for the filters) in the background, so it is ready
+        # before the first run without delaying the window
+        preloadThread = threading.Thread(target=SignalFilters.preload)
+        preloadThread.daemon = True
+        preloadThread.start()
+
+#------------------------------------------------------------------------------
+    def SetupCurves(self, names):
+        """Creates one voltage curve and max voltage line per turbine"""
+        for curve in self.voltageCurves:
+            self.mainPlotWindow.removeItem(curve)
+        for line in self.maxVoltsLines:
+            self.mainPlotWindow.removeItem(line)
+        for curve in self.spectrumCurves:
+            self.spectrumPlotWindow.removeItem(curve)
+        self.plotLegend.clear()
+        self.voltageCurves = []
+        self.maxVoltsLines = []
+        self.spectrumCurves = []
+        self.spectrogramImage.clear()
+
+        for i, name in enumerate(names):
+            colour = self.curveColours[i % len(self.curveColours)]
+            # Define a maximum voltage reached line. Dashed in the curve's
+            # colour when several turbines are shown
+            maxVoltsLine = pg.InfiniteLine(angle=0)
+            if len(names) == 1:
+                maxVoltsLine.setPen(color="#FFA500", width=2)
+            else:
+                maxVoltsLine.setPen(color=colour, width=2, style=QtCore.Qt.DashLine)
+            self.mainPlotWindow.addItem(maxVoltsLine)
+            self.maxVoltsLines.append(maxVoltsLine)
+
+            # Define the voltage curve to be plotted (in front of max voltage)
+            voltageCurve = self.mainPlotWindow.plot(name=os.path.basename(name))
+            voltageCurve.setPen(colour,width=2)
+            self.voltageCurves.append(voltageCurve)
+
+            # Define the turbine's spectrum curve
+            spectrumCurve = self.spectrumPlotWindow.plot()
+            spectrumCurve.setPen(colour, width=2)
+            self.spectrumCurves.append(spectrumCurve)
+
+        # New widgets, so nothing is known to be on screen yet
+        self.renderScheduler.forgetAll()
+
 #------------------------------------------------------------------------------
     def InitializeRun(self):
-        """Define write data to file"""
+        """Connects to the arduinos, starts acquisition and opens output files"""
         # Things to be completed during the first activation    
         if self.firstRunFlag == True:
-            # Check the comport for functional arduino
-            self.statusbar.showMessage("Checking COM port for arduino...")
-            # Connect to com port specified by user. Reads one peice of data to make sure
-            # it works. If not, will return error message without stopping program.
-            try:
-                self.arduinoInput = serial.Serial(self.arduinoPort, 9600, timeout=5)
-                # Read from serial port. This is encoded in bytes
-                dataIn = self.arduinoInput.readline()
-                # Decode the byte
-                dataIn = float(dataIn[0:len(dataIn)-2].decode("utf-8"))
-            except:
-                # If there is an exception, return without starting collection
-                self.statusbar.showMessage("Connection Failed. Check Port and Arduino.")
+            # Connect to the data sources: arduinos, recordings to replay, or
+            # another plotter's shared data
+            if len(self.replayRecordings) == 0 and self.sharedDataAddress is None and \
+                    len(self.arduinoPorts) == 0:
+                if self.portScanner.lastDevices is None:
+                    self.statusbar.showMessage("Still looking for COM ports. Try again shortly.")
+                else:
+                    self.statusbar.showMessage("No COM port found. Plug in the arduino.")
                 return()
-            
+            if len(self.replayRecordings) == 0 and self.sharedDataAddress is not None:
+                # Connect to the plotter sharing its data
+                try:
+                    self.engine.openNetworkChannels(self.sharedDataAddress)
+                except ConnectionFailed as err:
+                    self.statusbar.showMessage("%s. Check the address, and that the other "
+                                               "plotter is sharing and running." % err)
+                    return()
+            elif len(self.replayRecordings) == 0:
+                # Connect to com ports specified by user. Reads one peice of data to make sure
+                # it works. If not, will return error message without stopping program.
+                try:
+                    self.engine.openSerialChannels(self.arduinoPorts,
+                        lambda portName: self.statusbar.showMessage(
+                            "Checking %s for arduino..." % portName))
+                except ConnectionFailed as err:
+                    self.statusbar.showMessage("%s. Check Port and Arduino." % err)
+                    return()
+            else:
+                self.engine.openReplayChannels(self.replayRecordings, self.replaySpeed)
+
             self.statusbar.showMessage('Executing First Run Tasks') # Insitu debug
 
+            # Measure each run separately
+            self.engine.monitor.reset()
+
             # Change the first run flag to false
             self.firstRunFlag = False
             self.runningFlag = True
 
             # Disable start button
             self.startPlotting.setEnabled(False)
-            
-            # Start timer for updating the plot
-            self.updateTimer.start(5)
 
-            # flush serial inputs so far
-            self.arduinoInput.flushInput()
+            # Leave review mode and return to the scrolling window
+            if self.browsingFlag:
+                self.browsingFlag = False
+                for pyramid in self.displayPyramids:
+                    pyramid.abortIndexing = True
+                self.actionFollowLiveData.setChecked(True)
+
+            # Plot each channel's history
+            self.SetupCurves([channel.name for channel in self.engine.channels])
+            self.displayPyramids = [channel.pyramid for channel in self.engine.channels]
+            self.RequestRedraw()
+
+            # Start background acquisition (or the replay clocks)
+            self.engine.start()
+
+            # Open files to record every live sample, if selected in the menu
+            if len(self.replayRecordings) == 0 and self.actionRecordToFile.isChecked():
+                self.StartRecording()
  
         else:
             # Debug message
             return()
         
+#------------------------------------------------------------------------------
+    def StartRecording(self):
+        """Opens a new, time stamped recording file per turbine in the
+        recording folder"""
+        try:
+            self.engine.startRecording(self.recordingFolder)
+        except OSError as err:
+            # Plot without recording rather than refusing to start
+            self.statusbar.showMessage("Unable to record to file: %s" % err)
+            return
+        self.statusbar.showMessage("Recording to %s" % self.recordingFolder)
+
 #------------------------------------------------------------------------------             
     def StopTicker(self):
-        """ Stops the ticker plot, closes output file."""
+        """ Stops the ticker plot, closes output files."""
         if self.runningFlag == True:
             self.runningFlag = False
-            self.updateTimer.stop()
             self.stopPlotting.setEnabled(False)
 
-            # close com port to arduino
-            self.arduinoInput.close()
+            # stop reader threads, close com ports and output files
+            self.engine.stop()
 
+            # show the final frame before the stop message
+            self.renderScheduler.flush()
             self.statusbar.showMessage('Plotting Stopped. Awaiting Reset')
         else:
             return()
@@ -164,65 +425,341 @@ class PlottingApp(QtGui.QMainWindow, PlotDataGUI.Ui_MainWindow):
             # Reset flags
             self.firstRunFlag = True
 
-            # Reset data array and max volt tracker to zero
-            self.dataArray = np.zeros(1)
-            self.currentMaxVolts = 0
-            self.iTicker = 0
+            # Reset data history and max volt trackers to zero
+            self.engine.reset()
 
             # Reset dialog box and plot
-            self.maxVoltsOut.clear()
-            self.maxVoltsOut.insert("%0.3f" % self.currentMaxVolts)
-            self.maxVoltsLine.setValue(self.currentMaxVolts)
-            self.voltageCurve.setData(self.dataArray)
+            self.ShowMaxVolts()
+            self.ShowStatistics()
+            self.RequestSpectrum()
+            self.actionFollowLiveData.setChecked(True)
+            self.mainPlotWindow.setRange(xRange=[0, self.stationaryBeforeScroll/self.nominalSampleRate])
+            self.RequestRedraw()
             self.statusbar.showMessage("Ready to go!")
 
+            # Go back to reviewing the recordings, if any are open
+            if len(self.replayRecordings) > 0:
+                self.ShowRecordings()
+
         else:
-            self.statusbar("Unable to reset at this time")
+            self.statusbar.showMessage("Unable to reset at this time")
             return()
         
+#------------------------------------------------------------------------------             
+    def closeEvent(self, event):
+        """ Stops acquisition and every background thread before the window
+        closes, so recordings are completed and com ports released """
+        # stop reader threads, write queued samples and close output files
+        self.StopTicker()
+        self.portScanner.stop()
+        self.engine.enableSpectrum(False)
+        self.engine.stopServer()
+        event.accept()
+
 #------------------------------------------------------------------------------
     def UpdatePlot(self):
-        """Updates ticker plot with data from serial port"""
+        """Updates ticker plot with data from serial ports or replay. Called
+        at the start of every display frame"""
         if self.runningFlag == True:
-            # Read from serial port. This is encoded in bytes
-            dataIn = self.arduinoInput.readline()
+            tStart = self.TimeFrame()
+
+            # Report and stop if a reader thread lost its serial port
+            sourceError = self.engine.sourceError()
+            if sourceError is not None:
+                self.StopTicker()
+                self.statusbar.showMessage("Connection Lost on %s: %s" % sourceError)
+                return
 
-            # Decode the byte
-            dataIn = float(dataIn[0:len(dataIn)-2].decode("utf-8"))
+            # Stop once all replayed recordings have been played to the end
+            if self.engine.finished():
+                self.StopTicker()
+                self.statusbar.showMessage("Replay Finished. Awaiting Reset")
+                return
 
-            # Filter input data
-            filteredIn = (1-self.beta)*self.dataArray[-1] + self.beta*dataIn
+            # Filter, record and index everything each reader thread received
+            # (or each replay released) since last frame
+            if self.engine.process() == 0:
+                return
+
+            # Print the current inputs to the status bar and max voltages to
+            # screen. Widget updates requested here are applied once, at the
+            # end of the frame
+            self.ShowReadouts()
+
+            # Update the plot for animation. Data accumulates until the screen
+            # is full, then starts scrolling, unless the user has moved the view
+            if self.actionFollowLiveData.isChecked():
+                self.FollowLiveData()
+            self.RequestRedraw()
+            self.RequestSpectrum()
+            self.engine.monitor.lap('frame', tStart)
+
+#------------------------------------------------------------------------------
+    def ShowReadouts(self):
+        """Requests status bar, max voltage box and max line updates"""
+        if len(self.engine.channels) == 0:
+            return
+        if len(self.engine.channels) == 1:
+            status = "Running: V = %0.3f V" % self.engine.channels[0].latestVolts
+        else:
+            status = "Running: " + ", ".join(["%s = %0.3f V" % (os.path.basename(channel.name),
+                                                                 channel.latestVolts)
+                                               for channel in self.engine.channels])
+        # Report samples lost between the arduinos and the reader threads,
+        # or dropped by a slow network connection
+        nLost = sum(channel.dataSource.sampleClock.missingSamples
+                    for channel in self.engine.channels
+                    if hasattr(channel.dataSource, 'sampleClock'))
+        nLost += sum(channel.dataSource.droppedSamples for channel in self.engine.channels)
+        if nLost > 0:
+            status += " (%d samples lost)" % nLost
+        if self.engine.streamServer is not None:
+            status += " (Sharing with %d)" % self.engine.streamServer.clientCount()
+        # Report if a recorder could not write to disk
+        for channel in self.engine.channels:
+            if channel.recordingError() is not None:
+                status += " (Recording Failed: %s)" % channel.recordingError()
+                break
+        self.renderScheduler.setValue(self.statusbar.showMessage, status)
+        self.ShowMaxVolts()
+        self.ShowStatistics()
+
+#------------------------------------------------------------------------------
+    def ShowMaxVolts(self):
+        """Requests max voltage box and max line updates"""
+        self.renderScheduler.setValue(self.maxVoltsOut.setText,
+            " / ".join(["%0.3f" % channel.maxVolts for channel in self.engine.channels]))
+        for channel, maxVoltsLine in zip(self.engine.channels, self.maxVoltsLines):
+            self.renderScheduler.setValue(maxVoltsLine.setValue, channel.maxVolts)
+
+#------------------------------------------------------------------------------
+    def ShowStatistics(self):
+        """Requests statistics, power and energy box updates. Several
+        turbines' values are separated by slashes"""
+        channels = self.engine.channels
+        self.renderScheduler.setValue(self.labelStatistics.setText,
+            '<html><head/><body><p align="center"><span style=" font-size:14pt; '
+            'font-weight:600;">Last %g s</span></p></body></html>' % self.engine.statisticsWindow)
+        lines = []
+        for label, statistic in [("Mean", 'mean'), ("RMS", 'rms'),
+                                 ("Min", 'minimum'), ("Max", 'maximum')]:
+            values = [getattr(channel.statistics, statistic)() for channel in channels] or [0.0]
+            lines.append("%s: %s V" % (label, " / ".join("%0.3f" % value for value in values)))
+        self.renderScheduler.setValue(self.statisticsOut.setText, "\n".join(lines))
+        self.renderScheduler.setValue(self.powerOut.setText,
+            " / ".join(["%0.2f" % (1e3*channel.powerMeter.averagePower())
+                        for channel in channels] or ["%0.2f" % 0]))
+        self.renderScheduler.setValue(self.energyOut.setText,
+            " / ".join(["%0.3f" % channel.powerMeter.energy for channel in channels]
+                       or ["%0.3f" % 0]))
 
-            # If the number of data points is less than the size of the screen,
-            # accumulate data
-            if self.iTicker < self.stationaryBeforeScroll:
-                # append new data to existing data array
-                self.dataArray = np.append(self.dataArray,filteredIn)
+#------------------------------------------------------------------------------
+    def StatusChanged(self, message):
+        """Tells the frame clock what the status bar shows, however it was
+        written"""
+        self.renderScheduler.setShown(self.statusbar.showMessage, message)
 
-                self.iTicker += 1
-            # Start scrolling data otherwise.
+#------------------------------------------------------------------------------
+    def FollowLiveData(self):
+        """Moves the view to show the most recent samples"""
+        xMin = None
+        xMax = None
+        # Window wide enough to show the most recent samples of every turbine
+        for channel in self.engine.channels:
+            times = channel.pyramid.timeArray()
+            nSamples = len(times)
+            if nSamples < 2:
+                continue
+            if nSamples >= self.stationaryBeforeScroll:
+                # Scroll, showing exactly the most recent samples
+                channelMin = times[nSamples - self.stationaryBeforeScroll]
+                channelMax = times[-1]
             else:
-                # slice data array such that all data is rolled back one index
-                self.dataArray[:-1] = self.dataArray[1:]
-                # Overwrite last value in array
-                self.dataArray[-1] = filteredIn
-
-            # Print the current input to the status bar
-            self.statusbar.showMessage("Running: V = %0.3f V" % filteredIn)
-
-            # Update the plot for animation
-            self.voltageCurve.setData(self.dataArray)
-
-            # if new voltage is large than maximum voltage, replace max and print to screen
-            if filteredIn > self.currentMaxVolts:
-                self.currentMaxVolts = filteredIn
-                self.maxVoltsOut.clear()
-                self.maxVoltsOut.insert("%0.3f" % self.currentMaxVolts)
-                self.maxVoltsLine.setValue(self.currentMaxVolts)
-                    
+                # Fill the screen, sized from the sample rate seen so far
+                channelMin = times[0]
+                channelMax = times[0] + (times[-1] - times[0])*self.stationaryBeforeScroll/(nSamples - 1)
+            xMin = channelMin if xMin is None else min(xMin, channelMin)
+            xMax = channelMax if xMax is None else max(xMax, channelMax)
+        if xMin is not None:
+            self.mainPlotWindow.setXRange(xMin, xMax, padding=0)
+
+#------------------------------------------------------------------------------
+    def TimeFrame(self):
+        """Measures the time between display frames and counts late ones.
+        Returns the start time of this frame"""
+        monitor = self.engine.monitor
+        tStart = monitor.now()
+        if not monitor.enabled:
+            return tStart
+        if self.lastFrameStart is not None:
+            monitor.lap('frame interval', self.lastFrameStart)
+            # A frame is late if it starts half an interval or more behind
+            if tStart - self.lastFrameStart > 1.5/self.displayRate:
+                monitor.count('late frames')
+        self.lastFrameStart = tStart
+        return tStart
+
+#------------------------------------------------------------------------------
+    def TimedPaintEvent(self, event):
+        """Paints the plot, timing how long pyqtgraph takes to repaint.
+        Replaces the plot's paintEvent while the monitor is shown"""
+        tStart = self.engine.monitor.now()
+        type(self.mainPlotWindow).paintEvent(self.mainPlotWindow, event)
+        self.engine.monitor.lap('repaint', tStart)
+
+#------------------------------------------------------------------------------
+    def ShowPerformance(self):
+        """Requests performance overlay and status summary updates"""
+        self.engine.collectCounters()
+        report = self.engine.monitor.report()
+        self.renderScheduler.setValue(self.SetOverlayText, self.engine.monitor.summaryText())
+
+        # One line summary: display rate, time per frame and any losses
+        summary = []
+        if 'frame interval' in report['stages']:
+            summary.append("%.1f fps" % (1.0/max(report['stages']['frame interval']['meanSeconds'], 1e-6)))
+        if 'frame' in report['stages']:
+            summary.append("frame %.2f ms" % (1e3*report['stages']['frame']['meanSeconds']))
+        nLost = sum(value for name, value in report['counters'].items() if name != 'late frames')
+        summary.append("lost/late %d" % nLost)
+        self.renderScheduler.setValue(self.performanceStatus.setText, ", ".join(summary))
+
+#------------------------------------------------------------------------------
+    def SetOverlayText(self, text):
+        """Shows text in the performance overlay, resized to fit"""
+        self.performanceOverlay.setText(text if text else "Waiting for data...")
+        self.performanceOverlay.adjustSize()
+
+#------------------------------------------------------------------------------
+    def RequestRedraw(self, *args):
+        """Redraws the curves at the next display frame. Any number of requests
+        in one frame (new data, zooming, panning) result in a single redraw"""
+        self.renderScheduler.scheduleCall(self.RedrawCurve)
+
+#------------------------------------------------------------------------------
+    def RedrawCurve(self):
+        """Plots the visible part of the displayed data. Only about two points
+        per screen pixel are passed to each curve, however long the history"""
+        tStart = self.engine.monitor.now()
+        xMin, xMax = self.mainPlotWindow.viewRange()[0]
+        maxPoints = 2*max(self.mainPlotWindow.width(), 1)
+        nPoints = 0
+        for pyramid, voltageCurve in zip(self.displayPyramids, self.voltageCurves):
+            x, y = pyramid.query(xMin, xMax, maxPoints)
+            voltageCurve.setData(x, y)
+            nPoints += len(x)
+        self.engine.monitor.lap('render', tStart, nPoints)
+
+#------------------------------------------------------------------------------
+    def RequestSpectrum(self):
+        """Redraws the spectrum at the next display frame, if shown"""
+        if self.actionShowSpectrum.isChecked():
+            self.renderScheduler.scheduleCall(self.RedrawSpectrum)
+
+#------------------------------------------------------------------------------
+    def RedrawSpectrum(self):
+        """Plots the latest spectrum of each turbine and the first turbine's
+        spectrogram, titled with the dominant frequencies and rotor speeds.
+        The spectra are computed on the worker thread; only the results are
+        read here"""
+        tStart = self.engine.monitor.now()
+        channels = [channel for channel in self.engine.channels if channel.spectrum is not None]
+        if len(channels) == 0:
+            for spectrumCurve in self.spectrumCurves:
+                spectrumCurve.setData([], [])
+            self.spectrogramImage.clear()
+            self.spectrumPlotWindow.setTitle("Dominant: waiting for data")
+            return
+
+        titles = []
+        for i, (channel, spectrumCurve) in enumerate(zip(channels, self.spectrumCurves)):
+            frequencies, spectrum, spectrogram, frameTimes = channel.spectrum.snapshot()
+            if frequencies is None:
+                spectrumCurve.setData([], [])
+                continue
+            spectrumCurve.setData(frequencies, spectrum)
+            titles.append("%0.1f Hz, %0.0f RPM" % (channel.spectrum.dominantFrequency,
+                                                   channel.spectrum.rpm()))
+            # Spectrogram of the first turbine, time across and frequency up
+            if i == 0 and len(frameTimes) > 1:
+                self.spectrogramImage.setImage(spectrogram, autoLevels=True)
+                self.spectrogramImage.setRect(QtCore.QRectF(
+                    frameTimes[0], 0.0, frameTimes[-1] - frameTimes[0], frequencies[-1]))
+        self.spectrumPlotWindow.setTitle("Dominant: " + (" / ".join(titles) or "waiting for data"))
+        self.engine.monitor.lap('spectrum render', tStart)
+
+#------------------------------------------------------------------------------
+    def ShowPorts(self, ports):
+        """Updates the list of com ports after a scan. Until the user selects
+        ports, the last port found is used, as it is typically the arduino"""
+        self.availablePorts = ports
+        devices = [port.device for port in ports]
+        if self.portsChosenFlag:
+            # Keep the user's selection, reporting any which have gone
+            missing = [device for device in self.arduinoPorts if device not in devices]
+            if len(missing) > 0 and not self.runningFlag:
+                self.statusbar.showMessage("Not found: %s. Check the arduino is plugged in."
+                                           % ", ".join(missing))
+            return
+        self.arduinoPorts = devices[-1:]
+        # Leave the status bar alone while running, as the reader threads
+        # report a lost port themselves, or while the arduinos are not in use
+        if self.runningFlag or len(self.replayRecordings) > 0 or \
+                self.sharedDataAddress is not None:
+            return
+        if len(devices) == 0:
+            self.statusbar.showMessage("No COM port found. Plug in the arduino.")
         else:
-            self.statusbar.showMessage('Not Recording')        
-        
+            self.statusbar.showMessage("Ready to go! Using %s" % devices[-1])
+
+#------------------------------------------------------------------------------
+    def ShowExported(self, result):
+        """Reports a recording exported (or not) by the export thread"""
+        inputPath, outputPath, nWritten, errorMessage = result
+        self.nExportsPending -= 1
+        if errorMessage is not None:
+            message = "Unable to export %s: %s" % (os.path.basename(inputPath), errorMessage)
+        else:
+            message = "Exported %s (%d samples)" % (outputPath, nWritten)
+        if self.nExportsPending > 0:
+            message += ", %d still exporting" % self.nExportsPending
+        self.statusbar.showMessage(message)
+
+#------------------------------------------------------------------------------
+    def ShowRecordings(self):
+        """Shows the whole of the open recordings for review"""
+        # Stop indexing any recordings previously under review
+        for pyramid in self.displayPyramids:
+            pyramid.abortIndexing = True
+
+        # Index the memory mapped recordings in the background. Until that is
+        # done, unindexed parts are drawn thinned out
+        self.displayPyramids = []
+        for name, records in self.replayRecordings:
+            recordingPyramid = MinMaxPyramid.fromArrays(records['time'], records['filtered'])
+            indexThread = threading.Thread(target=self.IndexRecording, args=(recordingPyramid,))
+            indexThread.daemon = True
+            indexThread.start()
+            self.displayPyramids.append(recordingPyramid)
+        self.SetupCurves([name for name, records in self.replayRecordings])
+
+        self.browsingFlag = True
+        self.actionFollowLiveData.setChecked(False)
+        # Only the first and last records are read from disk here. Changing
+        # the range redraws what is visible
+        timeRanges = [(records['time'][0], records['time'][-1])
+                      for name, records in self.replayRecordings if len(records) > 0]
+        if len(timeRanges) > 0:
+            self.mainPlotWindow.setXRange(min(start for start, end in timeRanges),
+                                          max(end for start, end in timeRanges))
+        self.RequestRedraw()
+
+#------------------------------------------------------------------------------
+    def IndexRecording(self, recordingPyramid):
+        """Runs on a background thread to index a recording for review"""
+        if recordingPyramid.buildIndex():
+            self.recordingIndexed.emit()
+
 #------------------------------------------------------------------------------         
     def AboutMessage(self):
         """ Method to create message box which displays "about" information"""
@@ -244,58 +781,494 @@ class PlottingApp(QtGui.QMainWindow, PlotDataGUI.Ui_MainWindow):
         msgbox = QtWidgets.QMessageBox()
         msgbox.setWindowTitle('Help')
         msgbox.setText('Operation:\n'\
-                       '1) System attempts to select available COM Port as this is\n'\
-                       '   typically where the arduino is located. To manually\n'\
-                       '   specify the COM port, go to file and select select \n'\
+                       '1) System attempts to select the last COM Port found as this\n'\
+                       '   is typically where the arduino is located. An arduino\n'\
+                       '   plugged in after startup is found within a few seconds.\n'\
+                       '   To manually specify the COM port, go to file and select\n'\
                        '   "Select COM Port". Choose the appropriate port and OK.\n'\
+                       '   Select several ports (Ctrl+click) to monitor one turbine\n'\
+                       '   per port side by side.\n'\
+                       '   If the arduino sketch sends binary data, also select\n'\
+                       '   "Binary" under "Select Serial Format". For sketches\n'\
+                       '   which send only the voltage, select "Legacy ASCII".\n'\
+                       '   To review a recorded run instead, select "Open Recorded\n'\
+                       '   Session". Zoom and pan the plot with the mouse, or press\n'\
+                       '   Start to replay it.\n'\
+                       '   While running, zooming or panning the plot stops it\n'\
+                       '   following live data. Select "Follow Live Data" to resume.\n'\
                        '2) Press Start to start collecting and and plotting data.\n'\
                        '3) press Stop to stop plotting. Does not reset plotted data.\n'\
-                       '4) Press Reset to clear plotted dataand prepare for next run.')
+                       '4) Press Reset to clear plotted dataand prepare for next run.\n'\
+                       'Every run is recorded to a file in the recording folder\n'\
+                       'unless "Record Data to File" is unchecked in Options.\n'\
+                       'Power and energy are those delivered to the load\n'\
+                       'resistor; set its value with "Set Load Resistance".\n'\
+                       'Mean, RMS, min and max cover the last few seconds; set\n'\
+                       'how many with "Set Statistics Window".\n'\
+                       'Select "Show Spectrum" to see the frequencies in each\n'\
+                       'turbine\'s voltage. The ripple from the generator gives\n'\
+                       'the rotor speed; set the ripples per revolution and the\n'\
+                       'frequency resolution with "Set Spectrum Parameters".\n'\
+                       'To let others watch the turbine on their own computers,\n'\
+                       'select "Share Live Data" and give them the address shown.\n'\
+                       'They select "Connect to Shared Data", enter it and press\n'\
+                       'Start.\n'\
+                       'To use recordings in other programs, select "Export\n'\
+                       'Recordings" to save them as CSV, Parquet or HDF5 files.\n'\
+                       'If the display lags, select "Show Performance Monitor" to\n'\
+                       'see where the time goes, and "Export Performance Report"\n'\
+                       'to save the details.')
         msgbox.exec()
 #------------------------------------------------------------------------------         
     def dialogSelectPort(self):
-        """ Method creates a dialog box for the selection of avaiable com ports"""
-        #Initalize an empty list of comports
-        items = [None] * self.nPorts
-        # Populate list
-        for i in range(self.nPorts):
-            items[i] = self.availablePorts[i].device
+        """ Method creates a dialog box for the selection of avaiable com ports.
+        Several ports may be selected to monitor one turbine per port"""
+        # Create a dialog instance with a list of all com ports
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle("Select COM Ports")
+        layout = QtWidgets.QVBoxLayout(dialog)
+        layout.addWidget(QtWidgets.QLabel("Select one COM Port per turbine:"))
+        portList = QtWidgets.QListWidget()
+        portList.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        # Look for newly plugged in arduinos for next time
+        self.portScanner.rescan()
+        if len(self.availablePorts) == 0:
+            layout.addWidget(QtWidgets.QLabel("No COM ports found. Plug in the arduino,\n"
+                                              "wait a moment, then try again."))
+        # Populate list, selecting the ports currently in use
+        for port in self.availablePorts:
+            item = QtWidgets.QListWidgetItem(port.device)
+            portList.addItem(item)
+            item.setSelected(port.device in self.arduinoPorts)
+        layout.addWidget(portList)
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok |
+                                             QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+
+        # If ports from the list are selected and ok is pressed, keep the
+        # comport names in list order and exit the menu.
+        selectedPorts = []
+        if dialog.exec() == QtWidgets.QDialog.Accepted:
+            selectedPorts = [portList.item(i).text() for i in range(portList.count())
+                             if portList.item(i).isSelected()]
+        if selectedPorts:
+            self.statusbar.showMessage(", ".join(selectedPorts))
+            self.arduinoPorts = selectedPorts
+            self.portsChosenFlag = True
+            # Selecting a port switches back from replay (or shared data) to
+            # the arduinos
+            self.replayRecordings = []
+            self.sharedDataAddress = None
+
+#------------------------------------------------------------------------------         
+    def dialogOpenRecording(self):
+        """ Method creates a dialog box to open recorded sessions. Several
+        recordings (e.g. one per turbine) can be opened together and are
+        shown overlaid. The recordings replace the arduinos as the data
+        sources until a COM port is selected again """
+        if self.runningFlag == True:
+            self.statusbar.showMessage("Stop plotting before opening a recording")
+            return
+        filePaths, selectedFilter = QtWidgets.QFileDialog.getOpenFileNames(self,
+                                               "Open Recorded Sessions",
+                                               self.recordingFolder,
+                                               "Turbine Recordings (*.wtr)")
+        # An empty list is returned if the dialog is cancelled
+        if not filePaths:
+            return
+        replayRecordings = []
+        for filePath in filePaths:
+            try:
+                startTime, records = openRecording(filePath)
+            except (OSError, ValueError) as err:
+                self.statusbar.showMessage("Unable to open recording: %s" % err)
+                return
+            replayRecordings.append((os.path.splitext(os.path.basename(filePath))[0], records))
+        self.replayRecordings = replayRecordings
+        self.sharedDataAddress = None
+        self.ShowRecordings()
+        self.statusbar.showMessage("Reviewing %s (%d samples). Press Start to replay"
+                                   % (", ".join(name for name, records in replayRecordings),
+                                      sum(len(records) for name, records in replayRecordings)))
+
+#------------------------------------------------------------------------------         
+    def dialogConnectToSharedData(self):
+        """ Method creates a dialog box to enter the address of another
+        plotter sharing its live data. Its turbines replace the arduinos as
+        the data sources until a COM port is selected again """
+        if self.runningFlag == True:
+            self.statusbar.showMessage("Stop plotting before connecting to shared data")
+            return
+        suggestedAddress = self.sharedDataAddress or "localhost:%d" % DEFAULT_PORT
+        # Create a dialog instance
+        address, okPressed = QtWidgets.QInputDialog.getText(self,
+                                               "Connect to Shared Data",
+                                               "Address shown by the sharing plotter:",
+                                               QtWidgets.QLineEdit.Normal,
+                                               suggestedAddress)
+        if okPressed and address.strip():
+            self.sharedDataAddress = address.strip()
+            self.replayRecordings = []
+            self.statusbar.showMessage("Press Start to watch %s" % self.sharedDataAddress)
+
+#------------------------------------------------------------------------------         
+    def toggleShareLiveData(self, checked):
+        """ Method starts or stops sharing this plotter's live data, so
+        others can watch with "Connect to Shared Data" """
+        if checked:
+            try:
+                self.engine.startServer()
+            except OSError as err:
+                self.actionShareLiveData.setChecked(False)
+                self.statusbar.showMessage("Unable to share data: %s" % err)
+                return
+            self.statusbar.showMessage("Sharing live data at %s:%d"
+                                       % (socket.gethostname(), self.engine.streamServer.port))
+        else:
+            self.engine.stopServer()
+            self.statusbar.showMessage("Stopped sharing live data")
+
+#------------------------------------------------------------------------------         
+    def dialogReplaySpeed(self):
+        """ Method creates a dialog box to set the replay speed """
+        items = ["%gx" % speed for speed in self.replaySpeeds]
         # Create a dialog instance
-        selectedPort, okPressed = QtWidgets.QInputDialog.getItem(self,
-                                               "Select COM Port", 
-                                               "Select COM Port:",
+        selectedSpeed, okPressed = QtWidgets.QInputDialog.getItem(self,
+                                               "Set Replay Speed",
+                                               "Replay Speed:",
                                                items,
-                                               0,
+                                               self.replaySpeeds.index(self.replaySpeed),
                                                False)
-        # If an item from the list is selected and ok is  pressed, return
-        # the comport name and exit the menu.
-        if okPressed and selectedPort:
-            self.statusbar.showMessage(selectedPort)
-            self.arduinoPort = selectedPort
+        if okPressed and selectedSpeed:
+            self.replaySpeed = self.replaySpeeds[items.index(selectedSpeed)]
+            self.statusbar.showMessage("Replay speed: %s" % selectedSpeed)
 
 #------------------------------------------------------------------------------         
-    def dialogFilterParams(self):
-        """ Method creates a dialog box to set filter parameters """
+    def dialogSerialFormat(self):
+        """ Method creates a dialog box to select the serial format """
+        items = ["%s (%d baud)" % (protocolType.name, protocolType.baudRate)
+                 for protocolType in PROTOCOL_TYPES]
         # Create a dialog instance
-        newParam, okPressed = QtWidgets.QInputDialog.getDouble(self, 
-        "Set Filter Parameters","Beta (0<beta<1):", self.beta, 0, 1, 3)
-        # If an item from the list is selected and ok is  pressed, return
-        # the comport name and exit the menu.
+        selectedFormat, okPressed = QtWidgets.QInputDialog.getItem(self,
+                                               "Select Serial Format",
+                                               "Must match the arduino sketch:",
+                                               items,
+                                               PROTOCOL_TYPES.index(self.engine.protocolType),
+                                               False)
+        # If an item from the list is selected and ok is pressed, use that
+        # format from the next start
+        if okPressed and selectedFormat:
+            self.engine.protocolType = PROTOCOL_TYPES[items.index(selectedFormat)]
+            self.statusbar.showMessage("Serial format: %s" % selectedFormat)
+
+#------------------------------------------------------------------------------         
+    def dialogRecordingFolder(self):
+        """ Method creates a dialog box to select the folder recordings are saved to """
+        selectedFolder = QtWidgets.QFileDialog.getExistingDirectory(self,
+                                               "Select Recording Folder",
+                                               self.recordingFolder)
+        # An empty string is returned if the dialog is cancelled
+        if selectedFolder:
+            self.recordingFolder = selectedFolder
+            self.statusbar.showMessage("Recording to folder: %s" % selectedFolder)
+
+#------------------------------------------------------------------------------         
+    def dialogDisplayRate(self):
+        """ Method creates a dialog box to set the display rate """
+        # Create a dialog instance
+        newRate, okPressed = QtWidgets.QInputDialog.getInt(self,
+        "Set Display Rate", "Frames per second:", self.displayRate, 1, 120)
         if okPressed:
-            self.statusbar.showMessage("New filter coefficient: Beta = %0.3f" % newParam)
-            self.beta = newParam
+            self.displayRate = newRate
+            self.renderScheduler.setFrameRate(newRate)
+            self.statusbar.showMessage("Display rate: %d frames per second" % newRate)
+
+#------------------------------------------------------------------------------         
+    def toggleFollowLiveData(self, checked):
+        """ Method moves the view back to the latest data when following is
+        turned on from the menu """
+        if checked and len(self.engine.channels) > 0 and not self.browsingFlag:
+            self.FollowLiveData()
+            self.RequestRedraw()
+
+#------------------------------------------------------------------------------         
+    def toggleSpectrum(self, checked):
+        """ Method switches spectrum analysis on or off, showing or hiding
+        the spectrum plots. Analysis costs nothing while it is off """
+        self.engine.enableSpectrum(checked)
+        if checked:
+            self.spectrumPanel.show()
+            self.RequestSpectrum()
+        else:
+            self.spectrumPanel.hide()
+
+#------------------------------------------------------------------------------         
+    def dialogSpectrumParams(self):
+        """ Method creates dialog boxes to set the spectrum frame length and
+        the generator's ripples per revolution """
+        items = ["%d samples" % fftSize for fftSize in self.fftSizes]
+        current = self.fftSizes.index(self.engine.fftSize) if self.engine.fftSize in self.fftSizes else 0
+        # Create a dialog instance to select the frame length
+        selectedSize, okPressed = QtWidgets.QInputDialog.getItem(self,
+                                               "Set Spectrum Parameters",
+                                               "Frame length (longer is finer but slower):",
+                                               items,
+                                               current,
+                                               False)
+        if not okPressed:
+            return
+        # Create a dialog instance for the ripples per revolution
+        newRipples, okPressed = QtWidgets.QInputDialog.getInt(self,
+        "Set Spectrum Parameters", "Generator ripples per revolution:",
+        self.engine.ripplesPerRevolution, 1, 1000)
+        # Cancelling either dialog leaves the spectrum unchanged
+        if not okPressed:
+            return
+        self.engine.setSpectrumParameters(self.fftSizes[items.index(selectedSize)], newRipples)
+        self.RequestSpectrum()
+        self.statusbar.showMessage("Spectrum: %d sample frames, %d ripples per revolution"
+                                   % (self.engine.fftSize, newRipples))
+
+#------------------------------------------------------------------------------         
+    def dialogFilterParams(self):
+        """ Method creates dialog boxes to select a filter and set its parameters """
+        filterNames = [filterType.name for filterType in FILTER_TYPES]
+        # Create a dialog instance to select the type of filter
+        selectedName, okPressed = QtWidgets.QInputDialog.getItem(self,
+                                               "Set Filter Parameters",
+                                               "Filter Type:",
+                                               filterNames,
+                                               filterNames.index(self.engine.signalFilter.name),
+                                               False)
+        if not okPressed:
+            return
+        filterType = FILTER_TYPES[filterNames.index(selectedName)]
+
+        # Suggest current settings if the type is unchanged, defaults otherwise
+        if isinstance(self.engine.signalFilter, filterType):
+            suggested = self.engine.signalFilter
+        else:
+            suggested = filterType()
+
+        # Create a dialog instance for each parameter of the selected filter
+        newParams = {}
+        for attribute, label, low, high, decimals in filterType.parameters:
+            if decimals == 0:
+                newParam, okPressed = QtWidgets.QInputDialog.getInt(self,
+                "Set Filter Parameters", label, getattr(suggested, attribute), low, high)
+            else:
+                newParam, okPressed = QtWidgets.QInputDialog.getDouble(self,
+                "Set Filter Parameters", label, getattr(suggested, attribute), low, high, decimals)
+            # Cancelling any dialog leaves the current filter unchanged
+            if not okPressed:
+                return
+            newParams[attribute] = newParam
+
+        # Replace the filter. The new filter starts from the next sample
+        self.engine.setFilter(filterType(**newParams))
+        self.statusbar.showMessage("New filter: %s" % self.engine.signalFilter.describe())
         
+#------------------------------------------------------------------------------         
+    def dialogLoadResistance(self):
+        """ Method creates a dialog box to set the load resistance used to
+        calculate generated power and energy """
+        # Create a dialog instance
+        newResistance, okPressed = QtWidgets.QInputDialog.getDouble(self,
+        "Set Load Resistance", "Load resistance (ohms):", self.engine.loadResistance,
+        0.1, 100000.0, 1)
+        if okPressed:
+            self.engine.setLoadResistance(newResistance)
+            self.statusbar.showMessage("Load resistance: %g ohms" % newResistance)
+
+#------------------------------------------------------------------------------         
+    def dialogStatisticsWindow(self):
+        """ Method creates a dialog box to set how many seconds the mean,
+        RMS, min, max and power readouts cover """
+        # Create a dialog instance
+        newWindow, okPressed = QtWidgets.QInputDialog.getDouble(self,
+        "Set Statistics Window", "Window length (seconds):", self.engine.statisticsWindow,
+        0.1, 3600.0, 1)
+        if okPressed:
+            self.engine.setStatisticsWindow(newWindow)
+            self.ShowStatistics()
+            self.statusbar.showMessage("Statistics window: %g seconds" % newWindow)
+
+#------------------------------------------------------------------------------         
+    def togglePerformance(self, checked):
+        """ Method switches instrumentation on or off, showing or hiding the
+        performance overlay. Monitoring costs nothing while it is off """
+        monitor = self.engine.monitor
+        monitor.enabled = checked
+        self.lastFrameStart = None
+        if checked:
+            monitor.reset()
+            # Time repaints by standing in for the plot's paintEvent
+            self.mainPlotWindow.paintEvent = self.TimedPaintEvent
+            self.SetOverlayText("")
+            self.performanceOverlay.show()
+            self.performanceStatus.show()
+            self.performanceTimer.start()
+        else:
+            del self.mainPlotWindow.paintEvent
+            self.performanceTimer.stop()
+            self.performanceOverlay.hide()
+            self.performanceStatus.hide()
+            self.renderScheduler.forget(self.SetOverlayText)
+            self.renderScheduler.forget(self.performanceStatus.setText)
+
+#------------------------------------------------------------------------------         
+    def dialogExportRecordings(self):
+        """ Method creates dialog boxes to export recordings to CSV, Parquet
+        or HDF5, optionally only part of each and with fewer samples. Several
+        recordings are exported at once, using every core """
+        if self.exportThread is not None and self.exportThread.is_alive():
+            self.statusbar.showMessage("Wait for the current export to finish")
+            return
+        filePaths, selectedFilter = QtWidgets.QFileDialog.getOpenFileNames(self,
+                                               "Export Recordings",
+                                               self.recordingFolder,
+                                               "Turbine Recordings (*.wtr)")
+        # An empty list is returned if the dialog is cancelled
+        if not filePaths:
+            return
+
+        # Create a dialog instance with every export option
+        dialog = QtWidgets.QDialog(self)
+        dialog.setWindowTitle("Export Recordings")
+        layout = QtWidgets.QFormLayout(dialog)
+        formatBox = QtWidgets.QComboBox()
+        formatBox.addItems([formatType.name for formatType in EXPORT_FORMATS])
+        layout.addRow("File format:", formatBox)
+        reductionBox = QtWidgets.QComboBox()
+        reductionBox.addItems(["Every sample", "Average every N samples",
+                               "Resample at a fixed rate"])
+        layout.addRow("Samples:", reductionBox)
+        decimateBox = QtWidgets.QSpinBox()
+        decimateBox.setRange(2, 100000)
+        decimateBox.setValue(10)
+        layout.addRow("N:", decimateBox)
+        rateBox = QtWidgets.QDoubleSpinBox()
+        rateBox.setRange(0.1, 100000.0)
+        rateBox.setValue(10.0)
+        layout.addRow("Rate (Hz):", rateBox)
+        # Only the setting for the selected reduction can be changed
+        def enableSettings(index):
+            decimateBox.setEnabled(index == 1)
+            rateBox.setEnabled(index == 2)
+        reductionBox.currentIndexChanged.connect(enableSettings)
+        enableSettings(0)
+        # Zero means from the beginning, or to the end
+        startBox = QtWidgets.QDoubleSpinBox()
+        startBox.setRange(0.0, 1e7)
+        startBox.setSpecialValueText("Beginning")
+        layout.addRow("From (s):", startBox)
+        endBox = QtWidgets.QDoubleSpinBox()
+        endBox.setRange(0.0, 1e7)
+        endBox.setSpecialValueText("End")
+        layout.addRow("To (s):", endBox)
+        buttons = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Ok |
+                                             QtWidgets.QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addRow(buttons)
+        if dialog.exec() != QtWidgets.QDialog.Accepted:
+            return
+
+        # Create a dialog instance to select where the exports are saved
+        outputFolder = QtWidgets.QFileDialog.getExistingDirectory(self,
+                                               "Select Export Folder",
+                                               os.path.dirname(filePaths[0]))
+        if not outputFolder:
+            return
+
+        options = {'startSeconds': startBox.value() or None,
+                   'endSeconds': endBox.value() or None}
+        if reductionBox.currentIndex() == 1:
+            options['decimate'] = decimateBox.value()
+        elif reductionBox.currentIndex() == 2:
+            options['resampleRate'] = rateBox.value()
+        formatType = EXPORT_FORMATS[formatBox.currentIndex()]
+
+        # Export on a background thread, which hands the recordings out to
+        # worker processes, so the plot keeps running
+        self.nExportsPending = len(filePaths)
+        self.exportThread = threading.Thread(target=exportRecordings,
+                                             args=(filePaths, outputFolder, formatType),
+                                             kwargs=dict(options,
+                                                         finished=self.recordingExported.emit))
+        self.exportThread.daemon = True
+        self.exportThread.start()
+        self.statusbar.showMessage("Exporting %d recordings to %s..."
+                                   % (len(filePaths), outputFolder))
+
+#------------------------------------------------------------------------------         
+    def dialogExportPerformance(self):
+        """ Method creates a dialog box to save the performance report """
+        defaultPath = os.path.join(self.recordingFolder,
+                                   time.strftime("Performance_%Y%m%d_%H%M%S.json"))
+        filePath, selectedFilter = QtWidgets.QFileDialog.getSaveFileName(self,
+                                               "Export Performance Report",
+                                               defaultPath,
+                                               "Performance Reports (*.json)")
+        # An empty string is returned if the dialog is cancelled
+        if not filePath:
+            return
+        self.engine.collectCounters()
+        try:
+            self.engine.monitor.export(filePath)
+        except OSError as err:
+            self.statusbar.showMessage("Unable to export performance report: %s" % err)
+            return
+        self.statusbar.showMessage("Performance report saved to %s" % filePath)
+
+#------------------------------------------------------------------------------ 
+def MeasureStartup(app, form, startupTimes):
+    """Records when the window is first shown and when the com ports are
+    first listed, then prints all startup times (seconds since the script
+    started) as JSON and quits. Used by Benchmark.py"""
+    import json
+    def recordStartup(stage):
+        if stage not in startupTimes:
+            startupTimes[stage] = time.perf_counter() - startTime
+        # Ports may have been listed before this was connected. If so, the
+        # window being shown is as close as can be told
+        if stage == 'shownSeconds' and form.portScanner.lastDevices is not None:
+            startupTimes.setdefault('portsSeconds', startupTimes[stage])
+        if 'shownSeconds' in startupTimes and 'portsSeconds' in startupTimes:
+            print(json.dumps(startupTimes))
+            sys.stdout.flush()
+            app.quit()
+    form.portsFound.connect(lambda ports: recordStartup('portsSeconds'))
+    # Runs once the event loop starts, after the window's first paint
+    QtCore.QTimer.singleShot(0, lambda: recordStartup('shownSeconds'))
+
 #------------------------------------------------------------------------------ 
 # This conditional executes the loop
 if __name__=="__main__":
-    # Define that the app will draw from pyqt4
-    app = QtGui.QApplication(sys.argv)
+    # Lets the packaged executable start export worker processes
+    multiprocessing.freeze_support()
+    startupTimes = {'importSeconds': time.perf_counter() - startTime}
+    # Define that the app will draw from pyqt5
+    app = QtWidgets.QApplication(sys.argv)
     # Set style of app to 'CleanLooks'
     style = app.setStyle('CleanLooks')
     # Set the layout and behavour of the app by linking it to class generated above
     form = PlottingApp()
+    startupTimes['windowSeconds'] = time.perf_counter() - startTime
+    # Ports named on the command line (such as a SimulatedArduino) are used
+    # instead of the default
+    arguments = app.arguments()[1:]
+    measureFlag = '--startup-time' in arguments
+    arguments = [argument for argument in arguments if argument != '--startup-time']
+    if len(arguments) > 0:
+        form.arduinoPorts = arguments
+        form.portsChosenFlag = True
     # Start the app
     form.show()
     form.update() #start with something
+    if measureFlag:
+        MeasureStartup(app, form, startupTimes)
     sys.exit(app.exec_())
     # Print debug on exit
\ No newline at end of file
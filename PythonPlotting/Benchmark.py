@@ -0,0 +1,440 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the acquisition pipeline, runnable on any Linux machine
+without an arduino or a display. Four sets of measurements are made:
+
+    stages      cost of each processing stage on synthetic data: parsing
+                (every serial format), timestamping, filtering (every filter
+                type), buffering (history and min/max index), statistics
+                (windowed statistics, power and energy), spectrum (STFT,
+                dominant frequency), recording and rendering (curve data
+                for one frame)
+    end to end  a simulated arduino feeds the acquisition engine through a
+                pseudo terminal in real time. Reports samples per second
+                received, samples lost (dropped by the engine or missing
+                from the sequence numbers) and the latency from a sample being
+                written to the port to it being filtered and indexed
+    sharing     a stream server publishes synthetic samples in real time to
+                several clients over the loopback network. Reports the cost
+                of each publish, and the samples per second each client
+                received and lost
+    startup     the plotter is started (by default AcquisitionScript.py, or
+                any command, e.g. the packaged executable) several times,
+                and the time to import, build and show the window and to
+                list the com ports is measured, along with the total run
+
+Typical use, failing (exit status 1) if any stage is slower than 1 million
+samples per second, the live pipeline loses samples, or the window takes
+more than 2 seconds to appear:
+
+    python Benchmark.py --min-rate 1e6 --max-startup 2 --json results.json
+
+To time the packaged executable instead of the script:
+
+    python Benchmark.py --startup-command path/to/the/executable
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, pyserial, SimulatedArduino.py, AcquisitionEngine.py,
+          StreamServer.py, NetworkSource.py
+          (pyqtgraph and PyQt5 optional, to include drawing in render cost)
+
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+from AcquisitionEngine import AcquisitionEngine
+from DecimationPyramid import MinMaxPyramid
+from SerialProtocol import AsciiDecoder, BinaryDecoder, LegacyAsciiDecoder, PROTOCOL_TYPES
+from SampleClock import SampleClock
+from SessionRecorder import SessionRecorder
+import SignalFilters
+from SignalFilters import FILTER_TYPES
+from StreamingStats import WindowedStats, PowerMeter
+from SpectrumAnalyzer import SpectrumAnalyzer
+from SimulatedArduino import SimulatedArduino, encodeAscii, encodeFrames, voltsToCounts
+from StreamServer import StreamServer
+from NetworkSource import connectStream
+
+
+#------------------------------------------------------------------------------
+def timeBatches(function, batches):
+    """Call function on every batch. Returns the total time taken"""
+    tStart = time.perf_counter()
+    for batch in batches:
+        function(batch)
+    return time.perf_counter() - tStart
+
+
+#------------------------------------------------------------------------------
+def splitBatches(values, batchSize):
+    """Split an array into batches of batchSize"""
+    return [values[i:i+batchSize] for i in range(0, len(values), batchSize)]
+
+
+#------------------------------------------------------------------------------
+def stageResult(stage, nSamples, nBatches, seconds):
+    """Summarise the time taken to process nSamples in nBatches"""
+    return {'stage': stage,
+            'samplesPerSecond': nSamples/seconds,
+            'microsecondsPerBatch': 1e6*seconds/nBatches}
+
+
+#------------------------------------------------------------------------------
+def benchmarkStages(nSamples, batchSize):
+    """Time each processing stage on nSamples of synthetic data, in batches
+    of batchSize as the reader threads would deliver them"""
+    # A noisy sine wave, sampled at 100 Hz
+    times = np.arange(nSamples)/100.0
+    volts = 0.5 + 0.3*np.sin(2*np.pi*times/5.0) + \
+        0.01*np.random.default_rng(0).standard_normal(nSamples)
+    results = []
+
+    # Parsing. The encoded stream is cut at arbitrary points, as a serial
+    # read would, so partial lines and frames are carried over
+    nWhole = nSamples - nSamples % BinaryDecoder.samplesPerFrame
+    sequence = np.arange(nSamples)
+    encoded = {AsciiDecoder: encodeAscii(volts, sequence, 10000*sequence),
+               BinaryDecoder: encodeFrames(voltsToCounts(volts[:nWhole])),
+               LegacyAsciiDecoder: encodeAscii(volts)}
+    for protocolType in PROTOCOL_TYPES:
+        stream = encoded[protocolType]
+        bytesPerBatch = len(stream)*batchSize//nSamples
+        blocks = [stream[i:i+bytesPerBatch] for i in range(0, len(stream), bytesPerBatch)]
+        decoder = protocolType()
+        seconds = timeBatches(decoder.decode, blocks)
+        results.append(stageResult("parse %s" % protocolType.name, nSamples, len(blocks), seconds))
+
+    # Timestamping: rebuilding the time axis from sequence numbers and micros()
+    sampleClock = SampleClock()
+    sequenceBatches = splitBatches(sequence, batchSize)
+    arrivalTimes = iter(times[batchSize-1::batchSize].tolist() + [times[-1]])
+    seconds = timeBatches(lambda batch: sampleClock.timestamp(batch, 10000*batch,
+                                                              next(arrivalTimes)),
+                          sequenceBatches)
+    results.append(stageResult("timestamp", nSamples, len(sequenceBatches), seconds))
+
+    # Filtering, for every filter type at its default settings. SciPy is
+    # imported first, so the first filter timed does not pay for it
+    SignalFilters.preload()
+    voltBatches = splitBatches(volts, batchSize)
+    for filterType in FILTER_TYPES:
+        signalFilter = filterType()
+        seconds = timeBatches(signalFilter.process, voltBatches)
+        results.append(stageResult("filter %s" % filterType.name, nSamples,
+                                   len(voltBatches), seconds))
+
+    # Buffering: appending to the history and updating its min/max index
+    pyramid = MinMaxPyramid()
+    timeBatchList = splitBatches(times, batchSize)
+    iBatch = iter(timeBatchList)
+    seconds = timeBatches(lambda values: pyramid.extend(next(iBatch), values), voltBatches)
+    results.append(stageResult("buffer", nSamples, len(voltBatches), seconds))
+
+    # Statistics: windowed mean, RMS, min and max, power and energy
+    statistics = WindowedStats()
+    powerMeter = PowerMeter(statistics=statistics)
+    iBatch = iter(timeBatchList)
+    def updateStatistics(values):
+        batchTimes = next(iBatch)
+        statistics.update(batchTimes, values)
+        powerMeter.update(batchTimes, values)
+    seconds = timeBatches(updateStatistics, voltBatches)
+    results.append(stageResult("statistics", nSamples, len(voltBatches), seconds))
+
+    # Spectrum: incremental STFT and peak search, at the engine's defaults
+    analyzer = SpectrumAnalyzer(256, 64)
+    iBatch = iter(timeBatchList)
+    seconds = timeBatches(lambda values: analyzer.push(next(iBatch), values), voltBatches)
+    results.append(stageResult("spectrum", nSamples, len(voltBatches), seconds))
+
+    # Recording: queueing batches and writing them to a temporary file
+    with tempfile.TemporaryDirectory() as folder:
+        recorder = SessionRecorder(os.path.join(folder, "benchmark.wtr"))
+        iBatch = iter(timeBatchList)
+        tStart = time.perf_counter()
+        for values in voltBatches:
+            recorder.write(next(iBatch), values, values)
+        recorder.close()
+        seconds = time.perf_counter() - tStart
+    results.append(stageResult("record", nSamples, len(voltBatches), seconds))
+
+    results.extend(benchmarkRender(pyramid))
+    return results
+
+
+#------------------------------------------------------------------------------
+def benchmarkRender(pyramid, nFrames=200, widthPixels=1000, windowSamples=500):
+    """Time preparing (and if possible drawing) one frame of plot data, for
+    the scrolling window and for the whole history"""
+    times = pyramid.timeArray()
+    views = [("render window", times[-windowSamples], times[-1]),
+             ("render history", times[0], times[-1])]
+
+    # Include pyqtgraph's own work if it is available. Drawing is done
+    # offscreen, so no display is needed
+    plotCurve = None
+    try:
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt5 import QtWidgets
+        import pyqtgraph as pg
+        app = QtWidgets.QApplication.instance() or QtWidgets.QApplication(sys.argv[:1])
+        plotWidget = pg.PlotWidget()
+        plotWidget.resize(widthPixels, 400)
+        plotCurve = plotWidget.plot()
+    except ImportError:
+        pass
+
+    results = []
+    for stage, xMin, xMax in views:
+        tStart = time.perf_counter()
+        for iFrame in range(nFrames):
+            x, y = pyramid.query(xMin, xMax, 2*widthPixels)
+            if plotCurve is not None:
+                plotCurve.setData(x, y)
+                plotWidget.grab()
+        seconds = time.perf_counter() - tStart
+        results.append({'stage': stage, 'pointsPerFrame': len(x),
+                        'millisecondsPerFrame': 1e3*seconds/nFrames,
+                        'drawn': plotCurve is not None})
+    return results
+
+
+#------------------------------------------------------------------------------
+def benchmarkEndToEnd(protocolType, sampleRate, duration, displayRate=30, monitored=False):
+    """Feed the acquisition engine from a simulated arduino in real time.
+    If monitored, the engine's own instrumentation report is included"""
+    simulator = SimulatedArduino(protocolType, sampleRate)
+    simulator.logSends = True
+    engine = AcquisitionEngine(protocolType)
+    engine.monitor.enabled = monitored
+    simulator.start()
+    try:
+        engine.openSerialChannels([simulator.portName])
+        channel = engine.channels[0]
+        # Discard everything sent so far, with the simulator paused, so the
+        # engine's first sample is the simulator's next one
+        with simulator.sendLock:
+            channel.serialPort.reset_input_buffer()
+            nFlushed = simulator.samplesSent
+            nDiscarded = simulator.samplesDiscarded
+        engine.start()
+        tStart = time.perf_counter()
+
+        # Process once per display frame, as the GUI would
+        latencies = []
+        tStop = tStart + duration
+        while time.perf_counter() < tStop:
+            time.sleep(1.0/displayRate)
+            if engine.process() == 0:
+                continue
+            # Time since the newest processed sample was written to the port
+            sendTime = simulator.sendTimeOf(nFlushed + len(channel.pyramid))
+            if sendTime is not None:
+                latencies.append(time.perf_counter() - sendTime)
+        tEnd = time.perf_counter()
+        nReceived = len(channel.pyramid)
+        droppedSamples = channel.dataSource.droppedSamples
+        decoder = channel.dataSource.decoder
+        sampleClock = channel.dataSource.sampleClock
+        engine.collectCounters()
+    finally:
+        engine.stop()
+        simulator.stop()
+
+    latencies = np.array(latencies)*1e3
+    result = {'stage': "end to end %s" % protocolType.name,
+              'sampleRate': sampleRate,
+              'samplesPerSecond': nReceived/(tEnd - tStart),
+              'droppedSamples': droppedSamples + simulator.samplesDiscarded - nDiscarded,
+              'badLinesOrFrames': getattr(decoder, 'badLines', 0) + getattr(decoder, 'badFrames', 0),
+              'missingSamples': sampleClock.missingSamples,
+              'resyncs': sampleClock.resyncs}
+    if len(latencies) > 0:
+        result.update({'latencyMedianMs': float(np.median(latencies)),
+                       'latency95Ms': float(np.percentile(latencies, 95)),
+                       'latencyMaxMs': float(latencies.max())})
+    if monitored:
+        result['monitor'] = engine.monitor.report()
+    return result
+
+
+#------------------------------------------------------------------------------
+def benchmarkSharing(nClients, sampleRate, duration, displayRate=30):
+    """Publish synthetic samples in real time, a batch per display frame as
+    the GUI would, to nClients connected over the loopback network"""
+    server = StreamServer(0, '127.0.0.1')
+    server.start()
+    connections = []
+    try:
+        server.setChannels(['turbine'], time.time())
+        for iClient in range(nClients):
+            connection = connectStream('127.0.0.1:%d' % server.port)
+            connection.start()
+            connections.append(connection)
+        # Wait for the server to accept every client, so none misses a batch
+        while server.clientCount() < nClients:
+            time.sleep(0.01)
+
+        received = [0]*nClients
+        publishTimes = []
+        nPublished = 0
+        tStart = time.perf_counter()
+        tStop = tStart + duration
+        while time.perf_counter() < tStop:
+            time.sleep(1.0/displayRate)
+            nDue = int((time.perf_counter() - tStart)*sampleRate)
+            times = np.arange(nPublished, nDue)/sampleRate
+            raw = 0.5 + 0.3*np.sin(2*np.pi*times/5.0)
+            tPublish = time.perf_counter()
+            server.publish(0, times, raw)
+            publishTimes.append(time.perf_counter() - tPublish)
+            nPublished = nDue
+            for iClient, connection in enumerate(connections):
+                received[iClient] += len(connection.sources[0].readAvailable()[0])
+        tEnd = time.perf_counter()
+        # Let the last batches arrive
+        time.sleep(0.2)
+        for iClient, connection in enumerate(connections):
+            received[iClient] += len(connection.sources[0].readAvailable()[0])
+        droppedSamples = sum(connection.sources[0].droppedSamples for connection in connections)
+        droppedBatches = server.totalDroppedBatches()
+    finally:
+        for connection in connections:
+            connection.stop()
+        server.stop()
+
+    publishTimes = np.array(publishTimes)*1e6
+    return {'stage': "sharing %d clients" % nClients,
+            'sampleRate': sampleRate,
+            'samplesPerSecond': min(received)/(tEnd - tStart),
+            'publishMedianUs': float(np.median(publishTimes)),
+            'publishMaxUs': float(publishTimes.max()),
+            'droppedSamples': droppedSamples + nPublished*nClients - sum(received),
+            'droppedBatches': droppedBatches}
+
+
+#------------------------------------------------------------------------------
+def benchmarkStartup(command=None, repeats=3, timeout=60.0):
+    """Start the plotter repeatedly with --startup-time and report the
+    median of each startup time it prints, and of the whole run (including
+    starting the interpreter or unpacking the executable, which the plotter
+    cannot time itself). Runs offscreen if no display is set"""
+    if command is None:
+        command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                'AcquisitionScript.py')]
+    environment = dict(os.environ)
+    environment.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    runs = []
+    for iRun in range(repeats):
+        tStart = time.perf_counter()
+        completed = subprocess.run(command + ['--startup-time'], stdout=subprocess.PIPE,
+                                   stderr=subprocess.DEVNULL, env=environment,
+                                   timeout=timeout, universal_newlines=True)
+        totalSeconds = time.perf_counter() - tStart
+        # The startup times are the last line printed
+        lines = completed.stdout.strip().splitlines()
+        if completed.returncode != 0 or len(lines) == 0:
+            raise RuntimeError("%s exited with status %d" % (command[-1], completed.returncode))
+        startupTimes = json.loads(lines[-1])
+        startupTimes['totalSeconds'] = totalSeconds
+        runs.append(startupTimes)
+    result = {'stage': 'startup', 'runs': repeats}
+    for key in ['importSeconds', 'windowSeconds', 'shownSeconds', 'portsSeconds',
+                'totalSeconds']:
+        result[key] = float(np.median([run[key] for run in runs]))
+    return result
+
+
+#------------------------------------------------------------------------------
+def printResult(result):
+    """Print one result as a line of the results table"""
+    details = ", ".join("%s %s" % (key, ("%.4g" % value) if isinstance(value, float) else value)
+                        for key, value in result.items() if key not in ['stage', 'monitor'])
+    print("%-24s %s" % (result['stage'], details))
+
+
+#------------------------------------------------------------------------------
+def main():
+    """Run the benchmarks and report the results"""
+    parser = argparse.ArgumentParser(description="Benchmark the acquisition pipeline")
+    parser.add_argument('--samples', type=int, default=1000000,
+                        help="samples processed by each stage benchmark")
+    parser.add_argument('--batch', type=int, default=100, help="samples per batch")
+    parser.add_argument('--rate', type=float, default=2000.0,
+                        help="simulated arduino sample rate for the end to end benchmark")
+    parser.add_argument('--duration', type=float, default=5.0,
+                        help="seconds to run each end to end benchmark (0 to skip)")
+    parser.add_argument('--min-rate', type=float, default=None,
+                        help="fail if any stage processes fewer samples per second")
+    parser.add_argument('--monitor', action='store_true',
+                        help="enable the engine's instrumentation during the end to end "
+                             "benchmarks and print its summary")
+    parser.add_argument('--clients', type=int, default=8,
+                        help="clients to share data with in the sharing benchmark (0 to skip)")
+    parser.add_argument('--startup', type=int, default=3,
+                        help="times to start the plotter for the startup benchmark (0 to skip)")
+    parser.add_argument('--startup-command', nargs='+', metavar='ARG',
+                        help="command which starts the plotter, e.g. the packaged executable "
+                             "(default: this python running AcquisitionScript.py)")
+    parser.add_argument('--max-startup', type=float, default=None,
+                        help="fail if the window takes longer than this many seconds to appear")
+    parser.add_argument('--json', metavar='FILE', help="also save the results to FILE")
+    args = parser.parse_args()
+
+    results = benchmarkStages(args.samples, args.batch)
+    for result in results:
+        printResult(result)
+    if args.duration > 0:
+        for protocolType in PROTOCOL_TYPES:
+            result = benchmarkEndToEnd(protocolType, args.rate, args.duration,
+                                       monitored=args.monitor)
+            printResult(result)
+            if args.monitor:
+                for stage, stats in sorted(result['monitor']['stages'].items()):
+                    print("    %-20s %8.3f ms mean, %8.3f ms p99, %d calls" %
+                          (stage, 1e3*stats['meanSeconds'], 1e3*stats['p99Seconds'],
+                           stats['calls']))
+            results.append(result)
+    if args.duration > 0 and args.clients > 0:
+        result = benchmarkSharing(args.clients, args.rate, args.duration)
+        printResult(result)
+        results.append(result)
+    if args.startup > 0:
+        result = benchmarkStartup(args.startup_command, args.startup)
+        printResult(result)
+        results.append(result)
+
+    if args.json:
+        with open(args.json, 'w') as outputFile:
+            json.dump(results, outputFile, indent=2)
+
+    # Regression checks
+    failures = []
+    if args.min_rate is not None:
+        failures += ["%s: %.4g samples/s" % (result['stage'], result['samplesPerSecond'])
+                     for result in results
+                     if 'samplesPerSecond' in result and 'sampleRate' not in result
+                     and result['samplesPerSecond'] < args.min_rate]
+    failures += ["%s: %d samples lost" % (result['stage'], result['droppedSamples'])
+                 for result in results if result.get('droppedSamples', 0) > 0]
+    if args.max_startup is not None:
+        failures += ["%s: window shown after %.3g s" % (result['stage'], result['shownSeconds'])
+                     for result in results
+                     if 'shownSeconds' in result and result['shownSeconds'] > args.max_startup]
+    for failure in failures:
+        print("FAILED %s" % failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-resolution min/max index used to plot long histories. Each level of
+the pyramid summarises blocks of the level below by their minimum and
+maximum, so any range of samples can be drawn with about as many points as
+there are pixels on screen while every peak remains visible. The pyramid is
+updated incrementally as samples arrive, at O(1) cost per sample. The live
+history is stored in fixed size chunks which are never copied, so a long
+session never pauses while its storage grows.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy
+
+"""
+
+import numpy as np
+
+
+class ChunkedArray(object):
+    """Array which can be appended to, stored in fixed size chunks.
+
+    Full chunks are never copied or moved, so appending costs the same
+    however long the array, with no pauses to grow it. Supports len,
+    integer and slice indexing, and indexing with an ascending array of
+    indices. Contiguous slices within one chunk are views; anything else
+    is a copy.
+    """
+#------------------------------------------------------------------------------
+    def __init__(self, dtype=np.float64, chunkSize=65536):
+        self.dtype = np.dtype(dtype)
+        self.chunkSize = chunkSize
+        self.chunks = []
+        self.nFilled = 0
+
+#------------------------------------------------------------------------------
+    def __len__(self):
+        return self.nFilled
+
+#------------------------------------------------------------------------------
+    def extend(self, values):
+        """Append an array of values"""
+        nFilled = self.nFilled
+        iValue = 0
+        while iValue < len(values):
+            iChunk, iOffset = divmod(nFilled, self.chunkSize)
+            if iChunk == len(self.chunks):
+                self.chunks.append(np.zeros(self.chunkSize, dtype=self.dtype))
+            nCopy = min(self.chunkSize - iOffset, len(values) - iValue)
+            self.chunks[iChunk][iOffset:iOffset + nCopy] = values[iValue:iValue + nCopy]
+            iValue += nCopy
+            nFilled += nCopy
+        # Only count the new values once they have been written, so other
+        # threads reading the array never see unwritten values
+        self.nFilled = nFilled
+
+#------------------------------------------------------------------------------
+    def __getitem__(self, index):
+        nFilled = self.nFilled
+        if isinstance(index, slice):
+            iStart, iStop, step = index.indices(nFilled)
+            if step != 1:
+                return self.take(np.arange(iStart, iStop, step))
+            if iStop <= iStart:
+                return np.zeros(0, dtype=self.dtype)
+            iFirst, iLast = iStart//self.chunkSize, (iStop - 1)//self.chunkSize
+            if iFirst == iLast:
+                return self.chunks[iFirst][iStart - iFirst*self.chunkSize:
+                                           iStop - iFirst*self.chunkSize]
+            return self.take(np.arange(iStart, iStop))
+        if isinstance(index, np.ndarray):
+            return self.take(index)
+        index = int(index)
+        if index < 0:
+            index += nFilled
+        if not 0 <= index < nFilled:
+            raise IndexError("index %d out of range" % index)
+        return self.chunks[index//self.chunkSize][index % self.chunkSize]
+
+#------------------------------------------------------------------------------
+    def take(self, indices):
+        """Return the values at an ascending array of indices"""
+        indices = np.asarray(indices, dtype=np.int64)
+        result = np.empty(len(indices), dtype=self.dtype)
+        if len(indices) == 0:
+            return result
+        iChunks = indices//self.chunkSize
+        # Gather from each chunk in turn
+        for iChunk in range(int(iChunks[0]), int(iChunks[-1]) + 1):
+            iLow, iHigh = np.searchsorted(iChunks, [iChunk, iChunk + 1])
+            if iHigh > iLow:
+                result[iLow:iHigh] = self.chunks[iChunk][indices[iLow:iHigh] -
+                                                         iChunk*self.chunkSize]
+        return result
+
+#------------------------------------------------------------------------------
+    def searchsorted(self, values):
+        """As np.searchsorted (side 'left'), for ascending contents"""
+        nFilled = self.nFilled
+        positions = np.zeros(len(values), dtype=np.int64)
+        if nFilled == 0:
+            return positions
+        nChunks = -(-nFilled//self.chunkSize)
+        chunkFirsts = np.array([self.chunks[iChunk][0] for iChunk in range(nChunks)])
+        for iValue, value in enumerate(values):
+            # Last chunk starting below value, then the position within it
+            iChunk = max(int(np.searchsorted(chunkFirsts, value)) - 1, 0)
+            nInChunk = min(self.chunkSize, nFilled - iChunk*self.chunkSize)
+            positions[iValue] = iChunk*self.chunkSize + \
+                int(np.searchsorted(self.chunks[iChunk][:nInChunk], value))
+        return positions
+
+#------------------------------------------------------------------------------
+    def clear(self):
+        self.chunks = []
+        self.nFilled = 0
+
+
+class MinMaxPyramid(object):
+    """Min/max decimation pyramid over a stream of (time, value) samples.
+
+    Level 0 is the samples themselves. Each entry of level 1 holds the
+    minimum and maximum of 'baseFactor' samples, and each entry of level k
+    above it those of 'factor' entries of level k-1. Times must increase
+    monotonically.
+
+    Samples are either appended with extend (live data), or level 0 is an
+    existing array such as a memory mapped recording (see fromArrays), in
+    which case updateLevels is called to index it in chunks. The pyramid may
+    be queried while another thread is extending or indexing it.
+    """
+#------------------------------------------------------------------------------
+    def __init__(self, factor=4, baseFactor=None):
+        self.factor = factor
+        self.baseFactor = factor if baseFactor is None else baseFactor
+        self.times = ChunkedArray(np.float64)
+        self.values = ChunkedArray(np.float64)
+        # Final number of samples if known (recordings), so each level can be
+        # allocated at its final length. None for live data
+        self.nFinal = None
+        # Upper levels as (minimums, maximums) pairs, level 1 first
+        self.levels = []
+        # Number of level 0 samples covered by the levels
+        self.nIndexed = 0
+        # Set from another thread to abandon buildIndex part way
+        self.abortIndexing = False
+
+#------------------------------------------------------------------------------
+    @classmethod
+    def fromArrays(cls, times, values, factor=4, baseFactor=256):
+        """Create an unindexed pyramid over existing arrays (which may be
+        memory mapped). Call updateLevels to build the index.
+
+        Level 0 is read straight from the arrays, so level 1 can be coarse;
+        with the default baseFactor the index takes under 1% of the memory
+        of the samples. Views finer than level 1 are summarised from level 0
+        when queried."""
+        pyramid = cls(factor, baseFactor)
+        pyramid.times = times
+        pyramid.values = values
+        pyramid.nFinal = len(values)
+        return pyramid
+
+#------------------------------------------------------------------------------
+    def __len__(self):
+        return len(self.times)
+
+#------------------------------------------------------------------------------
+    def extend(self, times, values):
+        """Append a batch of samples and update the levels above them"""
+        self.times.extend(times)
+        self.values.extend(values)
+        self.updateLevels(len(self.values))
+
+#------------------------------------------------------------------------------
+    def clear(self):
+        """Discard all samples"""
+        self.times.clear()
+        self.values.clear()
+        self.levels = []
+        self.nIndexed = 0
+
+#------------------------------------------------------------------------------
+    def blockSize(self, iLevel):
+        """Return the number of samples summarised by each entry of level
+        iLevel (1 for level 0)"""
+        if iLevel == 0:
+            return 1
+        return self.baseFactor*self.factor**(iLevel - 1)
+
+#------------------------------------------------------------------------------
+    def updateLevels(self, nAvailable):
+        """Summarise level 0 samples up to nAvailable into the upper levels.
+        Only blocks completed since the last call are computed."""
+        # Level 0 acts as both the minimum and maximum of itself
+        sourceMin = sourceMax = self.sampleArray()
+        nSource = nAvailable
+        iLevel = 0
+        levelFactor = self.baseFactor
+        while nSource >= levelFactor:
+            if iLevel == len(self.levels):
+                # A single chunk of its final length when known
+                chunkSize = 65536
+                if self.nFinal is not None:
+                    chunkSize = max(self.nFinal//self.blockSize(iLevel + 1), 1)
+                self.levels.append((ChunkedArray(np.float32, chunkSize),
+                                    ChunkedArray(np.float32, chunkSize)))
+            levelMin, levelMax = self.levels[iLevel]
+
+            # New complete blocks in the level below
+            iFirst = len(levelMin)
+            nNew = nSource//levelFactor - iFirst
+            if nNew <= 0:
+                break
+            iStart = iFirst*levelFactor
+            iStop = iStart + nNew*levelFactor
+            blockMin = np.asarray(sourceMin[iStart:iStop]).reshape(nNew, levelFactor)
+            blockMax = np.asarray(sourceMax[iStart:iStop]).reshape(nNew, levelFactor)
+            levelMin.extend(blockMin.min(axis=1))
+            levelMax.extend(blockMax.max(axis=1))
+
+            sourceMin = levelMin
+            sourceMax = levelMax
+            nSource = len(levelMin)
+            iLevel += 1
+            levelFactor = self.factor
+        self.nIndexed = nAvailable
+
+#------------------------------------------------------------------------------
+    def buildIndex(self, chunkSize=1048576):
+        """Index all of level 0 a chunk at a time, so only one chunk of a
+        memory mapped array is ever held in memory. Returns False if aborted"""
+        nSamples = len(self.values)
+        while self.nIndexed < nSamples:
+            if self.abortIndexing:
+                return False
+            self.updateLevels(min(self.nIndexed + chunkSize, nSamples))
+        return True
+
+#------------------------------------------------------------------------------
+    def sampleArray(self):
+        """Return level 0 values, as an array or a ChunkedArray"""
+        return self.values
+
+#------------------------------------------------------------------------------
+    def timeArray(self):
+        """Return level 0 times, as an array or a ChunkedArray"""
+        return self.times
+
+#------------------------------------------------------------------------------
+    def query(self, xMin, xMax, maxPoints):
+        """Return (x, y) arrays to plot for times xMin to xMax using at most
+        about maxPoints points. Blocks are drawn as a min and a max point at
+        the block's start time, so peaks are preserved."""
+        times = self.timeArray()
+        nSamples = len(times)
+        if nSamples == 0:
+            return np.zeros(0), np.zeros(0)
+        # Include one sample either side so lines run off the edge of the view
+        if isinstance(times, ChunkedArray):
+            iStart, iStop = times.searchsorted([xMin, xMax])
+        else:
+            iStart, iStop = np.searchsorted(times, [xMin, xMax])
+        iStart = max(int(iStart) - 1, 0)
+        iStop = min(int(iStop) + 1, nSamples)
+        if iStop <= iStart:
+            return np.zeros(0), np.zeros(0)
+        return self.queryIndex(iStart, iStop, maxPoints)
+
+#------------------------------------------------------------------------------
+    def queryIndex(self, iStart, iStop, maxPoints):
+        """As query, but for the samples iStart to iStop"""
+        times = self.timeArray()
+        values = self.sampleArray()
+        # Each block is drawn with two points
+        maxBlocks = max(maxPoints//2, 1)
+
+        # Coarsest level needed: blocks no smaller than span/maxBlocks
+        nLevels = len(self.levels)
+        iLevel = 0
+        while iLevel < nLevels and (iStop - iStart)/self.blockSize(iLevel) > maxBlocks:
+            iLevel += 1
+
+        # Level 1 is coarser than the view needs, so summarise level 0
+        # directly. At most maxBlocks*baseFactor samples are read
+        if iLevel == 1 and self.baseFactor > self.factor and \
+                iStop - iStart <= maxBlocks*self.baseFactor:
+            return self.summariseRange(iStart, iStop, maxBlocks)
+
+        xParts = []
+        yParts = []
+        iPos = iStart
+        # Work down from the chosen level. Blocks at the end of the range not
+        # yet complete at one level are drawn from the level below
+        for iUpper in range(iLevel, 0, -1):
+            levelMin, levelMax = self.levels[iUpper - 1]
+            blockSize = self.blockSize(iUpper)
+            nBlocks = len(levelMin)
+            bStart = iPos//blockSize
+            bStop = min(-(-iStop//blockSize), nBlocks)
+            if bStop > bStart:
+                blockTimes = times[np.arange(bStart, bStop)*blockSize]
+                xParts.append(np.repeat(blockTimes, 2))
+                yParts.append(np.column_stack((levelMin[bStart:bStop],
+                                               levelMax[bStart:bStop])).ravel())
+                iPos = bStop*blockSize
+            if iPos >= iStop:
+                break
+
+        # Remaining samples at full resolution. If they have not been indexed
+        # yet (recording still being indexed) thin them out evenly instead
+        if iPos < iStop:
+            step = max((iStop - iPos)//maxPoints, 1)
+            xParts.append(np.asarray(times[iPos:iStop:step], dtype=np.float64))
+            yParts.append(np.asarray(values[iPos:iStop:step], dtype=np.float64))
+
+        return np.concatenate(xParts), np.concatenate(yParts)
+
+#------------------------------------------------------------------------------
+    def summariseRange(self, iStart, iStop, maxBlocks):
+        """Return (x, y) arrays drawing samples iStart to iStop as at most
+        maxBlocks min/max blocks, computed from level 0"""
+        times = self.timeArray()
+        values = np.asarray(self.sampleArray()[iStart:iStop], dtype=np.float64)
+        blockSize = -(-(iStop - iStart)//maxBlocks)
+        if blockSize <= 1:
+            return np.asarray(times[iStart:iStop], dtype=np.float64), values
+        # The last block may be partial
+        blockStarts = np.arange(0, iStop - iStart, blockSize)
+        blockTimes = np.asarray(times[iStart:iStop:blockSize], dtype=np.float64)
+        blockMin = np.minimum.reduceat(values, blockStarts)
+        blockMax = np.maximum.reduceat(values, blockStarts)
+        return np.repeat(blockTimes, 2), np.column_stack((blockMin, blockMax)).ravel()
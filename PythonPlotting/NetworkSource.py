@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+"""
+Receives live data shared by another plotter (see StreamServer.py), as an
+alternative to an arduino. One connection carries every turbine the other
+plotter is acquiring; a NetworkConnection thread reads it and hands each
+turbine's samples to its own NetworkSource, which the acquisition engine
+uses like a SerialReader.
+
+The raw voltages are received and filtered here, so each viewer may choose
+their own filter. Batches the server had to drop for a slow connection show
+up as gaps in the sample numbers and are counted as dropped samples.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, StreamServer.py
+
+"""
+
+import collections
+import json
+import socket
+import struct
+import threading
+import numpy as np
+from StreamServer import (MAGIC, HEADER_FORMAT, HEADER_SIZE, MESSAGE_HELLO, MESSAGE_SAMPLES,
+                          SAMPLES_FORMAT, SAMPLE_DTYPE, PROTOCOL_VERSION, DEFAULT_PORT)
+
+
+class NetworkSource(object):
+    """Data source for one turbine of a shared stream.
+
+    Provides the same start/stop/readAvailable interface as SerialReader.
+    Batches are handed over through a collections.deque, as in SerialReader.
+    """
+#------------------------------------------------------------------------------
+    def __init__(self, connection, channelIndex, startTime, bufferSize=1000):
+        """Source constructor. connection is the shared NetworkConnection"""
+        self.connection = connection
+        self.channelIndex = channelIndex
+        # Session start on the publishing computer. Times are relative to it
+        self.startTime = startTime
+        self.sampleBuffer = collections.deque(maxlen=bufferSize)
+        # Number of the next sample expected, to spot dropped batches. None
+        # until the first batch, as a viewer may join a run part way through
+        self.nextSample = None
+        self.droppedSamples = 0
+        # Holds a description of any connection failure for the GUI to report
+        self.errorMessage = None
+        # A live stream never runs out of data. Present to match ReplaySource
+        self.finished = False
+
+#------------------------------------------------------------------------------
+    def receive(self, firstSample, times, values):
+        """Queue a batch received by the connection thread"""
+        # Samples the server dropped, modulo the 32 bit sample number
+        if self.nextSample is not None:
+            self.droppedSamples += (firstSample - self.nextSample) % 2**32
+        self.nextSample = (firstSample + len(values)) % 2**32
+        if len(self.sampleBuffer) == self.sampleBuffer.maxlen:
+            self.droppedSamples += len(self.sampleBuffer[0][1])
+        self.sampleBuffer.append((times, values))
+
+#------------------------------------------------------------------------------
+    def start(self):
+        """Start receiving. The connection is shared, so only the first
+        source to start actually starts it"""
+        self.connection.startOnce()
+
+#------------------------------------------------------------------------------
+    def readAvailable(self):
+        """Return arrays of the times and values of all samples received
+        since the last call"""
+        batches = []
+        # Pop only what is present now. New arrivals wait for the next call
+        for i in range(len(self.sampleBuffer)):
+            batches.append(self.sampleBuffer.popleft())
+        if len(batches) == 0:
+            return np.zeros(0), np.zeros(0)
+        times, values = zip(*batches)
+        return np.concatenate(times), np.concatenate(values)
+
+#------------------------------------------------------------------------------
+    def stop(self):
+        """Close the shared connection"""
+        self.connection.stop()
+
+
+class NetworkConnection(threading.Thread):
+    """Thread which reads a stream and hands each batch to its channel's
+    NetworkSource. Use connectStream to create one"""
+    # Socket timeout, so stop is responsive
+    receiveTimeout = 0.1
+
+#------------------------------------------------------------------------------
+    def __init__(self, streamSocket, hello):
+        """Connection constructor. streamSocket has already received the
+        HELLO, which is given decoded"""
+        super(NetworkConnection, self).__init__()
+        # Daemon thread so a stalled network never prevents the app closing
+        self.daemon = True
+        self.streamSocket = streamSocket
+        self.channelNames = hello['channels']
+        self.sources = [NetworkSource(self, i, hello['startTime'])
+                        for i in range(len(self.channelNames))]
+        self.stopEvent = threading.Event()
+        self.startLock = threading.Lock()
+        self.startedFlag = False
+
+#------------------------------------------------------------------------------
+    def startOnce(self):
+        """Start the thread unless already started"""
+        with self.startLock:
+            if not self.startedFlag:
+                self.startedFlag = True
+                self.start()
+
+#------------------------------------------------------------------------------
+    def run(self):
+        """Receive and dispatch messages until stopped or disconnected"""
+        self.streamSocket.settimeout(self.receiveTimeout)
+        try:
+            while not self.stopEvent.is_set():
+                messageType, channelIndex, payload = receiveMessage(self.streamSocket,
+                                                                    self.stopEvent)
+                if payload is None:
+                    return
+                if messageType == MESSAGE_HELLO:
+                    # The publisher started a new run, perhaps with other
+                    # turbines. Viewers must start again to follow it
+                    self.reportError("Shared session restarted. Press Reset, then Start")
+                    return
+                if messageType == MESSAGE_SAMPLES and channelIndex < len(self.sources):
+                    firstSample, = struct.unpack_from(SAMPLES_FORMAT, payload)
+                    samples = np.frombuffer(payload, dtype=SAMPLE_DTYPE,
+                                            offset=struct.calcsize(SAMPLES_FORMAT))
+                    self.sources[channelIndex].receive(firstSample,
+                                                       samples['time'].astype(np.float64),
+                                                       samples['raw'].astype(np.float64))
+        except (OSError, ValueError) as err:
+            self.reportError(str(err))
+        finally:
+            self.streamSocket.close()
+
+#------------------------------------------------------------------------------
+    def reportError(self, errorMessage):
+        """Make every channel report errorMessage"""
+        for source in self.sources:
+            source.errorMessage = errorMessage
+
+#------------------------------------------------------------------------------
+    def stop(self, timeout=1.0):
+        """Signal the thread to exit and wait for it to finish"""
+        self.stopEvent.set()
+        if self.is_alive():
+            self.join(timeout)
+        elif not self.startedFlag:
+            self.streamSocket.close()
+
+
+#------------------------------------------------------------------------------
+def receiveExactly(streamSocket, nBytes, stopEvent=None):
+    """Return exactly nBytes from the socket, or None if stopped. Raises
+    OSError if the other end disconnects, or on timeout if there is no
+    stopEvent to check instead"""
+    data = bytearray()
+    while len(data) < nBytes:
+        if stopEvent is not None and stopEvent.is_set():
+            return None
+        try:
+            block = streamSocket.recv(nBytes - len(data))
+        except socket.timeout:
+            if stopEvent is None:
+                raise
+            continue
+        if not block:
+            raise OSError("Connection closed by the other computer")
+        data += block
+    return bytes(data)
+
+
+#------------------------------------------------------------------------------
+def receiveMessage(streamSocket, stopEvent=None):
+    """Return (message type, channel index, payload) of the next message,
+    or a payload of None if stopped. Raises ValueError if the stream is not
+    from a StreamServer"""
+    header = receiveExactly(streamSocket, HEADER_SIZE, stopEvent)
+    if header is None:
+        return None, None, None
+    magic, messageType, channelIndex, payloadSize = struct.unpack(HEADER_FORMAT, header)
+    if magic != MAGIC:
+        raise ValueError("Not a turbine data stream")
+    payload = receiveExactly(streamSocket, payloadSize, stopEvent)
+    return messageType, channelIndex, payload
+
+
+#------------------------------------------------------------------------------
+def parseAddress(address):
+    """Split 'host:port' (or just 'host') into a host and port number"""
+    host, separator, port = address.strip().rpartition(':')
+    if not separator:
+        return address.strip(), DEFAULT_PORT
+    return host, int(port)
+
+
+#------------------------------------------------------------------------------
+def connectStream(address, timeout=5.0):
+    """Connect to a StreamServer at 'host:port' and wait for its HELLO.
+    Returns a NetworkConnection, not yet started, whose sources hold each
+    channel. Raises OSError or ValueError on failure"""
+    host, port = parseAddress(address)
+    streamSocket = socket.create_connection((host, port), timeout)
+    try:
+        messageType, channelIndex, payload = receiveMessage(streamSocket)
+        if messageType != MESSAGE_HELLO:
+            raise ValueError("Not a turbine data stream")
+        hello = json.loads(payload.decode('utf-8'))
+        if hello.get('version') != PROTOCOL_VERSION:
+            raise ValueError("Unsupported stream version %s" % hello.get('version'))
+    except (OSError, ValueError):
+        streamSocket.close()
+        raise
+    return NetworkConnection(streamSocket, hello)
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Instrumentation for the acquisition and plotting path. Records how long each
+processing stage takes (as a histogram per stage), backlog gauges such as the
+serial input buffer depth, loss counters, and the actual sample rate of each
+channel against the rate it should be. Used to find out why the display lags:
+serial backlog, parsing, filtering, buffering or repainting.
+
+Monitoring is off by default. Every hook returns immediately while it is off,
+and hooks are only called once per batch or frame, never per sample, so the
+cost of leaving them in place is negligible.
+
+Typical use in a hot path:
+
+    tStart = monitor.now()
+    sequence, micros, values = decoder.decode(dataIn)
+    tStart = monitor.lap('parse', tStart, len(values))
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy
+
+"""
+
+import json
+import math
+import threading
+import time
+import numpy as np
+
+
+class StageHistogram(object):
+    """Histogram of the durations of one stage, in log spaced bins from
+    1 microsecond to 10 seconds. Longer durations go in the last bin"""
+    binsPerDecade = 10
+    minSeconds = 1e-6
+    nBins = 70
+
+#------------------------------------------------------------------------------
+    def __init__(self):
+        self.counts = [0]*self.nBins
+        self.nCalls = 0
+        self.nItems = 0
+        self.totalSeconds = 0.0
+        self.maxSeconds = 0.0
+
+#------------------------------------------------------------------------------
+    def add(self, seconds, nItems=0):
+        """Count one call which took seconds and processed nItems"""
+        if seconds <= self.minSeconds:
+            iBin = 0
+        else:
+            iBin = min(int(math.log10(seconds/self.minSeconds)*self.binsPerDecade),
+                       self.nBins - 1)
+        self.counts[iBin] += 1
+        self.nCalls += 1
+        self.nItems += nItems
+        self.totalSeconds += seconds
+        self.maxSeconds = max(self.maxSeconds, seconds)
+
+#------------------------------------------------------------------------------
+    def binEdges(self):
+        """Return the nBins+1 bin edges in seconds"""
+        return self.minSeconds*10.0**(np.arange(self.nBins + 1)/self.binsPerDecade)
+
+#------------------------------------------------------------------------------
+    def percentile(self, q):
+        """Return the upper edge of the bin containing the q'th percentile"""
+        if self.nCalls == 0:
+            return 0.0
+        iBin = int(np.searchsorted(np.cumsum(self.counts), q/100.0*self.nCalls))
+        # No call took longer than the longest seen
+        return min(float(self.binEdges()[min(iBin, self.nBins - 1) + 1]), self.maxSeconds)
+
+#------------------------------------------------------------------------------
+    def summary(self):
+        """Return a dictionary of statistics and the histogram"""
+        return {'calls': self.nCalls,
+                'items': self.nItems,
+                'meanSeconds': self.totalSeconds/self.nCalls if self.nCalls else 0.0,
+                'p50Seconds': self.percentile(50),
+                'p99Seconds': self.percentile(99),
+                'maxSeconds': self.maxSeconds,
+                'binEdgesSeconds': self.binEdges().tolist(),
+                'counts': list(self.counts)}
+
+
+class PerformanceMonitor(object):
+    """Collects timings, gauges, counters and sample rates from any thread"""
+    # Sample rates are measured over windows of this many seconds
+    rateWindow = 1.0
+
+#------------------------------------------------------------------------------
+    def __init__(self, enabled=False):
+        """Monitor constructor. Nothing is recorded until enabled is True"""
+        self.enabled = enabled
+        # Hooks are called from the reader threads as well as the GUI
+        self.lock = threading.Lock()
+        self.reset()
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        """Discard everything recorded so far"""
+        with self.lock:
+            self.startTime = time.perf_counter()
+            # Histogram of durations for each stage
+            self.stages = {}
+            # Latest and largest value of each gauge
+            self.gauges = {}
+            # Running totals, e.g. late samples
+            self.counters = {}
+            # Per channel: [total samples, window start, samples in window,
+            # rate over last window, expected rate]
+            self.rates = {}
+
+#------------------------------------------------------------------------------
+    def now(self):
+        """Return the time to start timing a stage from"""
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+#------------------------------------------------------------------------------
+    def lap(self, stage, tStart, nItems=0):
+        """Record the time since tStart against stage. Returns the current
+        time, so consecutive stages can be timed with one call each"""
+        if not self.enabled:
+            return 0.0
+        tNow = time.perf_counter()
+        with self.lock:
+            if stage not in self.stages:
+                self.stages[stage] = StageHistogram()
+            self.stages[stage].add(tNow - tStart, nItems)
+        return tNow
+
+#------------------------------------------------------------------------------
+    def setGauge(self, name, value):
+        """Record the current value of a gauge, e.g. a buffer depth"""
+        if not self.enabled:
+            return
+        with self.lock:
+            latest, largest = self.gauges.get(name, (value, value))
+            self.gauges[name] = (value, max(largest, value))
+
+#------------------------------------------------------------------------------
+    def count(self, name, n=1):
+        """Add n to a counter"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+#------------------------------------------------------------------------------
+    def setCounter(self, name, value):
+        """Set a counter kept elsewhere, e.g. a decoder's bad frame count"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = value
+
+#------------------------------------------------------------------------------
+    def countSamples(self, channelName, n, expectedRate=None):
+        """Count samples received on a channel, to measure its sample rate"""
+        if not self.enabled:
+            return
+        tNow = time.perf_counter()
+        with self.lock:
+            if channelName not in self.rates:
+                self.rates[channelName] = [0, tNow, 0, None, expectedRate]
+            rate = self.rates[channelName]
+            rate[0] += n
+            rate[2] += n
+            rate[4] = expectedRate
+            # Close the window once long enough
+            if tNow - rate[1] >= self.rateWindow:
+                rate[3] = rate[2]/(tNow - rate[1])
+                rate[1] = tNow
+                rate[2] = 0
+
+#------------------------------------------------------------------------------
+    def report(self):
+        """Return everything recorded as a dictionary"""
+        with self.lock:
+            elapsed = time.perf_counter() - self.startTime
+            return {'elapsedSeconds': elapsed,
+                    'stages': dict((stage, histogram.summary())
+                                   for stage, histogram in self.stages.items()),
+                    'gauges': dict((name, {'latest': latest, 'max': largest})
+                                   for name, (latest, largest) in self.gauges.items()),
+                    'counters': dict(self.counters),
+                    'sampleRates': dict((name, {'samples': total,
+                                                'averageRate': total/elapsed,
+                                                'recentRate': recentRate,
+                                                'expectedRate': expectedRate})
+                                        for name, (total, windowStart, nWindow, recentRate,
+                                                   expectedRate) in self.rates.items())}
+
+#------------------------------------------------------------------------------
+    def summaryText(self):
+        """Return a short multi-line summary for display"""
+        report = self.report()
+        lines = []
+        for name, rate in sorted(report['sampleRates'].items()):
+            recentRate = rate['recentRate'] if rate['recentRate'] is not None else rate['averageRate']
+            if rate['expectedRate']:
+                lines.append("%s: %.1f / %.0f Hz" % (name, recentRate, rate['expectedRate']))
+            else:
+                lines.append("%s: %.1f Hz" % (name, recentRate))
+        for stage, stats in sorted(report['stages'].items()):
+            lines.append("%-14s %7.3f ms  p99 %7.3f ms  max %7.3f ms" %
+                         (stage, 1e3*stats['meanSeconds'], 1e3*stats['p99Seconds'],
+                          1e3*stats['maxSeconds']))
+        for name, gauge in sorted(report['gauges'].items()):
+            lines.append("%s: %g (max %g)" % (name, gauge['latest'], gauge['max']))
+        for name, value in sorted(report['counters'].items()):
+            lines.append("%s: %d" % (name, value))
+        return "\n".join(lines)
+
+#------------------------------------------------------------------------------
+    def export(self, filePath):
+        """Save the report, including full histograms, as JSON"""
+        with open(filePath, 'w') as outputFile:
+            json.dump(self.report(), outputFile, indent=2)
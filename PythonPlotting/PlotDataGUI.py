@@ -3,8 +3,8 @@ Contains all objects in the GUI (buttons, plots, etc). Generated using ui_conver
 from "PlotDataGUI.ui"
     Created By:   D.C. Hartlen, EIT
     Created On:   16-JUN-2018
-    Modified By:  
-    Modified On: 
+    Modified By:  agent
+    Modified On:  17-OCT-2026
 """
 
 # Form implementation generated from reading ui file 'PlotDataGUI.ui'
@@ -24,9 +24,23 @@ class Ui_MainWindow(object):
         self.gridLayout = QtWidgets.QGridLayout(self.centralwidget)
         self.gridLayout.setObjectName("gridLayout")
         self.mainPlotWindow = PlotWidget(self.centralwidget)
-        self.mainPlotWindow.setMinimumSize(QtCore.QSize(756, 571))
+        self.mainPlotWindow.setMinimumSize(QtCore.QSize(756, 300))
         self.mainPlotWindow.setObjectName("mainPlotWindow")
         self.gridLayout.addWidget(self.mainPlotWindow, 0, 0, 1, 1)
+        self.spectrumPanel = QtWidgets.QWidget(self.centralwidget)
+        self.spectrumPanel.setObjectName("spectrumPanel")
+        self.spectrumLayout = QtWidgets.QHBoxLayout(self.spectrumPanel)
+        self.spectrumLayout.setContentsMargins(0, 0, 0, 0)
+        self.spectrumLayout.setObjectName("spectrumLayout")
+        self.spectrumPlotWindow = PlotWidget(self.spectrumPanel)
+        self.spectrumPlotWindow.setMinimumSize(QtCore.QSize(300, 200))
+        self.spectrumPlotWindow.setObjectName("spectrumPlotWindow")
+        self.spectrumLayout.addWidget(self.spectrumPlotWindow)
+        self.spectrogramPlotWindow = PlotWidget(self.spectrumPanel)
+        self.spectrogramPlotWindow.setMinimumSize(QtCore.QSize(300, 200))
+        self.spectrogramPlotWindow.setObjectName("spectrogramPlotWindow")
+        self.spectrumLayout.addWidget(self.spectrogramPlotWindow)
+        self.gridLayout.addWidget(self.spectrumPanel, 1, 0, 1, 1)
         self.verticalFrame = QtWidgets.QFrame(self.centralwidget)
         sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Preferred)
         sizePolicy.setHorizontalStretch(0)
@@ -64,7 +78,76 @@ class Ui_MainWindow(object):
         self.maxVoltsOut.setAlignment(QtCore.Qt.AlignCenter)
         self.maxVoltsOut.setObjectName("maxVoltsOut")
         self.verticalLayout.addWidget(self.maxVoltsOut)
-        spacerItem1 = QtWidgets.QSpacerItem(17, 357, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
+        self.labelStatistics = QtWidgets.QLabel(self.verticalFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.labelStatistics.sizePolicy().hasHeightForWidth())
+        self.labelStatistics.setSizePolicy(sizePolicy)
+        self.labelStatistics.setMaximumSize(QtCore.QSize(450, 40))
+        self.labelStatistics.setAlignment(QtCore.Qt.AlignCenter)
+        self.labelStatistics.setObjectName("labelStatistics")
+        self.verticalLayout.addWidget(self.labelStatistics)
+        self.statisticsOut = QtWidgets.QLabel(self.verticalFrame)
+        font = QtGui.QFont()
+        font.setPointSize(11)
+        self.statisticsOut.setFont(font)
+        self.statisticsOut.setAlignment(QtCore.Qt.AlignCenter)
+        self.statisticsOut.setObjectName("statisticsOut")
+        self.verticalLayout.addWidget(self.statisticsOut)
+        self.labelPower = QtWidgets.QLabel(self.verticalFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.labelPower.sizePolicy().hasHeightForWidth())
+        self.labelPower.setSizePolicy(sizePolicy)
+        self.labelPower.setMaximumSize(QtCore.QSize(450, 40))
+        self.labelPower.setAlignment(QtCore.Qt.AlignCenter)
+        self.labelPower.setObjectName("labelPower")
+        self.verticalLayout.addWidget(self.labelPower)
+        self.powerOut = QtWidgets.QLineEdit(self.verticalFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Maximum, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.powerOut.sizePolicy().hasHeightForWidth())
+        self.powerOut.setSizePolicy(sizePolicy)
+        self.powerOut.setMaximumSize(QtCore.QSize(450, 40))
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setWeight(50)
+        self.powerOut.setFont(font)
+        self.powerOut.setAlignment(QtCore.Qt.AlignCenter)
+        self.powerOut.setReadOnly(True)
+        self.powerOut.setObjectName("powerOut")
+        self.verticalLayout.addWidget(self.powerOut)
+        self.labelEnergy = QtWidgets.QLabel(self.verticalFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Fixed, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.labelEnergy.sizePolicy().hasHeightForWidth())
+        self.labelEnergy.setSizePolicy(sizePolicy)
+        self.labelEnergy.setMaximumSize(QtCore.QSize(450, 40))
+        self.labelEnergy.setAlignment(QtCore.Qt.AlignCenter)
+        self.labelEnergy.setObjectName("labelEnergy")
+        self.verticalLayout.addWidget(self.labelEnergy)
+        self.energyOut = QtWidgets.QLineEdit(self.verticalFrame)
+        sizePolicy = QtWidgets.QSizePolicy(QtWidgets.QSizePolicy.Maximum, QtWidgets.QSizePolicy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.energyOut.sizePolicy().hasHeightForWidth())
+        self.energyOut.setSizePolicy(sizePolicy)
+        self.energyOut.setMaximumSize(QtCore.QSize(450, 40))
+        font = QtGui.QFont()
+        font.setPointSize(16)
+        font.setBold(False)
+        font.setWeight(50)
+        self.energyOut.setFont(font)
+        self.energyOut.setAlignment(QtCore.Qt.AlignCenter)
+        self.energyOut.setReadOnly(True)
+        self.energyOut.setObjectName("energyOut")
+        self.verticalLayout.addWidget(self.energyOut)
+        spacerItem1 = QtWidgets.QSpacerItem(17, 100, QtWidgets.QSizePolicy.Minimum, QtWidgets.QSizePolicy.Expanding)
         self.verticalLayout.addItem(spacerItem1)
         self.horizontalLayout = QtWidgets.QHBoxLayout()
         self.horizontalLayout.setObjectName("horizontalLayout")
@@ -83,7 +166,9 @@ class Ui_MainWindow(object):
         self.resetPlots.setMaximumSize(QtCore.QSize(450, 23))
         self.resetPlots.setObjectName("resetPlots")
         self.verticalLayout.addWidget(self.resetPlots)
-        self.gridLayout.addWidget(self.verticalFrame, 0, 1, 1, 1)
+        self.gridLayout.addWidget(self.verticalFrame, 0, 1, 2, 1)
+        self.gridLayout.setRowStretch(0, 3)
+        self.gridLayout.setRowStretch(1, 2)
         MainWindow.setCentralWidget(self.centralwidget)
         self.statusbar = QtWidgets.QStatusBar(MainWindow)
         self.statusbar.setObjectName("statusbar")
@@ -93,6 +178,8 @@ class Ui_MainWindow(object):
         self.menuBar.setObjectName("menuBar")
         self.menuAbout = QtWidgets.QMenu(self.menuBar)
         self.menuAbout.setObjectName("menuAbout")
+        self.menuExport = QtWidgets.QMenu(self.menuBar)
+        self.menuExport.setObjectName("menuExport")
         self.menuOptions = QtWidgets.QMenu(self.menuBar)
         self.menuOptions.setObjectName("menuOptions")
         MainWindow.setMenuBar(self.menuBar)
@@ -104,19 +191,78 @@ class Ui_MainWindow(object):
         self.actionHelp.setObjectName("actionHelp")
         self.actionAbout = QtWidgets.QAction(MainWindow)
         self.actionAbout.setObjectName("actionAbout")
+        self.actionExportRecordings = QtWidgets.QAction(MainWindow)
+        self.actionExportRecordings.setObjectName("actionExportRecordings")
         self.actionTest = QtWidgets.QAction(MainWindow)
         self.actionTest.setObjectName("actionTest")
         self.actionTest_2 = QtWidgets.QAction(MainWindow)
         self.actionTest_2.setObjectName("actionTest_2")
         self.actionSelectCOMPort = QtWidgets.QAction(MainWindow)
         self.actionSelectCOMPort.setObjectName("actionSelectCOMPort")
+        self.actionOpenRecording = QtWidgets.QAction(MainWindow)
+        self.actionOpenRecording.setObjectName("actionOpenRecording")
+        self.actionSetReplaySpeed = QtWidgets.QAction(MainWindow)
+        self.actionSetReplaySpeed.setObjectName("actionSetReplaySpeed")
+        self.actionSelectSerialFormat = QtWidgets.QAction(MainWindow)
+        self.actionSelectSerialFormat.setObjectName("actionSelectSerialFormat")
         self.actionSetFilterCoef = QtWidgets.QAction(MainWindow)
         self.actionSetFilterCoef.setObjectName("actionSetFilterCoef")
+        self.actionSetLoadResistance = QtWidgets.QAction(MainWindow)
+        self.actionSetLoadResistance.setObjectName("actionSetLoadResistance")
+        self.actionSetStatisticsWindow = QtWidgets.QAction(MainWindow)
+        self.actionSetStatisticsWindow.setObjectName("actionSetStatisticsWindow")
+        self.actionRecordToFile = QtWidgets.QAction(MainWindow)
+        self.actionRecordToFile.setCheckable(True)
+        self.actionRecordToFile.setChecked(True)
+        self.actionRecordToFile.setObjectName("actionRecordToFile")
+        self.actionSelectRecordingFolder = QtWidgets.QAction(MainWindow)
+        self.actionSelectRecordingFolder.setObjectName("actionSelectRecordingFolder")
+        self.actionConnectToSharedData = QtWidgets.QAction(MainWindow)
+        self.actionConnectToSharedData.setObjectName("actionConnectToSharedData")
+        self.actionShareLiveData = QtWidgets.QAction(MainWindow)
+        self.actionShareLiveData.setCheckable(True)
+        self.actionShareLiveData.setObjectName("actionShareLiveData")
+        self.actionFollowLiveData = QtWidgets.QAction(MainWindow)
+        self.actionFollowLiveData.setCheckable(True)
+        self.actionFollowLiveData.setChecked(True)
+        self.actionFollowLiveData.setObjectName("actionFollowLiveData")
+        self.actionSetDisplayRate = QtWidgets.QAction(MainWindow)
+        self.actionSetDisplayRate.setObjectName("actionSetDisplayRate")
+        self.actionShowSpectrum = QtWidgets.QAction(MainWindow)
+        self.actionShowSpectrum.setCheckable(True)
+        self.actionShowSpectrum.setObjectName("actionShowSpectrum")
+        self.actionSetSpectrumParams = QtWidgets.QAction(MainWindow)
+        self.actionSetSpectrumParams.setObjectName("actionSetSpectrumParams")
+        self.actionShowPerformance = QtWidgets.QAction(MainWindow)
+        self.actionShowPerformance.setCheckable(True)
+        self.actionShowPerformance.setObjectName("actionShowPerformance")
+        self.actionExportPerformance = QtWidgets.QAction(MainWindow)
+        self.actionExportPerformance.setObjectName("actionExportPerformance")
         self.menuAbout.addAction(self.actionHelp)
         self.menuAbout.addAction(self.actionAbout)
+        self.menuExport.addAction(self.actionExportRecordings)
         self.menuOptions.addAction(self.actionSelectCOMPort)
+        self.menuOptions.addAction(self.actionOpenRecording)
+        self.menuOptions.addAction(self.actionConnectToSharedData)
+        self.menuOptions.addAction(self.actionSetReplaySpeed)
+        self.menuOptions.addAction(self.actionSelectSerialFormat)
         self.menuOptions.addAction(self.actionSetFilterCoef)
+        self.menuOptions.addAction(self.actionSetLoadResistance)
+        self.menuOptions.addAction(self.actionSetStatisticsWindow)
+        self.menuOptions.addAction(self.actionSetDisplayRate)
+        self.menuOptions.addAction(self.actionFollowLiveData)
+        self.menuOptions.addSeparator()
+        self.menuOptions.addAction(self.actionShowSpectrum)
+        self.menuOptions.addAction(self.actionSetSpectrumParams)
+        self.menuOptions.addSeparator()
+        self.menuOptions.addAction(self.actionRecordToFile)
+        self.menuOptions.addAction(self.actionSelectRecordingFolder)
+        self.menuOptions.addAction(self.actionShareLiveData)
+        self.menuOptions.addSeparator()
+        self.menuOptions.addAction(self.actionShowPerformance)
+        self.menuOptions.addAction(self.actionExportPerformance)
         self.menuBar.addAction(self.menuOptions.menuAction())
+        self.menuBar.addAction(self.menuExport.menuAction())
         self.menuBar.addAction(self.menuAbout.menuAction())
 
         self.retranslateUi(MainWindow)
@@ -126,18 +272,38 @@ class Ui_MainWindow(object):
         _translate = QtCore.QCoreApplication.translate
         MainWindow.setWindowTitle(_translate("MainWindow", "Wind Energy Demonstration Plotter"))
         self.label.setText(_translate("MainWindow", "<html><head/><body><p align=\"center\"><span style=\" font-size:14pt; font-weight:600;\">Peak Voltage (V)</span></p></body></html>"))
+        self.labelStatistics.setText(_translate("MainWindow", "<html><head/><body><p align=\"center\"><span style=\" font-size:14pt; font-weight:600;\">Last 10 s</span></p></body></html>"))
+        self.labelPower.setText(_translate("MainWindow", "<html><head/><body><p align=\"center\"><span style=\" font-size:14pt; font-weight:600;\">Power (mW)</span></p></body></html>"))
+        self.labelEnergy.setText(_translate("MainWindow", "<html><head/><body><p align=\"center\"><span style=\" font-size:14pt; font-weight:600;\">Energy (J)</span></p></body></html>"))
         self.startPlotting.setText(_translate("MainWindow", "Start"))
         self.stopPlotting.setText(_translate("MainWindow", "Stop"))
         self.resetPlots.setText(_translate("MainWindow", "Reset"))
         self.menuAbout.setTitle(_translate("MainWindow", "About"))
+        self.menuExport.setTitle(_translate("MainWindow", "Export"))
         self.menuOptions.setTitle(_translate("MainWindow", "Options"))
         self.actionInformation.setText(_translate("MainWindow", "Information"))
         self.actionExit_App.setText(_translate("MainWindow", "Exit App"))
         self.actionHelp.setText(_translate("MainWindow", "Help"))
         self.actionAbout.setText(_translate("MainWindow", "About"))
+        self.actionExportRecordings.setText(_translate("MainWindow", "Export Recordings"))
         self.actionTest.setText(_translate("MainWindow", "test"))
         self.actionTest_2.setText(_translate("MainWindow", "test"))
         self.actionSelectCOMPort.setText(_translate("MainWindow", "Select COM Port"))
+        self.actionOpenRecording.setText(_translate("MainWindow", "Open Recorded Session"))
+        self.actionSetReplaySpeed.setText(_translate("MainWindow", "Set Replay Speed"))
+        self.actionSelectSerialFormat.setText(_translate("MainWindow", "Select Serial Format"))
         self.actionSetFilterCoef.setText(_translate("MainWindow", "Set Filter Parameters"))
+        self.actionSetLoadResistance.setText(_translate("MainWindow", "Set Load Resistance"))
+        self.actionSetStatisticsWindow.setText(_translate("MainWindow", "Set Statistics Window"))
+        self.actionRecordToFile.setText(_translate("MainWindow", "Record Data to File"))
+        self.actionSelectRecordingFolder.setText(_translate("MainWindow", "Select Recording Folder"))
+        self.actionConnectToSharedData.setText(_translate("MainWindow", "Connect to Shared Data"))
+        self.actionShareLiveData.setText(_translate("MainWindow", "Share Live Data"))
+        self.actionFollowLiveData.setText(_translate("MainWindow", "Follow Live Data"))
+        self.actionSetDisplayRate.setText(_translate("MainWindow", "Set Display Rate"))
+        self.actionShowSpectrum.setText(_translate("MainWindow", "Show Spectrum"))
+        self.actionSetSpectrumParams.setText(_translate("MainWindow", "Set Spectrum Parameters"))
+        self.actionShowPerformance.setText(_translate("MainWindow", "Show Performance Monitor"))
+        self.actionExportPerformance.setText(_translate("MainWindow", "Export Performance Report"))
 
 from pyqtgraph import PlotWidget
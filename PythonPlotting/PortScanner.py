@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Finds the serial ports on a background thread, so the window never waits for
+them. Listing ports can take a second or more on Windows, which is most of
+the plotter's startup time if done before the window appears. The ports are
+listed again every few seconds, so an arduino plugged in (or unplugged)
+after startup is noticed without restarting.
+
+pyserial's port listing is imported on the scanning thread, so it does not
+delay startup either.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: pyserial
+
+"""
+
+import threading
+
+
+class PortScanner(threading.Thread):
+    """Thread which lists the serial ports and reports any change.
+
+    portsChanged is called on the scanning thread with the new list of ports,
+    as pyserial ListPortInfo objects in the order listed. It is always
+    called after the first scan, even if no ports were found. A GUI should
+    pass a function which emits a Qt signal, so the list is handled on the
+    GUI thread.
+    """
+    # Seconds between scans
+    scanInterval = 2.0
+
+#------------------------------------------------------------------------------
+    def __init__(self, portsChanged):
+        """Scanner constructor"""
+        super(PortScanner, self).__init__()
+        # Daemon thread so it never prevents the app from closing
+        self.daemon = True
+        self.portsChanged = portsChanged
+        # Device names found by the last scan, None before the first
+        self.lastDevices = None
+        self.rescanEvent = threading.Event()
+        self.stopEvent = threading.Event()
+
+#------------------------------------------------------------------------------
+    def run(self):
+        """List the ports every scanInterval until stopped"""
+        import serial.tools.list_ports
+        while not self.stopEvent.is_set():
+            ports = serial.tools.list_ports.comports()
+            devices = [port.device for port in ports]
+            if devices != self.lastDevices:
+                self.lastDevices = devices
+                self.portsChanged(ports)
+            self.rescanEvent.wait(self.scanInterval)
+            self.rescanEvent.clear()
+
+#------------------------------------------------------------------------------
+    def rescan(self):
+        """List the ports again now rather than at the next interval"""
+        self.rescanEvent.set()
+
+#------------------------------------------------------------------------------
+    def stop(self, timeout=1.0):
+        """Signal the thread to exit and wait for it to finish"""
+        self.stopEvent.set()
+        self.rescanEvent.set()
+        if self.is_alive():
+            self.join(timeout)
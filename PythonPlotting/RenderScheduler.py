@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Frame clock for the plotter GUI. Widget updates (plot curve, status bar,
+max voltage line and box) are collected as they are requested and applied
+together once per frame, at a fixed display rate which is independent of the
+rate samples arrive. Repeated requests within a frame are coalesced, and a
+value identical to the one already shown is not applied again, so the
+amount of repainting depends on the display rate alone.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: PyQt5
+
+"""
+
+from PyQt5 import QtCore
+
+
+class RenderScheduler(QtCore.QObject):
+    """Applies pending widget updates once per frame.
+
+    frameStarted is emitted at the start of every frame, before any updates
+    are applied, so data processing connected to it lands in the same frame.
+    """
+    frameStarted = QtCore.pyqtSignal()
+
+#------------------------------------------------------------------------------
+    def __init__(self, frameRate=30, parent=None):
+        """Scheduler constructor. Frames start immediately"""
+        super(RenderScheduler, self).__init__(parent)
+        # Functions to call once next frame, in the order first requested
+        self.pendingCalls = {}
+        # Latest value requested for each setter, and last value applied
+        self.pendingValues = {}
+        self.appliedValues = {}
+
+        self.frameTimer = QtCore.QTimer(self)
+        self.frameTimer.timeout.connect(self.renderFrame)
+        self.setFrameRate(frameRate)
+        self.frameTimer.start()
+
+#------------------------------------------------------------------------------
+    def setFrameRate(self, frameRate):
+        """Change the display rate (frames per second)"""
+        self.frameRate = frameRate
+        self.frameTimer.setInterval(int(round(1000.0/frameRate)))
+
+#------------------------------------------------------------------------------
+    def scheduleCall(self, function):
+        """Call function once at the next frame, however often requested"""
+        self.pendingCalls[function] = True
+
+#------------------------------------------------------------------------------
+    def setValue(self, setter, value):
+        """Call setter(value) at the next frame, unless the value shown is
+        already the same. Only the latest value requested is applied"""
+        self.pendingValues[setter] = value
+
+#------------------------------------------------------------------------------
+    def renderFrame(self):
+        """Process this frame's data, then apply all pending updates"""
+        self.frameStarted.emit()
+        self.flush()
+
+#------------------------------------------------------------------------------
+    def flush(self):
+        """Apply all pending updates now"""
+        pendingCalls = self.pendingCalls
+        pendingValues = self.pendingValues
+        self.pendingCalls = {}
+        self.pendingValues = {}
+        for function in pendingCalls:
+            function()
+        for setter, value in pendingValues.items():
+            if setter in self.appliedValues and self.appliedValues[setter] == value:
+                continue
+            setter(value)
+            self.appliedValues[setter] = value
+
+#------------------------------------------------------------------------------
+    def forget(self, setter):
+        """Drop the remembered value of a setter. Use when its widget was
+        changed directly, so the next requested value is always applied"""
+        self.appliedValues.pop(setter, None)
+
+#------------------------------------------------------------------------------
+    def setShown(self, setter, value):
+        """Remember value as the one shown by a setter. Use when its widget
+        was changed directly, so a different requested value is applied"""
+        self.appliedValues[setter] = value
+
+#------------------------------------------------------------------------------
+    def forgetAll(self):
+        """Drop all remembered values. Use when widgets are replaced"""
+        self.appliedValues = {}
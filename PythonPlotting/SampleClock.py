@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+Rebuilds the true time axis of a serial stream from the sequence numbers
+and micros() timestamps sent by the sketch, and detects lost samples.
+
+Sample times come from the arduino's own clock, so they are exact however
+the samples were bunched up by the serial port, the OS or a slow GUI. Each
+sample's number is one more than the last; any jump is a gap, and the
+number of missing samples is counted. The arduino clock is mapped onto the
+PC clock (seconds since the reader started) by an offset which is slowly
+steered to follow the PC clock, so several arduinos stay aligned however
+much their clocks drift. If the sketch restarts, or the two clocks
+disagree by more than resyncThreshold (after an overrun, say), the offset is
+re-anchored and a resync is counted. Times returned always increase.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy
+
+"""
+
+import collections
+import numpy as np
+
+# Sequence numbers and micros() are unsigned 32 bit counters
+COUNTER_WRAP = 2**32
+
+
+class SampleClock(object):
+    """Converts (sequence, micros) batches to PC times and counts gaps"""
+    # Clock disagreement (seconds) which forces a re-anchor
+    resyncThreshold = 1.0
+    # The offset is steered towards the smallest arrival delay seen over
+    # this many seconds, at most maxSlew seconds per second of data
+    envelopeWindow = 2.0
+    maxSlew = 0.02
+    # Smallest spacing between samples across a re-anchor (seconds)
+    minStep = 1e-6
+
+#------------------------------------------------------------------------------
+    def __init__(self):
+        # Raw counters of the last sample, to continue across batches
+        self.lastSequence = None
+        self.lastMicros = None
+        # Arduino time (seconds, continuous across micros() wraps) and PC
+        # time of the last sample
+        self.lastDeviceTime = 0.0
+        self.lastTime = None
+        # PC time minus arduino time
+        self.offset = None
+        # Recent (arrival time, offset estimate) pairs. Only those smaller
+        # than every later estimate are kept, so the first is the smallest
+        self.estimates = collections.deque()
+
+        # Diagnostic counters
+        self.gaps = 0
+        self.missingSamples = 0
+        self.resyncs = 0
+
+#------------------------------------------------------------------------------
+    def timestamp(self, sequence, micros, arrivalTime):
+        """Return PC times for a batch of samples. arrivalTime is when the
+        batch was received, in the same units as the times returned"""
+        sequence = np.asarray(sequence, dtype=np.int64)
+        micros = np.asarray(micros, dtype=np.int64)
+        nSamples = len(sequence)
+        if nSamples == 0:
+            return np.zeros(0)
+
+        # Steps from each sample to the next, modulo the counter size
+        if self.lastSequence is None:
+            previousSequence, previousMicros = sequence[0] - 1, micros[0]
+        else:
+            previousSequence, previousMicros = self.lastSequence, self.lastMicros
+        sequenceSteps = np.diff(sequence, prepend=previousSequence) % COUNTER_WRAP
+        microsSteps = np.diff(micros, prepend=previousMicros) % COUNTER_WRAP
+        self.lastSequence = int(sequence[-1])
+        self.lastMicros = int(micros[-1])
+
+        # A repeated or backwards sequence number means the sketch restarted
+        restarts = (sequenceSteps == 0) | (sequenceSteps >= COUNTER_WRAP//2)
+        if self.offset is None:
+            restarts[0] = True
+        gaps = ~restarts & (sequenceSteps > 1)
+        self.gaps += int(gaps.sum())
+        self.missingSamples += int((sequenceSteps[gaps] - 1).sum())
+
+        # Arduino time of each sample. The clock restarts with the sketch
+        microsSteps[restarts] = 0
+        deviceTimes = self.lastDeviceTime + np.cumsum(microsSteps)/1e6
+
+        # Map each run of samples between restarts onto the PC clock
+        times = np.empty(nSamples)
+        starts = np.flatnonzero(restarts).tolist()
+        if len(starts) == 0 or starts[0] != 0:
+            starts.insert(0, 0)
+        for iStart, iStop in zip(starts, starts[1:] + [nSamples]):
+            times[iStart:iStop] = self.mapSegment(deviceTimes[iStart:iStop], arrivalTime,
+                                                  restarts[iStart])
+        return times
+
+#------------------------------------------------------------------------------
+    def mapSegment(self, deviceTimes, arrivalTime, reanchor):
+        """Map arduino times with no restart in between onto the PC clock"""
+        # The last sample cannot have been taken after the batch arrived, so
+        # this is an upper bound on the offset. Transmission delays only
+        # ever push it up, so the smallest recent value is the best estimate
+        estimate = arrivalTime - deviceTimes[-1]
+        if not reanchor:
+            while len(self.estimates) > 0 and self.estimates[-1][1] >= estimate:
+                self.estimates.pop()
+            self.estimates.append((arrivalTime, estimate))
+            while self.estimates[0][0] < arrivalTime - self.envelopeWindow:
+                self.estimates.popleft()
+            target = self.estimates[0][1]
+            if abs(target - self.offset) > self.resyncThreshold:
+                # Clocks disagree badly, e.g. after an overrun
+                self.resyncs += 1
+                reanchor = True
+
+        if reanchor:
+            if self.offset is not None and self.lastTime is not None and \
+                    deviceTimes[0] + estimate <= self.lastTime:
+                # Never step back in time
+                estimate = self.lastTime + self.minStep - deviceTimes[0]
+            self.offset = estimate
+            self.estimates.clear()
+            self.estimates.append((arrivalTime, estimate))
+            times = deviceTimes + self.offset
+        else:
+            # Steer the offset gradually across the segment, so times keep
+            # increasing and the plot never jumps
+            span = deviceTimes[-1] - self.lastDeviceTime
+            step = np.clip(target - self.offset, -self.maxSlew*span, self.maxSlew*span)
+            if span > 0:
+                times = deviceTimes + self.offset + \
+                    step*(deviceTimes - self.lastDeviceTime)/span
+            else:
+                times = deviceTimes + self.offset
+            self.offset += step
+
+        self.lastDeviceTime = deviceTimes[-1]
+        self.lastTime = times[-1]
+        return times
@@ -0,0 +1,250 @@
+# -*- coding: utf-8 -*-
+"""
+Decoders for the serial formats the arduino sketch can send. Each turns a
+block of raw bytes into NumPy arrays of sample sequence numbers, sketch
+timestamps (micros()) and voltages, and keeps any incomplete line or frame
+for the next block.
+
+ASCII mode (default, 115200 baud): one sample per line, as printed by the
+sketch,
+
+    sequence,micros,voltage
+
+Legacy ASCII (9600 baud): one voltage per line, as printed by
+Serial.println(vAct) in older sketches. These carry no sequence numbers or
+timestamps, so lost samples cannot be detected.
+
+Binary mode (115200 baud): frames of several raw ADC samples,
+
+    byte 0-1    sync header 0xA5 0x5A
+    byte 2      number of samples in the frame, N
+    byte 3-6    sequence number of the first sample (uint32)
+    byte 7-10   micros() when the first sample was due (uint32)
+    byte 11-12  sampling period in microseconds (uint16). Samples in a frame
+                are evenly spaced
+    byte 13...  N samples, 10 bit ADC counts as uint16
+    last byte   checksum: sum of bytes 2 to 12+2N, modulo 256
+
+All multi-byte values are little-endian. Sequence numbers count samples from
+power up, and both they and micros() wrap at 2**32.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, pyserial
+
+"""
+
+import time
+import numpy as np
+
+
+class AsciiDecoder(object):
+    """Decodes newline terminated ASCII samples. Lines may be either
+    "sequence,micros,voltage" or, from older sketches, just "voltage"
+    """
+    name = 'ASCII'
+    baudRate = 115200
+    # Samples per second the sketch is set to send (samplingFreq)
+    nominalRate = 100.0
+
+#------------------------------------------------------------------------------
+    def __init__(self):
+        # Incomplete line left over from the previous block
+        self.partialLine = b''
+        # Number of lines which could not be parsed
+        self.badLines = 0
+        # Set once a line with a sequence number and timestamp is seen. From
+        # then on, lines without are rejected
+        self.timed = False
+
+#------------------------------------------------------------------------------
+    def decode(self, dataIn):
+        """Convert raw bytes to arrays of sequence numbers, micros() and
+        voltages. Sequence numbers and micros() are None for lines from
+        older sketches. Partial lines are kept"""
+        dataIn = self.partialLine + dataIn
+        # Everything after the last line ending is incomplete
+        iSplit = dataIn.rfind(b'\n') + 1
+        self.partialLine = dataIn[iSplit:]
+        block = dataIn[:iSplit]
+
+        try:
+            # Parse the whole batch in one call. Every line must have
+            # exactly three fields
+            nCommas = block.count(b',')
+            nLines = block.count(b'\n')
+            if nCommas == 2*nLines and nLines > 0 and hasThreeFields(block):
+                fields = np.fromstring(block.replace(b'\r\n', b',').replace(b'\n', b','),
+                                       sep=',')
+                if len(fields) == 3*nLines:
+                    fields = fields.reshape(-1, 3)
+                    self.timed = True
+                    return fields[:, 0].astype(np.int64), fields[:, 1].astype(np.int64), \
+                        fields[:, 2]
+            if nCommas == 0 and not self.timed:
+                return None, None, np.array(block.split()).astype(np.float64)
+        except ValueError:
+            pass
+        return self.decodeLines(block.split())
+
+#------------------------------------------------------------------------------
+    def decodeLines(self, lines):
+        """Parse line by line, skipping bad ones. Used when a garbled line
+        (typically the first after opening) is in the batch"""
+        timedSamples = []
+        values = []
+        for line in lines:
+            fields = line.split(b',')
+            try:
+                if len(fields) == 3:
+                    timedSamples.append((int(fields[0]), int(fields[1]), float(fields[2])))
+                elif len(fields) == 1:
+                    values.append(float(fields[0]))
+                else:
+                    self.badLines += 1
+            except ValueError:
+                self.badLines += 1
+
+        if len(timedSamples) > 0 or self.timed:
+            # Untimed lines in a timed stream are fragments of timed lines
+            self.badLines += len(values)
+            self.timed = self.timed or len(timedSamples) > 0
+            if len(timedSamples) == 0:
+                return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+            sequence, micros, values = zip(*timedSamples)
+            return np.array(sequence, dtype=np.int64), np.array(micros, dtype=np.int64), \
+                np.array(values, dtype=np.float64)
+        return None, None, np.array(values, dtype=np.float64)
+
+
+class LegacyAsciiDecoder(AsciiDecoder):
+    """Decodes ASCII voltages from older sketches, at their baud rate"""
+    name = 'Legacy ASCII'
+    baudRate = 9600
+
+
+class BinaryDecoder(object):
+    """Decodes framed binary ADC counts (see module docstring)"""
+    name = 'Binary'
+    baudRate = 115200
+    # Samples per second the sketch is set to send (samplingFreq)
+    nominalRate = 500.0
+
+    syncHeader = b'\xa5\x5a'
+    headerSize = 13
+    # Must match SAMPLES_PER_FRAME in the arduino sketch
+    samplesPerFrame = 10
+    # Converts bits (arduino native 2^10 bits) to volts (V/bit)
+    bitsToVolts = 3.3/1024.0
+
+#------------------------------------------------------------------------------
+    def __init__(self):
+        self.frameSize = self.headerSize + 2*self.samplesPerFrame + 1
+        # Incomplete frame left over from the previous block
+        self.partialFrame = b''
+        # Diagnostic counters
+        self.badFrames = 0
+        self.skippedBytes = 0
+
+#------------------------------------------------------------------------------
+    def decode(self, dataIn):
+        """Convert raw bytes to arrays of sequence numbers, micros() and
+        voltages. Partial frames are kept"""
+        dataIn = self.partialFrame + dataIn
+        goodFrames = []
+        iStart = 0
+        while True:
+            # Align to the next sync header
+            iSync = dataIn.find(self.syncHeader, iStart)
+            if iSync < 0:
+                # Keep a trailing byte in case it is the first half of a header
+                iKeep = max(iStart, len(dataIn) - 1)
+                self.skippedBytes += iKeep - iStart
+                iStart = iKeep
+                break
+            self.skippedBytes += iSync - iStart
+            iStart = iSync
+
+            # View all whole frames from here as rows of a 2D array
+            nFrames = (len(dataIn) - iStart)//self.frameSize
+            if nFrames == 0:
+                break
+            frames = np.frombuffer(dataIn, dtype=np.uint8, count=nFrames*self.frameSize,
+                                   offset=iStart).reshape(nFrames, self.frameSize)
+
+            # Validate every frame at once: header, length and checksum
+            checksums = frames[:, 2:-1].sum(axis=1, dtype=np.uint32) & 0xFF
+            valid = ((frames[:, 0] == 0xA5) & (frames[:, 1] == 0x5A) &
+                     (frames[:, 2] == self.samplesPerFrame) &
+                     (checksums == frames[:, -1]))
+            nValid = nFrames if valid.all() else int(np.argmin(valid))
+
+            if nValid > 0:
+                goodFrames.append(frames[:nValid])
+                iStart += nValid*self.frameSize
+
+            if nValid < nFrames:
+                # Corrupt frame. Step past its sync header and resynchronise
+                self.badFrames += 1
+                iStart += 1
+            else:
+                break
+
+        self.partialFrame = dataIn[iStart:]
+        if len(goodFrames) == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        return self.unpackFrames(np.concatenate(goodFrames))
+
+#------------------------------------------------------------------------------
+    def unpackFrames(self, frames):
+        """Split validated frames into per sample arrays"""
+        # Header fields and sample bytes reinterpreted directly as integers
+        frames = np.ascontiguousarray(frames)
+        firstSequence = np.ascontiguousarray(frames[:, 3:7]).view('<u4').ravel()
+        firstMicros = np.ascontiguousarray(frames[:, 7:11]).view('<u4').ravel()
+        period = np.ascontiguousarray(frames[:, 11:13]).view('<u2').ravel()
+        counts = np.ascontiguousarray(frames[:, self.headerSize:-1]).view('<u2').ravel()
+
+        # Samples in a frame are numbered and spaced evenly from the first
+        iSample = np.arange(self.samplesPerFrame, dtype=np.int64)
+        sequence = (firstSequence.astype(np.int64)[:, None] + iSample) % 2**32
+        micros = (firstMicros.astype(np.int64)[:, None] +
+                  period.astype(np.int64)[:, None]*iSample) % 2**32
+        return sequence.ravel(), micros.ravel(), counts*self.bitsToVolts
+
+
+# Serial formats available for selection in the GUI, in menu order
+PROTOCOL_TYPES = [AsciiDecoder, BinaryDecoder, LegacyAsciiDecoder]
+
+
+#------------------------------------------------------------------------------
+def hasThreeFields(block):
+    """Return True if every line of an ASCII block has exactly two commas"""
+    characters = np.frombuffer(block, dtype=np.uint8)
+    lineEnds = np.flatnonzero(characters == ord('\n'))
+    commas = np.flatnonzero(characters == ord(','))
+    if len(commas) != 2*len(lineEnds):
+        return False
+    # Each line's second comma must come before its line ending, and the
+    # next line's first comma after it
+    commas = commas.reshape(-1, 2)
+    return bool(np.all(commas[:, 1] < lineEnds) and np.all(commas[1:, 0] > lineEnds[:-1]))
+
+
+#------------------------------------------------------------------------------
+def checkConnection(serialPort, decoder, timeout=5.0):
+    """Read from an open port until the decoder produces a sample.
+
+    Returns True if a valid sample arrives before the timeout. Used to check
+    that an arduino running the expected format is on the port.
+    """
+    tStop = time.time() + timeout
+    while time.time() < tStop:
+        dataIn = serialPort.read(max(1, serialPort.in_waiting))
+        sequence, micros, values = decoder.decode(dataIn)
+        if len(values) > 0:
+            return True
+    return False
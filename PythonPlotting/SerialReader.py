@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Background serial acquisition for the wind turbine plotter. The serial port
+is drained continuously on a dedicated thread and decoded samples are handed
+to the GUI through a bounded ring buffer. This keeps a stalled port from
+freezing the window, and a slow repaint from backing up the OS buffer.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: pyserial, numpy, PerformanceMonitor.py, SampleClock.py
+
+"""
+
+import collections
+import threading
+import time
+import numpy as np
+import serial
+from PerformanceMonitor import PerformanceMonitor
+from SampleClock import SampleClock
+
+
+class SerialReader(threading.Thread):
+    """Thread which reads samples from an open serial port into a ring buffer.
+
+    Each pass drains everything waiting in the port with a single read and
+    hands the bytes to a decoder from SerialProtocol.py, which turns the whole
+    block into one NumPy array (carrying any partial line or frame over to the
+    next pass). Samples are timed from the sequence numbers and micros()
+    timestamps sent by the sketch, which also reveal lost samples (see
+    SampleClock.py); older sketches' samples are timed on arrival. Batches
+    are passed to the consumer through a collections.deque. Appending on the reader
+    thread and popping on the GUI thread are both atomic, so no lock is
+    required for the handoff. If the consumer falls behind by more than
+    bufferSize batches, the oldest batches are discarded and their samples
+    counted in droppedSamples.
+    """
+    # Samples waiting longer than this (seconds) to be read out are late
+    lateAfter = 0.1
+
+#------------------------------------------------------------------------------
+    def __init__(self, serialPort, decoder, bufferSize=1000, startTime=None, monitor=None):
+        """Reader constructor. serialPort must already be open. Readers
+        sharing a startTime produce timestamps on the same time axis. Parse
+        times, port backlog and late samples are reported to monitor"""
+        super(SerialReader, self).__init__()
+        # Daemon thread so a stuck port never prevents the app from closing
+        self.daemon = True
+
+        self.serialPort = serialPort
+        # Converts raw bytes to voltages for the selected serial format
+        self.decoder = decoder
+        # Bounded ring buffer of sample batches used to hand data to the GUI
+        self.sampleBuffer = collections.deque(maxlen=bufferSize)
+        self.droppedSamples = 0
+
+        # Time at which the reader started, and at which the last batch was
+        # received. Timestamps are seconds relative to startTime
+        if startTime is None:
+            startTime = time.time()
+        self.startTime = startTime
+        self.lastBatchTime = time.time() - startTime
+        # Maps the sketch's sample timestamps onto the same time axis, and
+        # counts samples lost on the way
+        self.sampleClock = SampleClock()
+
+        # Instrumentation, off unless a shared monitor is given and enabled
+        if monitor is None:
+            monitor = PerformanceMonitor()
+        self.monitor = monitor
+        self.portName = getattr(serialPort, 'port', None)
+
+        # Set by the GUI to request the thread exit
+        self.stopEvent = threading.Event()
+        # Holds a description of any fatal port error for the GUI to report
+        self.errorMessage = None
+        # A live port never runs out of data. Present to match ReplaySource
+        self.finished = False
+
+#------------------------------------------------------------------------------
+    def run(self):
+        """Continuously read and decode batches until stopped"""
+        while not self.stopEvent.is_set():
+            try:
+                # Block (up to the port timeout) for at least one byte, then
+                # take everything else already waiting in the same call
+                nWaiting = self.serialPort.in_waiting
+                dataIn = self.serialPort.read(max(1, nWaiting))
+            except (serial.SerialException, OSError) as err:
+                # Port vanished (unplugged, etc). Report and exit thread
+                self.errorMessage = str(err)
+                return
+
+            # Nothing arrived before the timeout
+            if not dataIn:
+                continue
+
+            tStart = self.monitor.now()
+            sequence, micros, values = self.decoder.decode(dataIn)
+            self.monitor.lap('parse', tStart, len(values))
+            self.monitor.setGauge("%s backlog (bytes)" % self.portName, nWaiting)
+            if len(values) == 0:
+                continue
+            if sequence is None:
+                # Older sketch with no timestamps
+                times = self.timestampBatch(len(values))
+            else:
+                self.lastBatchTime = time.time() - self.startTime
+                times = self.sampleClock.timestamp(sequence, micros, self.lastBatchTime)
+
+            # Count samples pushed out by a full buffer
+            if len(self.sampleBuffer) == self.sampleBuffer.maxlen:
+                self.droppedSamples += len(self.sampleBuffer[0][1])
+            self.sampleBuffer.append((times, values))
+
+#------------------------------------------------------------------------------
+    def timestampBatch(self, nValues):
+        """Estimate a time for each sample in a newly received batch.
+
+        The samples are spread evenly between the arrival of the previous
+        batch and this one, which tracks the true sample rate without needing
+        to know it in advance.
+        """
+        batchTime = time.time() - self.startTime
+        times = self.lastBatchTime + \
+            (batchTime - self.lastBatchTime)*np.arange(1, nValues+1)/nValues
+        self.lastBatchTime = batchTime
+        return times
+
+#------------------------------------------------------------------------------
+    def readAvailable(self):
+        """Return arrays of the times and values of all samples received
+        since the last call"""
+        batches = []
+        # Pop only what is present now. New arrivals wait for the next call
+        for i in range(len(self.sampleBuffer)):
+            batches.append(self.sampleBuffer.popleft())
+        if len(batches) == 0:
+            return np.zeros(0), np.zeros(0)
+        if self.monitor.enabled:
+            self.countLateSamples(batches)
+        times, values = zip(*batches)
+        return np.concatenate(times), np.concatenate(values)
+
+#------------------------------------------------------------------------------
+    def countLateSamples(self, batches):
+        """Report batches which waited too long to be read out"""
+        self.monitor.setGauge("%s queue (batches)" % self.portName, len(batches))
+        # The last sample of each batch is timestamped when it arrived
+        readTime = time.time() - self.startTime
+        nLate = sum(len(values) for times, values in batches
+                    if readTime - times[-1] > self.lateAfter)
+        if nLate > 0:
+            self.monitor.count("%s late samples" % self.portName, nLate)
+
+#------------------------------------------------------------------------------
+    def stop(self, timeout=1.0):
+        """Signal the thread to exit and wait for it to finish"""
+        self.stopEvent.set()
+        if self.is_alive():
+            self.join(timeout)
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+"""
+Converts recorded sessions (see SessionRecorder.py) to CSV, Parquet or HDF5
+for analysis in other programs. Recordings are read from their memory map in
+fixed size chunks, each chunk is reduced and written, and nothing else is
+kept, so memory use is the same for a one minute or a ten hour session.
+
+Optionally, only part of a session is exported (a time range), and the data
+is made smaller on the way, either by averaging every N samples (decimation)
+or by interpolating onto a fixed sample rate (resampling). Both carry their
+state from one chunk to the next, so the output does not depend on the chunk
+size.
+
+Several recordings are exported in parallel, one per process, to use every
+core. Run directly to export from the command line, e.g.
+
+    python SessionExporter.py Turbine_*.wtr --format Parquet --decimate 10
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, SessionRecorder.py
+          (pyarrow for Parquet and h5py for HDF5, each optional)
+
+"""
+
+import argparse
+import concurrent.futures
+import glob
+import os
+import numpy as np
+from SessionRecorder import openRecording, RECORD_DTYPE
+
+# Column names written by every format, in order
+COLUMN_NAMES = ['time_s', 'raw_V', 'filtered_V']
+
+
+class CsvWriter(object):
+    """Writes records as comma separated text with a plain header row, so it
+    reads with the defaults of most programs. CSV has nowhere to keep the
+    session start; export with epochTimes to include it in the times"""
+    name = 'CSV'
+    extension = '.csv'
+    # Printf format of one row
+    rowFormat = "%.6f,%.5f,%.5f\n"
+
+#------------------------------------------------------------------------------
+    def __init__(self, filePath, startTime):
+        """Writer constructor. Creates the file and writes the header.
+        startTime is the session start, in seconds since the epoch"""
+        self.outputFile = open(filePath, 'w', newline='')
+        self.outputFile.write(",".join(COLUMN_NAMES) + "\n")
+
+#------------------------------------------------------------------------------
+    def write(self, records):
+        """Append a chunk of records"""
+        if len(records) == 0:
+            return
+        # Interleave the columns, then format the whole chunk with one
+        # printf call rather than a Python loop per row
+        values = np.empty((len(records), 3))
+        values[:, 0] = records['time']
+        values[:, 1] = records['raw']
+        values[:, 2] = records['filtered']
+        self.outputFile.write((self.rowFormat*len(records)) % tuple(values.ravel().tolist()))
+
+#------------------------------------------------------------------------------
+    def close(self):
+        self.outputFile.close()
+
+
+class ParquetWriter(object):
+    """Writes records to a Parquet file, one row group per chunk"""
+    name = 'Parquet'
+    extension = '.parquet'
+
+#------------------------------------------------------------------------------
+    def __init__(self, filePath, startTime):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+        self.pyarrow = pyarrow
+        self.schema = pyarrow.schema([(COLUMN_NAMES[0], pyarrow.float64()),
+                                      (COLUMN_NAMES[1], pyarrow.float32()),
+                                      (COLUMN_NAMES[2], pyarrow.float32())],
+                                     metadata={b'session_start': repr(startTime).encode()})
+        self.outputFile = pyarrow.parquet.ParquetWriter(filePath, self.schema)
+
+#------------------------------------------------------------------------------
+    def write(self, records):
+        if len(records) == 0:
+            return
+        columns = [self.pyarrow.array(records[field])
+                   for field in ['time', 'raw', 'filtered']]
+        self.outputFile.write_table(self.pyarrow.Table.from_arrays(columns, schema=self.schema))
+
+#------------------------------------------------------------------------------
+    def close(self):
+        self.outputFile.close()
+
+
+class Hdf5Writer(object):
+    """Writes records to an HDF5 file, one resizable dataset per column"""
+    name = 'HDF5'
+    extension = '.h5'
+
+#------------------------------------------------------------------------------
+    def __init__(self, filePath, startTime):
+        try:
+            import h5py
+        except ImportError:
+            raise ImportError("HDF5 export requires h5py (pip install h5py)")
+        self.outputFile = h5py.File(filePath, 'w')
+        self.outputFile.attrs['session_start'] = startTime
+        self.datasets = [self.outputFile.create_dataset(name, shape=(0,), maxshape=(None,),
+                                                        dtype=RECORD_DTYPE[field], chunks=True)
+                         for name, field in zip(COLUMN_NAMES, ['time', 'raw', 'filtered'])]
+        self.nWritten = 0
+
+#------------------------------------------------------------------------------
+    def write(self, records):
+        if len(records) == 0:
+            return
+        nTotal = self.nWritten + len(records)
+        for dataset, field in zip(self.datasets, ['time', 'raw', 'filtered']):
+            dataset.resize((nTotal,))
+            dataset[self.nWritten:] = records[field]
+        self.nWritten = nTotal
+
+#------------------------------------------------------------------------------
+    def close(self):
+        self.outputFile.close()
+
+
+# Every export format, in the order offered to the user
+EXPORT_FORMATS = [CsvWriter, ParquetWriter, Hdf5Writer]
+
+
+class Decimator(object):
+    """Replaces every factor samples with their average. Samples left over at
+    the end of a chunk are averaged with the start of the next"""
+#------------------------------------------------------------------------------
+    def __init__(self, factor):
+        self.factor = int(factor)
+        self.leftOver = np.zeros(0, dtype=RECORD_DTYPE)
+
+#------------------------------------------------------------------------------
+    def process(self, records):
+        """Return the averages of every whole group of factor samples"""
+        records = np.concatenate((self.leftOver, records))
+        nGroups = len(records)//self.factor
+        self.leftOver = records[nGroups*self.factor:]
+        return self.average(records[:nGroups*self.factor], nGroups)
+
+#------------------------------------------------------------------------------
+    def finish(self):
+        """Return the average of any samples left over at the very end"""
+        if len(self.leftOver) == 0:
+            return self.leftOver
+        return self.average(self.leftOver, 1)
+
+#------------------------------------------------------------------------------
+    def average(self, records, nGroups):
+        reduced = np.empty(nGroups, dtype=RECORD_DTYPE)
+        for field in ['time', 'raw', 'filtered']:
+            reduced[field] = records[field].reshape(nGroups, -1).mean(axis=1)
+        return reduced
+
+
+class Resampler(object):
+    """Interpolates samples onto a fixed rate, starting at the first sample.
+    The last sample of each chunk is kept to interpolate across the join"""
+#------------------------------------------------------------------------------
+    def __init__(self, sampleRate):
+        self.sampleRate = float(sampleRate)
+        self.lastRecord = None
+        self.firstTime = None
+        # Index of the next output sample on the fixed rate grid
+        self.iNext = 0
+
+#------------------------------------------------------------------------------
+    def process(self, records):
+        """Return the output samples which fall within this chunk"""
+        if len(records) == 0:
+            return records
+        if self.lastRecord is not None:
+            records = np.concatenate((self.lastRecord, records))
+        else:
+            self.firstTime = records['time'][0]
+        self.lastRecord = records[-1:].copy()
+
+        # Grid times up to the last sample, computed from the index so
+        # rounding errors do not build up over a long session
+        nOut = int(np.floor((records['time'][-1] - self.firstTime)*self.sampleRate)) + 1 - self.iNext
+        times = self.firstTime + (self.iNext + np.arange(max(nOut, 0)))/self.sampleRate
+        self.iNext += len(times)
+        resampled = np.empty(len(times), dtype=RECORD_DTYPE)
+        resampled['time'] = times
+        for field in ['raw', 'filtered']:
+            resampled[field] = np.interp(times, records['time'], records[field])
+        return resampled
+
+#------------------------------------------------------------------------------
+    def finish(self):
+        return np.zeros(0, dtype=RECORD_DTYPE)
+
+
+#------------------------------------------------------------------------------
+def exportRecording(inputPath, outputPath, formatType=CsvWriter, startSeconds=None,
+                    endSeconds=None, decimate=1, resampleRate=None, epochTimes=False,
+                    chunkSize=262144):
+    """Export one recording, chunkSize records at a time. Only samples from
+    startSeconds to endSeconds (session time) are exported, if given. Either
+    every decimate samples are averaged, or the data is resampled at
+    resampleRate (Hz). Times are written in seconds since the session start,
+    or since the epoch if epochTimes. Returns the number of samples written"""
+    startTime, records = openRecording(inputPath)
+    # Find the time range by binary search; only a few pages are read
+    times = records['time']
+    iFirst = 0 if startSeconds is None else int(np.searchsorted(times, startSeconds, 'left'))
+    iLast = len(records) if endSeconds is None else int(np.searchsorted(times, endSeconds, 'right'))
+
+    if resampleRate is not None:
+        reducer = Resampler(resampleRate)
+    elif decimate > 1:
+        reducer = Decimator(decimate)
+    else:
+        reducer = None
+
+    # Added to the times written
+    timeOffset = startTime if epochTimes else 0.0
+    nWritten = 0
+    writer = formatType(outputPath, startTime)
+    try:
+        for iStart in range(iFirst, iLast, chunkSize):
+            # Copy the chunk out of the memory map; this is the disk read
+            chunk = np.array(records[iStart:min(iStart + chunkSize, iLast)])
+            if reducer is not None:
+                chunk = reducer.process(chunk)
+            chunk['time'] += timeOffset
+            writer.write(chunk)
+            nWritten += len(chunk)
+        if reducer is not None:
+            chunk = reducer.finish()
+            chunk['time'] += timeOffset
+            writer.write(chunk)
+            nWritten += len(chunk)
+    finally:
+        writer.close()
+    return nWritten
+
+
+#------------------------------------------------------------------------------
+def exportPath(inputPath, outputFolder, formatType):
+    """Return the output file for a recording: the same name with the
+    format's extension, in outputFolder (or next to the recording)"""
+    if outputFolder is None:
+        outputFolder = os.path.dirname(inputPath)
+    baseName = os.path.splitext(os.path.basename(inputPath))[0]
+    return os.path.join(outputFolder, baseName + formatType.extension)
+
+
+#------------------------------------------------------------------------------
+def exportOne(inputPath, outputPath, formatType, options):
+    """Export one recording, returning (inputPath, outputPath, samples
+    written, error message or None). Runs in a worker process"""
+    try:
+        nWritten = exportRecording(inputPath, outputPath, formatType, **options)
+    except (OSError, ValueError, ImportError) as err:
+        return inputPath, outputPath, 0, str(err)
+    return inputPath, outputPath, nWritten, None
+
+
+#------------------------------------------------------------------------------
+def exportRecordings(inputPaths, outputFolder=None, formatType=CsvWriter, processes=None,
+                     finished=None, **options):
+    """Export several recordings, one per process, with the options of
+    exportRecording. finished, if given, is called with each result of
+    exportOne as it completes. Returns all the results, in input order"""
+    jobs = [(inputPath, exportPath(inputPath, outputFolder, formatType))
+            for inputPath in inputPaths]
+    if processes is None:
+        processes = os.cpu_count() or 1
+    processes = min(processes, len(jobs))
+    results = {}
+    if processes <= 1:
+        # Not worth starting a process for
+        for inputPath, outputPath in jobs:
+            results[inputPath] = exportOne(inputPath, outputPath, formatType, options)
+            if finished is not None:
+                finished(results[inputPath])
+    else:
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            futures = [executor.submit(exportOne, inputPath, outputPath, formatType, options)
+                       for inputPath, outputPath in jobs]
+            for future in concurrent.futures.as_completed(futures):
+                result = future.result()
+                results[result[0]] = result
+                if finished is not None:
+                    finished(result)
+    return [results[inputPath] for inputPath in inputPaths]
+
+
+#------------------------------------------------------------------------------
+def main():
+    """Export recordings from the command line"""
+    parser = argparse.ArgumentParser(description="Export turbine recordings")
+    parser.add_argument('recordings', nargs='+', help="recording files (.wtr) to export")
+    parser.add_argument('--format', choices=[f.name for f in EXPORT_FORMATS],
+                        default=CsvWriter.name, help="file format to export to")
+    parser.add_argument('--output', metavar='FOLDER',
+                        help="folder to write to (default: next to each recording)")
+    parser.add_argument('--start', type=float, help="first second of each session to export")
+    parser.add_argument('--end', type=float, help="last second of each session to export")
+    reduction = parser.add_mutually_exclusive_group()
+    reduction.add_argument('--decimate', type=int, default=1, metavar='N',
+                           help="average every N samples")
+    reduction.add_argument('--resample', type=float, metavar='HZ',
+                           help="interpolate onto a fixed sample rate")
+    parser.add_argument('--epoch-times', action='store_true',
+                        help="write times as seconds since the epoch rather than since "
+                             "the session start")
+    parser.add_argument('--chunk', type=int, default=262144,
+                        help="samples read and written at a time")
+    parser.add_argument('--processes', type=int, help="recordings exported at once "
+                        "(default: one per core)")
+    args = parser.parse_args()
+
+    # Expand wildcards, which the Windows command prompt does not
+    inputPaths = []
+    for pattern in args.recordings:
+        inputPaths.extend(sorted(glob.glob(pattern)) or [pattern])
+    formatType = [f for f in EXPORT_FORMATS if f.name == args.format][0]
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+
+    def reportResult(result):
+        inputPath, outputPath, nWritten, errorMessage = result
+        if errorMessage is None:
+            print("%s -> %s (%d samples)" % (inputPath, outputPath, nWritten))
+        else:
+            print("%s: %s" % (inputPath, errorMessage))
+    results = exportRecordings(inputPaths, args.output, formatType, args.processes,
+                               reportResult, startSeconds=args.start, endSeconds=args.end,
+                               decimate=args.decimate, resampleRate=args.resample,
+                               epochTimes=args.epoch_times, chunkSize=args.chunk)
+    return 1 if any(errorMessage is not None for _, _, _, errorMessage in results) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+Records every acquired sample to disk. Samples are written by a background
+thread in large chunks so disk latency never stalls acquisition.
+
+Recordings are stored as a fixed size header followed by fixed size binary
+records, one per sample:
+
+    header      64 bytes: magic b'WINDREC1', header size (uint32), record
+                size (uint32), session start as seconds since the epoch
+                (float64), zero padding
+    records     time since start in seconds (float64), raw voltage (float32),
+                filtered voltage (float32), all little-endian
+
+The file is only ever appended to, and each chunk is flushed to disk as it is
+written. If a session is killed, everything up to the last chunk is still
+readable; a partially written final record is simply ignored by readers.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy
+
+"""
+
+import os
+import queue
+import struct
+import threading
+import time
+import numpy as np
+
+# File layout (see module docstring)
+FILE_EXTENSION = '.wtr'
+MAGIC = b'WINDREC1'
+HEADER_FORMAT = '<8sIId'
+HEADER_SIZE = 64
+RECORD_DTYPE = np.dtype([('time', '<f8'), ('raw', '<f4'), ('filtered', '<f4')])
+
+
+class SessionRecorder(object):
+    """Appends samples to a recording file from a background writer thread"""
+#------------------------------------------------------------------------------
+    def __init__(self, filePath, startTime=None, chunkSize=65536, flushInterval=1.0):
+        """Recorder constructor. Creates the file and writes its header.
+
+        Samples are collected until chunkSize records are waiting or
+        flushInterval seconds have passed, then written in a single call.
+        """
+        if startTime is None:
+            startTime = time.time()
+        self.filePath = filePath
+        self.chunkSize = chunkSize
+        self.flushInterval = flushInterval
+        self.recordsWritten = 0
+        # Holds a description of any disk error for the GUI to report
+        self.errorMessage = None
+
+        # Write and flush the header immediately, so even an empty session
+        # leaves a valid file
+        self.outputFile = open(filePath, 'wb')
+        header = struct.pack(HEADER_FORMAT, MAGIC, HEADER_SIZE,
+                             RECORD_DTYPE.itemsize, startTime)
+        self.outputFile.write(header.ljust(HEADER_SIZE, b'\0'))
+        self.flushToDisk()
+
+        # Batches of records waiting to be written. None signals the end
+        self.writeQueue = queue.Queue()
+        self.writerThread = threading.Thread(target=self.writeLoop)
+        self.writerThread.daemon = True
+        self.writerThread.start()
+
+#------------------------------------------------------------------------------
+    def write(self, times, raw, filtered):
+        """Queue a batch of samples for writing. Never blocks on the disk.
+        Does nothing once writing has failed, as nothing would write them"""
+        if self.errorMessage is not None:
+            return
+        records = np.empty(len(times), dtype=RECORD_DTYPE)
+        records['time'] = times
+        records['raw'] = raw
+        records['filtered'] = filtered
+        self.writeQueue.put(records)
+
+#------------------------------------------------------------------------------
+    def writeLoop(self):
+        """Writer thread. Gathers queued batches into chunks and writes them"""
+        pending = []
+        nPending = 0
+        lastFlush = time.time()
+        finished = False
+        while not finished:
+            try:
+                records = self.writeQueue.get(timeout=self.flushInterval)
+                if records is None:
+                    finished = True
+                else:
+                    pending.append(records)
+                    nPending += len(records)
+            except queue.Empty:
+                pass
+
+            # Write once a full chunk is waiting, the interval has passed or
+            # the recorder is closing
+            if nPending > 0 and (finished or nPending >= self.chunkSize or
+                                 time.time() - lastFlush >= self.flushInterval):
+                try:
+                    self.outputFile.write(np.concatenate(pending).tobytes())
+                    self.flushToDisk()
+                except (OSError, ValueError) as err:
+                    # Disk full, removed, etc. Stop recording but keep running.
+                    # Batches already queued are discarded to free the memory
+                    self.errorMessage = str(err)
+                    self.discardQueued()
+                    return
+                self.recordsWritten += nPending
+                pending = []
+                nPending = 0
+                lastFlush = time.time()
+
+#------------------------------------------------------------------------------
+    def discardQueued(self):
+        """Empty the write queue without writing"""
+        try:
+            while True:
+                self.writeQueue.get_nowait()
+        except queue.Empty:
+            pass
+
+#------------------------------------------------------------------------------
+    def flushToDisk(self):
+        """Push buffered data all the way to disk"""
+        self.outputFile.flush()
+        os.fsync(self.outputFile.fileno())
+
+#------------------------------------------------------------------------------
+    def close(self):
+        """Write any remaining samples and close the file"""
+        self.writeQueue.put(None)
+        self.writerThread.join()
+        self.outputFile.close()
+
+
+#------------------------------------------------------------------------------
+def defaultRecordingPath(folder, startTime=None, channelName=None):
+    """Return a new, time stamped recording file name in folder. channelName
+    (such as the COM port) is added to tell simultaneous recordings apart"""
+    if startTime is None:
+        startTime = time.time()
+    fileName = time.strftime("Turbine_%Y%m%d_%H%M%S", time.localtime(startTime))
+    if channelName:
+        # Port names such as /dev/ttyACM0 cannot be used in file names as is
+        fileName += "_" + os.path.basename(channelName)
+    return os.path.join(folder, fileName + FILE_EXTENSION)
+
+
+#------------------------------------------------------------------------------
+def openRecording(filePath):
+    """Open a recording file without reading its samples into memory.
+
+    Returns the session start time (seconds since the epoch) and a read-only
+    numpy.memmap of records with fields 'time', 'raw' and 'filtered'. Data is
+    only read from disk as the returned array is accessed, so opening even a
+    very large recording is effectively instant. Raises ValueError if the
+    file is not a recording.
+    """
+    with open(filePath, 'rb') as inputFile:
+        header = inputFile.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or not header.startswith(MAGIC):
+        raise ValueError("%s is not a turbine recording" % filePath)
+    magic, headerSize, recordSize, startTime = struct.unpack(
+        HEADER_FORMAT, header[:struct.calcsize(HEADER_FORMAT)])
+    if recordSize != RECORD_DTYPE.itemsize:
+        raise ValueError("%s uses an unsupported record format" % filePath)
+
+    # Ignore a partially written final record (session killed mid-write)
+    nRecords = (os.path.getsize(filePath) - headerSize)//recordSize
+    if nRecords <= 0:
+        # numpy cannot map an empty region
+        return startTime, np.zeros(0, dtype=RECORD_DTYPE)
+    records = np.memmap(filePath, dtype=RECORD_DTYPE, mode='r',
+                        offset=headerSize, shape=(nRecords,))
+    return startTime, records
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""
+Replays a recorded session through the plotting pipeline as if it were being
+acquired live. Samples are read directly from a memory mapped recording, so
+only the part being replayed is ever loaded from disk.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, SessionRecorder.py
+
+"""
+
+import time
+import numpy as np
+
+
+class ReplaySource(object):
+    """Data source which releases recorded samples in real time (or faster).
+
+    Provides the same start/stop/readAvailable interface as SerialReader, so
+    replayed data goes through exactly the same filtering and plotting. The
+    raw recorded voltages are replayed, so a different filter may be tried on
+    an old session.
+    """
+#------------------------------------------------------------------------------
+    def __init__(self, records, speed=1.0):
+        """Replay constructor. records is a memmap from openRecording"""
+        self.records = records
+        self.speed = speed
+        # Index of the next record to release
+        self.iNext = 0
+        # Same attributes as SerialReader, so either can be used by the GUI
+        self.droppedSamples = 0
+        self.errorMessage = None
+        self.startTime = time.time()
+        # Set once every record has been released
+        self.finished = len(records) == 0
+
+#------------------------------------------------------------------------------
+    def start(self):
+        """Start the replay clock"""
+        self.startTime = time.time()
+
+#------------------------------------------------------------------------------
+    def readAvailable(self):
+        """Return arrays of the times and raw values of all samples which
+        are due since the last call"""
+        if self.finished:
+            return np.zeros(0), np.zeros(0)
+        times = self.records['time']
+        # Session time reached by the replay clock
+        replayTime = times[0] + (time.time() - self.startTime)*self.speed
+        # Binary search only touches a handful of pages of the file
+        iEnd = int(np.searchsorted(times, replayTime, side='right'))
+        batch = self.records[self.iNext:iEnd]
+        self.iNext = iEnd
+        if iEnd >= len(self.records):
+            self.finished = True
+        return np.array(batch['time'], dtype=np.float64), \
+            np.array(batch['raw'], dtype=np.float64)
+
+#------------------------------------------------------------------------------
+    def stop(self):
+        """Nothing to release. Present to match SerialReader"""
+        pass
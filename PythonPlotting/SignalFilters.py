@@ -0,0 +1,184 @@
+# -*- coding: utf-8 -*-
+"""
+Low pass filters applied to incoming voltage data. Each filter keeps its own
+state between calls, so blocks of any size can be filtered back to back and
+give the same result as filtering the whole signal at once. Resetting or
+resizing the plotted data has no effect on the filter.
+
+SciPy takes longer to import than the rest of the program put together, so
+it is only imported when a filter is first used. Call preload() on a
+background thread to have it ready before then.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, scipy
+
+"""
+
+import numpy as np
+
+
+#------------------------------------------------------------------------------
+def preload():
+    """Import SciPy's signal processing now rather than on first use"""
+    from scipy import signal
+
+
+class StreamFilter(object):
+    """Base class for all filters. Subclasses define the filtering itself.
+
+    'parameters' lists the user adjustable settings of each filter as tuples
+    of (attribute, dialog label, minimum, maximum, decimals) and is used to
+    build the filter parameter dialog boxes. Zero decimals denotes an integer.
+    """
+    name = 'None'
+    parameters = []
+
+#------------------------------------------------------------------------------
+    def process(self, block):
+        """Filter a block of samples, returning an array of the same length"""
+        block = np.asarray(block, dtype=np.float64)
+        if len(block) == 0:
+            return block
+        return self.filterBlock(block)
+
+#------------------------------------------------------------------------------
+    def filterBlock(self, block):
+        """No filtering by default"""
+        return block.copy()
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        """Forget all previous samples"""
+        pass
+
+#------------------------------------------------------------------------------
+    def copy(self):
+        """Return a new filter of the same type and settings, without history"""
+        settings = dict((attribute, getattr(self, attribute))
+                        for attribute, label, low, high, decimals in self.parameters)
+        return type(self)(**settings)
+
+#------------------------------------------------------------------------------
+    def describe(self):
+        """Return a short description of the filter and its settings"""
+        settings = ["%s = %g" % (attribute, getattr(self, attribute))
+                    for attribute, label, low, high, decimals in self.parameters]
+        return ", ".join([self.name] + settings)
+
+
+class IIRFilter(StreamFilter):
+    """Recursive filter defined by transfer function coefficients b and a.
+
+    The internal state carried between blocks is initialised on the first
+    sample received as if the signal had always been at that level, which
+    avoids a start-up transient.
+    """
+#------------------------------------------------------------------------------
+    def __init__(self, b, a):
+        self.b = np.atleast_1d(np.asarray(b, dtype=np.float64))
+        self.a = np.atleast_1d(np.asarray(a, dtype=np.float64))
+        self.reset()
+
+#------------------------------------------------------------------------------
+    def filterBlock(self, block):
+        from scipy import signal
+        # Set steady state initial conditions from the first sample ever seen
+        if self.zi is None:
+            self.zi = signal.lfilter_zi(self.b, self.a)*block[0]
+        filtered, self.zi = signal.lfilter(self.b, self.a, block, zi=self.zi)
+        return filtered
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        self.zi = None
+
+
+class ExponentialFilter(IIRFilter):
+    """First order exponential smoothing: y = (1-beta)*y_prev + beta*x"""
+    name = 'Exponential'
+    parameters = [('beta', 'Beta (0<beta<1):', 0.001, 1, 3)]
+
+    def __init__(self, beta=0.150):
+        self.beta = beta
+        super(ExponentialFilter, self).__init__([beta], [1.0, beta - 1.0])
+
+
+class MovingAverageFilter(IIRFilter):
+    """Average of the most recent 'window' samples"""
+    name = 'Moving Average'
+    parameters = [('window', 'Window (samples):', 2, 1000, 0)]
+
+    def __init__(self, window=10):
+        self.window = max(2, int(window))
+        super(MovingAverageFilter, self).__init__(
+            np.ones(self.window)/self.window, [1.0])
+
+
+class ButterworthFilter(StreamFilter):
+    """Low pass Butterworth filter. Cutoff is a fraction of the Nyquist rate.
+
+    Implemented as cascaded second order sections, which remain numerically
+    stable at higher orders and low cutoffs where a single transfer function
+    would not.
+    """
+    name = 'Butterworth'
+    parameters = [('order', 'Order:', 1, 10, 0),
+                  ('cutoff', 'Cutoff (fraction of Nyquist, 0<fc<1):', 0.001, 0.999, 3)]
+
+#------------------------------------------------------------------------------
+    def __init__(self, order=4, cutoff=0.1):
+        self.order = int(order)
+        self.cutoff = cutoff
+        from scipy import signal
+        self.sos = signal.butter(self.order, self.cutoff, output='sos')
+        self.reset()
+
+#------------------------------------------------------------------------------
+    def filterBlock(self, block):
+        from scipy import signal
+        # Set steady state initial conditions from the first sample ever seen
+        if self.zi is None:
+            self.zi = signal.sosfilt_zi(self.sos)*block[0]
+        filtered, self.zi = signal.sosfilt(self.sos, block, zi=self.zi)
+        return filtered
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        self.zi = None
+
+
+class MedianDespikeFilter(StreamFilter):
+    """Running median of the most recent 'window' samples. Removes isolated
+    spikes (such as serial glitches) while preserving steps."""
+    name = 'Median Despike'
+    parameters = [('window', 'Window (samples, odd):', 1, 101, 0)]
+
+#------------------------------------------------------------------------------
+    def __init__(self, window=5):
+        # An odd window always has a single middle value
+        self.window = int(window) | 1
+        self.reset()
+
+#------------------------------------------------------------------------------
+    def filterBlock(self, block):
+        # Pad history with the first sample ever seen
+        if self.history is None:
+            self.history = np.full(self.window - 1, block[0])
+        extended = np.concatenate((self.history, block))
+        # Keep the trailing samples needed to continue with the next block
+        self.history = extended[len(extended) - (self.window - 1):]
+        windows = np.lib.stride_tricks.sliding_window_view(extended, self.window)
+        return np.median(windows, axis=1)
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        self.history = None
+
+
+# Filters available for selection in the GUI, in menu order
+FILTER_TYPES = [ExponentialFilter, MovingAverageFilter,
+                ButterworthFilter, MedianDespikeFilter]
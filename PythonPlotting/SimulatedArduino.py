@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+Software stand-in for the arduino. A pseudo terminal is created and the
+simulated sketch writes turbine voltages to it, in the ASCII, binary or
+legacy ASCII format of the real sketch, at any sample rate. Samples are
+numbered and timestamped like the sketch's, from a simulated micros() clock.
+The other end of the pseudo terminal is opened like any serial port, so the
+plotter, the acquisition engine and the benchmarks can all be run without
+hardware.
+
+Run directly to start a simulated arduino and print its port name, e.g.
+
+    python SimulatedArduino.py --format Binary --rate 500
+
+Pseudo terminals are only available on Linux and macOS.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, SerialProtocol.py
+
+"""
+
+import argparse
+import os
+import threading
+import time
+import numpy as np
+from SerialProtocol import AsciiDecoder, BinaryDecoder, LegacyAsciiDecoder, PROTOCOL_TYPES
+
+
+class SimulatedArduino(threading.Thread):
+    """Thread which writes a simulated turbine signal to a pseudo terminal.
+
+    The signal is a sine wave (a turbine speeding up and slowing down) with a
+    little noise and commutator ripple. Like a real DC generator's, the ripple
+    frequency is proportional to speed, and so to voltage. Samples are written
+    in small bursts as they fall due, like the output of the real sketch. If
+    nothing is reading the port and its buffer fills, samples are discarded
+    and counted, like a UART overrun. Discarded samples still use up sequence
+    numbers, so they show up as lost at the receiving end.
+    """
+#------------------------------------------------------------------------------
+    def __init__(self, protocolType=AsciiDecoder, sampleRate=100.0, meanVolts=0.5,
+                 amplitudeVolts=0.3, periodSeconds=5.0, noiseVolts=0.01, burstInterval=0.005,
+                 rippleVolts=0.02, rippleHzPerVolt=40.0):
+        """Simulator constructor. Creates the pseudo terminal immediately, so
+        portName can be opened before start is called"""
+        super(SimulatedArduino, self).__init__()
+        # Daemon thread so a simulator never prevents the app from closing
+        self.daemon = True
+
+        self.protocolType = protocolType
+        self.sampleRate = sampleRate
+        self.meanVolts = meanVolts
+        self.amplitudeVolts = amplitudeVolts
+        self.periodSeconds = periodSeconds
+        self.noiseVolts = noiseVolts
+        self.rippleVolts = rippleVolts
+        self.rippleHzPerVolt = rippleHzPerVolt
+        # Seconds between bursts of samples
+        self.burstInterval = burstInterval
+
+        # Create the pseudo terminal in raw mode, so bytes pass unchanged.
+        # Writes never block; a full buffer discards samples instead
+        import pty
+        import tty
+        self.masterFd, self.slaveFd = pty.openpty()
+        tty.setraw(self.masterFd)
+        tty.setraw(self.slaveFd)
+        os.set_blocking(self.masterFd, False)
+        # Name of the serial port to open, e.g. /dev/pts/3
+        self.portName = os.ttyname(self.slaveFd)
+
+        self.samplesSent = 0
+        self.samplesDiscarded = 0
+        # Set to log the number of samples sent and the time each burst was
+        # written, used by the benchmarks to measure latency
+        self.logSends = False
+        self.sentCounts = []
+        self.sentTimes = []
+        # Sequence number of the next sample to encode (the first waiting to
+        # fill a frame, in binary), and the sketch's sampling period
+        self.sampleSequence = 0
+        self.periodMicros = int(round(1e6/sampleRate))
+        # Samples waiting to fill a binary frame
+        self.frameSamples = np.zeros(0, dtype=np.uint16)
+
+        self.randomGenerator = np.random.default_rng(0)
+        # Held while a burst is written and counted
+        self.sendLock = threading.Lock()
+        self.stopEvent = threading.Event()
+
+#------------------------------------------------------------------------------
+    def run(self):
+        """Write samples as they fall due until stopped"""
+        startTime = time.perf_counter()
+        nDue = 0
+        while not self.stopEvent.is_set():
+            time.sleep(self.burstInterval)
+            nDueNow = int((time.perf_counter() - startTime)*self.sampleRate)
+            volts = self.signal(np.arange(nDue, nDueNow)/self.sampleRate)
+            nDue = nDueNow
+            if len(volts) == 0:
+                continue
+
+            dataOut, nSamples = self.encode(volts)
+            if len(dataOut) == 0:
+                continue
+            with self.sendLock:
+                try:
+                    os.write(self.masterFd, dataOut)
+                except BlockingIOError:
+                    # Nobody reading and the buffer is full. Lose the burst
+                    self.samplesDiscarded += nSamples
+                    continue
+                except OSError:
+                    # Pseudo terminal closed
+                    return
+                self.samplesSent += nSamples
+                if self.logSends:
+                    self.sentCounts.append(self.samplesSent)
+                    self.sentTimes.append(time.perf_counter())
+
+#------------------------------------------------------------------------------
+    def signal(self, times):
+        """Return simulated turbine voltages at times (seconds)"""
+        angle = 2*np.pi*times/self.periodSeconds
+        volts = self.meanVolts + self.amplitudeVolts*np.sin(angle)
+        # Ripple phase is the integral of its frequency, rippleHzPerVolt*volts
+        ripplePhase = 2*np.pi*self.rippleHzPerVolt*(self.meanVolts*times -
+            self.amplitudeVolts*self.periodSeconds/(2*np.pi)*np.cos(angle))
+        volts += self.rippleVolts*np.sin(ripplePhase)
+        volts += self.noiseVolts*self.randomGenerator.standard_normal(len(times))
+        # The arduino can only measure 0 to 3.3 V
+        return np.clip(volts, 0.0, 3.3)
+
+#------------------------------------------------------------------------------
+    def encode(self, volts):
+        """Convert voltages to the bytes the sketch would send. Returns the
+        bytes and the number of samples they contain"""
+        if self.protocolType is BinaryDecoder:
+            return self.encodeBinary(volts)
+        if self.protocolType is LegacyAsciiDecoder:
+            return encodeAscii(volts), len(volts)
+        sequence = self.sampleSequence + np.arange(len(volts), dtype=np.int64)
+        self.sampleSequence += len(volts)
+        return encodeAscii(volts, sequence, sequence*self.periodMicros), len(volts)
+
+#------------------------------------------------------------------------------
+    def encodeBinary(self, volts):
+        """Pack voltages into binary frames. Samples which do not fill a
+        whole frame are kept for the next call"""
+        counts = np.concatenate((self.frameSamples, voltsToCounts(volts)))
+        nPerFrame = BinaryDecoder.samplesPerFrame
+        nFrames = len(counts)//nPerFrame
+        self.frameSamples = counts[nFrames*nPerFrame:]
+        if nFrames == 0:
+            return b'', 0
+        dataOut = encodeFrames(counts[:nFrames*nPerFrame], self.sampleSequence,
+                               self.sampleSequence*self.periodMicros, self.periodMicros)
+        self.sampleSequence += nFrames*nPerFrame
+        return dataOut, nFrames*nPerFrame
+
+#------------------------------------------------------------------------------
+    def sendTimeOf(self, nSamples):
+        """Return the time the nSamples'th sample was written, on the
+        time.perf_counter clock, or None if it has not been sent. Requires
+        logSends"""
+        iBurst = int(np.searchsorted(self.sentCounts, nSamples))
+        if iBurst >= len(self.sentTimes):
+            return None
+        return self.sentTimes[iBurst]
+
+#------------------------------------------------------------------------------
+    def stop(self, timeout=1.0):
+        """Stop writing and close the pseudo terminal"""
+        self.stopEvent.set()
+        if self.is_alive():
+            self.join(timeout)
+        os.close(self.masterFd)
+        os.close(self.slaveFd)
+
+
+#------------------------------------------------------------------------------
+def encodeAscii(volts, sequence=None, micros=None):
+    """Format samples as the sketch's serial prints would. Without sequence
+    numbers and micros(), as older sketches' Serial.println(vAct) would"""
+    if sequence is None:
+        return "".join(["%0.2f\r\n" % v for v in volts]).encode('ascii')
+    # Both counters are unsigned long on the arduino
+    sequence = np.asarray(sequence) % 2**32
+    micros = np.asarray(micros) % 2**32
+    return "".join(["%d,%d,%0.2f\r\n" % sample
+                    for sample in zip(sequence, micros, volts)]).encode('ascii')
+
+
+#------------------------------------------------------------------------------
+def voltsToCounts(volts):
+    """Convert voltages to the arduino's 10 bit ADC counts"""
+    counts = np.round(np.asarray(volts)/BinaryDecoder.bitsToVolts)
+    return np.clip(counts, 0, 1023).astype(np.uint16)
+
+
+#------------------------------------------------------------------------------
+def encodeFrames(counts, firstSequence=0, firstMicros=0, periodMicros=10000):
+    """Pack ADC counts into binary frames as the sketch's sendFrame() would,
+    numbering samples from firstSequence and timing them from firstMicros.
+    The number of counts must be a multiple of the samples per frame"""
+    nPerFrame = BinaryDecoder.samplesPerFrame
+    nFrames = len(counts)//nPerFrame
+    frames = np.zeros((nFrames, BinaryDecoder.headerSize + 2*nPerFrame + 1), dtype=np.uint8)
+    frames[:, 0] = 0xA5
+    frames[:, 1] = 0x5A
+    frames[:, 2] = nPerFrame
+    # Sequence number and micros() of each frame's first sample
+    iFirst = nPerFrame*np.arange(nFrames, dtype=np.int64)
+    frames[:, 3:7] = ((firstSequence + iFirst) % 2**32).astype('<u4')[:, None].view(np.uint8)
+    frames[:, 7:11] = ((firstMicros + periodMicros*iFirst) % 2**32).astype('<u4')[:, None] \
+        .view(np.uint8)
+    frames[:, 11:13] = np.full((nFrames, 1), periodMicros, dtype='<u2').view(np.uint8)
+    frames[:, BinaryDecoder.headerSize:-1] = \
+        np.asarray(counts, dtype='<u2').view(np.uint8).reshape(nFrames, -1)
+    frames[:, -1] = frames[:, 2:-1].sum(axis=1) % 256
+    return frames.tobytes()
+
+
+#------------------------------------------------------------------------------
+def main():
+    """Run a simulated arduino until interrupted"""
+    parser = argparse.ArgumentParser(description="Simulate the turbine arduino on a pseudo terminal")
+    parser.add_argument('--format', choices=[p.name for p in PROTOCOL_TYPES],
+                        default=AsciiDecoder.name, help="serial format to send")
+    parser.add_argument('--rate', type=float, default=100.0, help="samples per second")
+    parser.add_argument('--count', type=int, default=1, help="number of arduinos to simulate")
+    args = parser.parse_args()
+
+    protocolType = [p for p in PROTOCOL_TYPES if p.name == args.format][0]
+    simulators = [SimulatedArduino(protocolType, args.rate) for i in range(args.count)]
+    for simulator in simulators:
+        simulator.start()
+        print("Simulated arduino on %s (%s, %g samples/s)"
+              % (simulator.portName, protocolType.name, args.rate))
+    try:
+        while True:
+            time.sleep(1.0)
+    except KeyboardInterrupt:
+        pass
+    for simulator in simulators:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Live spectrum of a turbine's generator voltage, used to estimate rotor speed.
+A DC generator's output ripples once per commutator segment passing the
+brushes, so the ripple frequency is proportional to RPM:
+
+    RPM = 60 * ripple frequency / ripples per revolution
+
+The spectrum is a short time Fourier transform (STFT) computed incrementally:
+each time hopSize new samples arrive, one more Hann windowed frame of the
+latest fftSize samples is transformed, and history is never transformed
+again. All frames which became due in a batch are transformed in one call.
+Input, frame and spectrogram buffers are allocated once, and the window
+function is computed once.
+
+The transforms are done on a SpectrumWorker thread, so the time domain plot
+never waits for them. Channels submit their raw samples (the display filters
+would remove the ripple) and the GUI reads the results at its own rate.
+Analyzers are never reset; the engine replaces them instead, so one is never
+changed while the worker is using it.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, PerformanceMonitor.py
+
+"""
+
+import collections
+import threading
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from PerformanceMonitor import PerformanceMonitor
+
+
+class SpectrumAnalyzer(object):
+    """Incremental STFT of one channel, with dominant frequency and RPM"""
+    # Frames transformed in one call at most. Larger batches are split
+    maxFramesPerCall = 64
+    # Ripple below this frequency (Hz) is taken to be changes in wind speed
+    minFrequency = 1.0
+
+#------------------------------------------------------------------------------
+    def __init__(self, fftSize=256, hopSize=64, historyFrames=200, ripplesPerRevolution=6):
+        """Analyzer constructor. Frames are fftSize samples long and start
+        every hopSize samples. historyFrames of the spectrogram are kept"""
+        self.fftSize = fftSize
+        self.hopSize = hopSize
+        self.historyFrames = historyFrames
+        # Commutator ripples per rotor revolution. Small 3 slot DC motors
+        # give 6. Adjustable via dialog box
+        self.ripplesPerRevolution = ripplesPerRevolution
+        self.nBins = fftSize//2 + 1
+
+        # Cached Hann window, and its sum to scale magnitudes to volts
+        self.window = np.hanning(fftSize)
+        self.windowGain = 2.0/self.window.sum()
+        # Cached straight line through the frame, centred on zero and scaled
+        # so a frame's dot product with it is the slope of its best fit line
+        self.ramp = np.arange(fftSize) - 0.5*(fftSize - 1)
+        self.rampScale = self.ramp/np.dot(self.ramp, self.ramp)
+
+        # Samples not yet consumed by a frame. The first is always the start
+        # of the next frame
+        capacity = fftSize + hopSize*(self.maxFramesPerCall - 1)
+        self.times = np.zeros(capacity)
+        self.values = np.zeros(capacity)
+        self.nBuffered = 0
+        # Windowed frames ready to transform
+        self.frames = np.zeros((self.maxFramesPerCall, fftSize))
+
+        # Spectrogram history: one magnitude spectrum per row, written
+        # circularly, and each frame's centre time
+        self.spectrogram = np.zeros((historyFrames, self.nBins))
+        self.frameTimes = np.zeros(historyFrames)
+        self.iFrame = 0
+        self.nFrames = 0
+
+        # Results for the GUI, swapped in under the lock
+        self.lock = threading.Lock()
+        self.sampleRate = None
+        self.latestSpectrum = np.zeros(self.nBins)
+        self.dominantFrequency = 0.0
+
+#------------------------------------------------------------------------------
+    def push(self, times, values):
+        """Add a batch of samples, transforming every frame which falls due"""
+        iStart = 0
+        while iStart < len(values):
+            # Fill the input buffer as far as it will go
+            nTake = min(len(values) - iStart, len(self.values) - self.nBuffered)
+            self.times[self.nBuffered:self.nBuffered+nTake] = times[iStart:iStart+nTake]
+            self.values[self.nBuffered:self.nBuffered+nTake] = values[iStart:iStart+nTake]
+            self.nBuffered += nTake
+            iStart += nTake
+            self.transformFrames()
+
+#------------------------------------------------------------------------------
+    def transformFrames(self):
+        """Transform all whole frames in the input buffer, then discard the
+        samples no later frame needs"""
+        if self.nBuffered < self.fftSize:
+            return
+        nFrames = (self.nBuffered - self.fftSize)//self.hopSize + 1
+        # Overlapping frames as views of the input buffer, without copying
+        frames = sliding_window_view(self.values[:self.nBuffered],
+                                     self.fftSize)[::self.hopSize][:nFrames]
+
+        # Remove each frame's best fit line (the turbine's DC output, and its
+        # slow change with wind speed, which would swamp the ripple), then
+        # window
+        windowed = self.frames[:nFrames]
+        np.subtract(frames, frames.mean(axis=1, keepdims=True), out=windowed)
+        windowed -= np.outer(frames @ self.rampScale, self.ramp)
+        windowed *= self.window
+        magnitudes = np.abs(np.fft.rfft(windowed, axis=1))*self.windowGain
+
+        # Sample rate from the newest frame's timestamps
+        iLast = (nFrames - 1)*self.hopSize
+        duration = self.times[iLast + self.fftSize - 1] - self.times[iLast]
+        centreTimes = self.times[np.arange(nFrames)*self.hopSize + self.fftSize//2]
+
+        with self.lock:
+            # Write into the spectrogram, wrapping round if necessary
+            iRows = (self.iFrame + np.arange(nFrames)) % self.historyFrames
+            self.spectrogram[iRows] = magnitudes
+            self.frameTimes[iRows] = centreTimes
+            self.iFrame = (self.iFrame + nFrames) % self.historyFrames
+            self.nFrames = min(self.nFrames + nFrames, self.historyFrames)
+            if duration > 0:
+                self.sampleRate = (self.fftSize - 1)/duration
+            self.latestSpectrum = magnitudes[-1]
+            self.dominantFrequency = self.findPeak(magnitudes[-1])
+
+        # Keep the samples from the start of the next frame
+        nConsumed = nFrames*self.hopSize
+        nKept = self.nBuffered - nConsumed
+        self.times[:nKept] = self.times[nConsumed:self.nBuffered]
+        self.values[:nKept] = self.values[nConsumed:self.nBuffered]
+        self.nBuffered = nKept
+
+#------------------------------------------------------------------------------
+    def findPeak(self, magnitudes):
+        """Return the frequency (Hz) of the largest peak above minFrequency,
+        interpolated between bins, or 0 if unknown"""
+        if self.sampleRate is None:
+            return 0.0
+        binWidth = self.sampleRate/self.fftSize
+        iFirst = max(1, int(np.ceil(self.minFrequency/binWidth)))
+        if iFirst >= self.nBins - 1:
+            return 0.0
+        iPeak = iFirst + int(np.argmax(magnitudes[iFirst:-1]))
+        # Fit a parabola through the peak and its neighbours
+        left, centre, right = magnitudes[iPeak-1:iPeak+2]
+        curvature = left - 2*centre + right
+        offset = 0.5*(left - right)/curvature if curvature < 0 else 0.0
+        return (iPeak + offset)*binWidth
+
+#------------------------------------------------------------------------------
+    def rpm(self):
+        """Return the rotor speed estimated from the dominant frequency"""
+        return 60.0*self.dominantFrequency/self.ripplesPerRevolution
+
+#------------------------------------------------------------------------------
+    def frequencies(self):
+        """Return the frequency (Hz) of each bin, or None until known"""
+        if self.sampleRate is None:
+            return None
+        return np.fft.rfftfreq(self.fftSize, 1.0/self.sampleRate)
+
+#------------------------------------------------------------------------------
+    def snapshot(self):
+        """Return copies of (frequencies, latest spectrum, spectrogram with
+        oldest row first, frame times) for display"""
+        with self.lock:
+            iRows = (self.iFrame - self.nFrames + np.arange(self.nFrames)) % self.historyFrames
+            return (self.frequencies(), self.latestSpectrum.copy(),
+                    self.spectrogram[iRows], self.frameTimes[iRows])
+
+
+class SpectrumWorker(threading.Thread):
+    """Thread which runs channels' spectrum analysis in the background.
+
+    Batches are handed over through a collections.deque, as in SerialReader.
+    If the worker falls behind by more than queueSize batches, the oldest
+    are dropped; the spectrum then skips a little, but the plot is unharmed.
+    """
+#------------------------------------------------------------------------------
+    def __init__(self, queueSize=1000, monitor=None):
+        """Worker constructor"""
+        super(SpectrumWorker, self).__init__()
+        # Daemon thread so it never prevents the app from closing
+        self.daemon = True
+        # (analyzer, times, values) waiting to be analysed
+        self.jobs = collections.deque(maxlen=queueSize)
+        self.jobReady = threading.Event()
+        self.stopEvent = threading.Event()
+        if monitor is None:
+            monitor = PerformanceMonitor()
+        self.monitor = monitor
+
+#------------------------------------------------------------------------------
+    def submit(self, analyzer, times, values):
+        """Queue a batch of samples for analyzer. Returns immediately"""
+        self.jobs.append((analyzer, times, values))
+        self.jobReady.set()
+
+#------------------------------------------------------------------------------
+    def run(self):
+        """Analyse queued batches until stopped"""
+        while not self.stopEvent.is_set():
+            self.jobReady.wait(0.1)
+            self.jobReady.clear()
+            while len(self.jobs) > 0:
+                analyzer, times, values = self.jobs.popleft()
+                tStart = self.monitor.now()
+                analyzer.push(times, values)
+                self.monitor.lap('spectrum', tStart, len(values))
+
+#------------------------------------------------------------------------------
+    def stop(self, timeout=1.0):
+        """Signal the thread to exit and wait for it to finish"""
+        self.stopEvent.set()
+        self.jobReady.set()
+        if self.is_alive():
+            self.join(timeout)
@@ -0,0 +1,259 @@
+# -*- coding: utf-8 -*-
+"""
+Shares live data over the network, so a whole class can watch the turbine
+connected to one computer. Only one program can open an arduino's COM port;
+that program publishes each batch of samples it acquires, and any number of
+plotters connect to it over TCP (see NetworkSource.py) instead of to an
+arduino.
+
+Every message is a small header followed by a payload, all little-endian:
+
+    header      magic b'WT', message type (uint8), channel index (uint8),
+                payload size in bytes (uint32)
+    HELLO       JSON: {"version": 1, "startTime": seconds since the epoch,
+                "channels": [channel names]}. Sent on connecting, and again
+                whenever the publisher starts a new run
+    SAMPLES     number of the batch's first sample on its channel (uint32),
+                then per sample: time since startTime in seconds (float64)
+                and raw voltage (float32)
+
+Each client has its own sending thread and a bounded queue of messages. A
+slow client (weak wifi, say) falls behind on its own: once its queue is full
+the oldest batches are dropped, and it sees a gap in the sample numbers.
+Publishing never waits for a client, so acquisition is never stalled.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy
+
+"""
+
+import collections
+import json
+import socket
+import struct
+import threading
+import numpy as np
+
+# Message layout (see module docstring)
+MAGIC = b'WT'
+HEADER_FORMAT = '<2sBBI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MESSAGE_HELLO = 1
+MESSAGE_SAMPLES = 2
+SAMPLES_FORMAT = '<I'
+SAMPLE_DTYPE = np.dtype([('time', '<f8'), ('raw', '<f4')])
+PROTOCOL_VERSION = 1
+# Port used unless another is chosen
+DEFAULT_PORT = 47800
+
+
+#------------------------------------------------------------------------------
+def encodeMessage(messageType, channelIndex, payload):
+    """Return a message with its header"""
+    return struct.pack(HEADER_FORMAT, MAGIC, messageType, channelIndex, len(payload)) + payload
+
+
+#------------------------------------------------------------------------------
+def encodeHello(channelNames, startTime):
+    """Return the HELLO message describing the channels"""
+    payload = json.dumps({'version': PROTOCOL_VERSION, 'startTime': startTime,
+                          'channels': list(channelNames)}).encode('utf-8')
+    return encodeMessage(MESSAGE_HELLO, 0, payload)
+
+
+#------------------------------------------------------------------------------
+def encodeSamples(channelIndex, firstSample, times, raw):
+    """Return a SAMPLES message holding one batch of a channel's samples"""
+    samples = np.empty(len(times), dtype=SAMPLE_DTYPE)
+    samples['time'] = times
+    samples['raw'] = raw
+    return encodeMessage(MESSAGE_SAMPLES, channelIndex,
+                         struct.pack(SAMPLES_FORMAT, firstSample % 2**32) + samples.tobytes())
+
+
+class ClientSender(threading.Thread):
+    """Thread which sends queued messages to one connected client"""
+#------------------------------------------------------------------------------
+    def __init__(self, connection, address, queueSize=256):
+        """Sender constructor. Up to queueSize batches wait to be sent;
+        beyond that the oldest are dropped"""
+        super(ClientSender, self).__init__()
+        # Daemon thread so a stuck client never prevents the app from closing
+        self.daemon = True
+        self.connection = connection
+        self.address = address
+        self.messages = collections.deque(maxlen=queueSize)
+        # HELLO waiting to be sent. Kept apart so it is never dropped
+        self.helloMessage = None
+        self.messageReady = threading.Event()
+        self.stopEvent = threading.Event()
+        self.droppedBatches = 0
+        # Set once the client has gone
+        self.closed = False
+
+#------------------------------------------------------------------------------
+    def sendHello(self, message):
+        """Send a HELLO ahead of everything else. Batches still waiting
+        belong to the previous run, so they are discarded"""
+        self.messages.clear()
+        self.helloMessage = message
+        self.messageReady.set()
+
+#------------------------------------------------------------------------------
+    def send(self, message):
+        """Queue a message. Never blocks; drops the oldest if full"""
+        if len(self.messages) == self.messages.maxlen:
+            self.droppedBatches += 1
+        self.messages.append(message)
+        self.messageReady.set()
+
+#------------------------------------------------------------------------------
+    def run(self):
+        """Send queued messages until stopped or the client goes"""
+        try:
+            while not self.stopEvent.is_set():
+                self.messageReady.wait(0.5)
+                self.messageReady.clear()
+                if self.helloMessage is not None:
+                    message, self.helloMessage = self.helloMessage, None
+                    self.connection.sendall(message)
+                while len(self.messages) > 0 and self.helloMessage is None:
+                    self.connection.sendall(self.messages.popleft())
+        except OSError:
+            # Client disconnected
+            pass
+        self.closed = True
+        self.connection.close()
+
+#------------------------------------------------------------------------------
+    def stop(self, timeout=1.0):
+        """Disconnect the client and wait for the thread to finish"""
+        self.stopEvent.set()
+        self.messageReady.set()
+        try:
+            # Wakes the thread if it is blocked sending
+            self.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        if self.is_alive():
+            self.join(timeout)
+
+
+class StreamServer(threading.Thread):
+    """Thread which accepts clients and publishes batches to all of them.
+
+    The port is bound when the server is constructed, so an OSError (e.g.
+    port in use) is raised to the caller. Port 0 picks a free port; port
+    then holds the one chosen.
+    """
+    # Seconds between checks for stop while waiting for clients
+    acceptTimeout = 0.2
+
+#------------------------------------------------------------------------------
+    def __init__(self, port=DEFAULT_PORT, host='', queueSize=256):
+        """Server constructor. host '' accepts clients on every network;
+        '127.0.0.1' only from this computer"""
+        super(StreamServer, self).__init__()
+        # Daemon thread so the server never prevents the app from closing
+        self.daemon = True
+        self.queueSize = queueSize
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            self.listener.bind((host, port))
+            self.listener.listen()
+        except OSError:
+            self.listener.close()
+            raise
+        self.listener.settimeout(self.acceptTimeout)
+        self.port = self.listener.getsockname()[1]
+
+        # Connected clients. Changed on the server thread, read on the
+        # publishing thread, so guarded by a lock
+        self.clients = []
+        self.clientLock = threading.Lock()
+        self.helloMessage = encodeHello([], 0.0)
+        # Number of the next sample of each channel
+        self.sampleCounts = []
+        # Batches dropped for clients which have since left
+        self.droppedBatches = 0
+        self.stopEvent = threading.Event()
+
+#------------------------------------------------------------------------------
+    def run(self):
+        """Accept clients until stopped"""
+        while not self.stopEvent.is_set():
+            try:
+                connection, address = self.listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                # Listening socket closed
+                return
+            # Samples are sent as soon as they are published
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            client = ClientSender(connection, address, self.queueSize)
+            with self.clientLock:
+                client.sendHello(self.helloMessage)
+                self.clients.append(client)
+            client.start()
+
+#------------------------------------------------------------------------------
+    def setChannels(self, channelNames, startTime):
+        """Describe the channels about to be published, and tell every
+        client a new run is starting"""
+        self.sampleCounts = [0]*len(channelNames)
+        with self.clientLock:
+            self.helloMessage = encodeHello(channelNames, startTime)
+            for client in self.clients:
+                client.sendHello(self.helloMessage)
+
+#------------------------------------------------------------------------------
+    def publish(self, channelIndex, times, raw):
+        """Send a batch of a channel's samples to every client. Returns
+        immediately, however slow the clients"""
+        if len(times) == 0:
+            return
+        firstSample = self.sampleCounts[channelIndex]
+        self.sampleCounts[channelIndex] += len(times)
+        with self.clientLock:
+            # Forget clients which have disconnected
+            for client in self.clients:
+                if client.closed:
+                    self.droppedBatches += client.droppedBatches
+            self.clients = [client for client in self.clients if not client.closed]
+            if len(self.clients) == 0:
+                return
+            clients = list(self.clients)
+        # Encoded once, whatever the number of clients
+        message = encodeSamples(channelIndex, firstSample, times, raw)
+        for client in clients:
+            client.send(message)
+
+#------------------------------------------------------------------------------
+    def clientCount(self):
+        """Return the number of connected clients"""
+        with self.clientLock:
+            return len([client for client in self.clients if not client.closed])
+
+#------------------------------------------------------------------------------
+    def totalDroppedBatches(self):
+        """Return the batches dropped for slow clients, past and present"""
+        with self.clientLock:
+            return self.droppedBatches + sum(client.droppedBatches for client in self.clients)
+
+#------------------------------------------------------------------------------
+    def stop(self, timeout=1.0):
+        """Stop accepting clients and disconnect all of them"""
+        self.stopEvent.set()
+        self.listener.close()
+        if self.is_alive():
+            self.join(timeout)
+        with self.clientLock:
+            clients, self.clients = self.clients, []
+        for client in clients:
+            client.stop()
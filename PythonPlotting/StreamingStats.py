@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+Incremental statistics of a turbine's voltage: mean, RMS, minimum and maximum
+over a sliding time window, and generated power and cumulative energy into a
+load resistance. Every statistic is updated per batch with vectorized NumPy
+calls, and never by going back over old samples, so the cost per sample is
+constant however long the run or the window.
+
+Samples are summarised in blocks of a fixed length of time (a hundredth of
+the window by default). Running sums are kept over the blocks in the window,
+adding each new block and subtracting each expired one, and the minimum and
+maximum come from monotonic queues of block extremes. A block expires once
+its newest sample leaves the window, so the window is accurate to one block.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy
+
+"""
+
+import collections
+import math
+import numpy as np
+
+
+class WindowedStats(object):
+    """Mean, RMS, min and max of the samples in the last windowSeconds"""
+    # Blocks per window. More is more accurate but uses more memory
+    blocksPerWindow = 100
+
+#------------------------------------------------------------------------------
+    def __init__(self, windowSeconds=10.0):
+        """Statistics constructor"""
+        self.setWindow(windowSeconds)
+
+#------------------------------------------------------------------------------
+    def setWindow(self, windowSeconds):
+        """Change the window length. Forgets all samples"""
+        self.windowSeconds = windowSeconds
+        self.blockSeconds = windowSeconds/self.blocksPerWindow
+        self.reset()
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        """Forget all samples"""
+        # (newest time, count, sum, sum of squares) of each block in window
+        self.blocks = collections.deque()
+        # Blocks whose minimum (maximum) is below (above) every later block's
+        # as (newest time, minimum) and (newest time, -maximum). The first of
+        # each is the window's extreme
+        self.minimums = collections.deque()
+        self.maximums = collections.deque()
+        # Running totals over the blocks in the window
+        self.count = 0
+        self.total = 0.0
+        self.totalSquares = 0.0
+        self.latestTime = None
+
+#------------------------------------------------------------------------------
+    def update(self, times, values):
+        """Add a batch of samples. Times must not decrease"""
+        if len(values) == 0:
+            return
+        times = np.asarray(times, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+
+        # Split the batch where it crosses a block boundary, and summarise
+        # every block in one call per statistic
+        blockIndex = np.floor(times/self.blockSeconds)
+        iStarts = np.flatnonzero(blockIndex[1:] != blockIndex[:-1]) + 1
+        iStarts = np.concatenate(([0], iStarts))
+        iEnds = np.concatenate((iStarts[1:], [len(values)]))
+        sums = np.add.reduceat(values, iStarts)
+        sumSquares = np.add.reduceat(values*values, iStarts)
+        newestTimes = times[iEnds - 1]
+
+        self.count += len(values)
+        self.total += float(sums.sum())
+        self.totalSquares += float(sumSquares.sum())
+        self.blocks.extend(zip(newestTimes.tolist(), (iEnds - iStarts).tolist(),
+                               sums.tolist(), sumSquares.tolist()))
+        # Maximums are queued negated, so both queues hold minimums
+        self.appendMinimums(self.minimums, newestTimes,
+                            np.minimum.reduceat(values, iStarts))
+        self.appendMinimums(self.maximums, newestTimes,
+                            -np.maximum.reduceat(values, iStarts))
+        self.latestTime = newestTimes[-1]
+
+        # Drop blocks which have left the window
+        tExpired = self.latestTime - self.windowSeconds
+        while self.blocks[0][0] < tExpired:
+            newestTime, count, total, totalSquares = self.blocks.popleft()
+            self.count -= count
+            self.total -= total
+            self.totalSquares -= totalSquares
+        while self.minimums[0][0] < tExpired:
+            self.minimums.popleft()
+        while self.maximums[0][0] < tExpired:
+            self.maximums.popleft()
+        if len(self.blocks) == 1:
+            # Only the newest block is left. Start the totals afresh, so
+            # rounding errors from adding and subtracting cannot build up
+            newestTime, self.count, self.total, self.totalSquares = self.blocks[0]
+
+#------------------------------------------------------------------------------
+    def appendMinimums(self, queue, newestTimes, minimums):
+        """Add new blocks' minimums to a monotonic queue, dropping every
+        block which can no longer be the minimum of the window"""
+        if len(minimums) == 1:
+            keep = slice(None)
+            batchMinimum = minimums[0]
+        else:
+            # A block can only become the minimum if it is below every
+            # later block. The first of those is the batch's own minimum
+            laterMinimums = np.minimum.accumulate(minimums[::-1])[::-1]
+            keep = np.append(minimums[:-1] < laterMinimums[1:], True)
+            batchMinimum = laterMinimums[0]
+        # Older blocks which are no lower than it can go
+        batchMinimum = float(batchMinimum)
+        while len(queue) > 0 and queue[-1][1] >= batchMinimum:
+            queue.pop()
+        queue.extend(zip(newestTimes[keep].tolist(), minimums[keep].tolist()))
+
+#------------------------------------------------------------------------------
+    def mean(self):
+        """Return the mean over the window, or 0 if empty"""
+        return self.total/self.count if self.count else 0.0
+
+#------------------------------------------------------------------------------
+    def meanSquare(self):
+        """Return the mean of the squared samples over the window"""
+        # Rounding can leave a tiny negative total after subtractions
+        return max(self.totalSquares, 0.0)/self.count if self.count else 0.0
+
+#------------------------------------------------------------------------------
+    def rms(self):
+        """Return the root mean square over the window, or 0 if empty"""
+        return math.sqrt(self.meanSquare())
+
+#------------------------------------------------------------------------------
+    def minimum(self):
+        """Return the smallest sample in the window, or 0 if empty"""
+        return self.minimums[0][1] if self.count else 0.0
+
+#------------------------------------------------------------------------------
+    def maximum(self):
+        """Return the largest sample in the window, or 0 if empty"""
+        return -self.maximums[0][1] if self.count else 0.0
+
+
+class PowerMeter(object):
+    """Power delivered to a load resistance, P = V^2/R, and the energy
+    generated since the last reset, integrated by the trapezoid rule"""
+#------------------------------------------------------------------------------
+    def __init__(self, loadResistance=10.0, statistics=None):
+        """Power meter constructor. loadResistance is in ohms. The average
+        power is taken from statistics, the WindowedStats of the same
+        voltages, which its owner updates"""
+        self.loadResistance = loadResistance
+        if statistics is None:
+            statistics = WindowedStats()
+        self.statistics = statistics
+        self.reset()
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        """Zero the energy and peak power and forget the last sample"""
+        # Joules generated since reset
+        self.energy = 0.0
+        self.latestPower = 0.0
+        self.peakPower = 0.0
+        # Last sample of the previous batch, to integrate across batches
+        self.lastTime = None
+        self.lastPower = None
+
+#------------------------------------------------------------------------------
+    def update(self, times, volts):
+        """Add a batch of voltage samples. Times must not decrease"""
+        if len(volts) == 0:
+            return
+        times = np.asarray(times, dtype=np.float64)
+        volts = np.asarray(volts, dtype=np.float64)
+        power = volts*volts/self.loadResistance
+
+        # Trapezoid rule, continuing from the previous batch's last sample
+        if self.lastTime is not None:
+            times = np.concatenate(([self.lastTime], times))
+            power = np.concatenate(([self.lastPower], power))
+        self.energy += float(np.sum(0.5*(power[1:] + power[:-1])*np.diff(times)))
+        self.lastTime = times[-1]
+        self.lastPower = power[-1]
+        self.latestPower = float(power[-1])
+        self.peakPower = max(self.peakPower, float(power.max()))
+
+#------------------------------------------------------------------------------
+    def averagePower(self):
+        """Return the mean power over the window (watts)"""
+        return self.statistics.meanSquare()/self.loadResistance
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+State of a single turbine being monitored: where its data comes from, its
+filter, its full history, its peak voltage, windowed statistics, the
+power and energy it generates and, when enabled, its spectrum and sharing
+over the network. Several channels can run side by side, each with its own
+reader thread, so adding a turbine does not slow down the others.
+
+    Created By:   agent
+    Created On:   17-OCT-2026
+    Modified By:
+    Modified On:
+
+Requires: numpy, DecimationPyramid.py, SessionRecorder.py,
+          PerformanceMonitor.py, StreamingStats.py, SpectrumAnalyzer.py,
+          StreamServer.py
+
+"""
+
+from DecimationPyramid import MinMaxPyramid
+from SessionRecorder import SessionRecorder
+from PerformanceMonitor import PerformanceMonitor
+from StreamingStats import WindowedStats, PowerMeter
+
+
+class TurbineChannel(object):
+    """Processes data from one source (serial reader, replay or network)"""
+#------------------------------------------------------------------------------
+    def __init__(self, name, dataSource, signalFilter, serialPort=None, monitor=None,
+                 expectedRate=None, statisticsWindow=10.0, loadResistance=10.0):
+        """Channel constructor. serialPort, if given, is closed on stop.
+        Stage times and the sample rate (against expectedRate, if known)
+        are reported to monitor. Statistics cover the last statisticsWindow
+        seconds, and power is that delivered to loadResistance ohms"""
+        self.name = name
+        self.dataSource = dataSource
+        self.signalFilter = signalFilter
+        self.serialPort = serialPort
+        self.sessionRecorder = None
+        if monitor is None:
+            monitor = PerformanceMonitor()
+        self.monitor = monitor
+        self.expectedRate = expectedRate
+
+        # Min/max index of all filtered data, used to draw any view range
+        self.pyramid = MinMaxPyramid()
+        # Most recent and largest filtered voltages
+        self.latestVolts = 0.0
+        self.maxVolts = 0.0
+        # Mean, RMS, min and max over the window, and generated power
+        self.statistics = WindowedStats(statisticsWindow)
+        self.powerMeter = PowerMeter(loadResistance, self.statistics)
+        # Spectrum of the raw voltage, and the worker thread which computes
+        # it. Set by the engine while the spectrum is enabled
+        self.spectrum = None
+        self.spectrumWorker = None
+        # Shares raw data with other plotters, as channel streamIndex. Set
+        # by the engine while sharing
+        self.streamServer = None
+        self.streamIndex = 0
+
+#------------------------------------------------------------------------------
+    def startRecording(self, filePath):
+        """Record every sample to filePath. Raises OSError on failure"""
+        self.sessionRecorder = SessionRecorder(filePath, self.dataSource.startTime)
+
+#------------------------------------------------------------------------------
+    def start(self):
+        """Start background acquisition (or the replay clock)"""
+        self.dataSource.start()
+
+#------------------------------------------------------------------------------
+    def process(self):
+        """Filter, record and index everything received since the last call.
+        Returns the number of new samples"""
+        newTimes, newData = self.dataSource.readAvailable()
+        if len(newData) == 0:
+            return 0
+
+        # Queue raw data for spectrum analysis on the worker thread. The
+        # filters would remove the ripple it looks for
+        if self.spectrumWorker is not None and self.spectrum is not None:
+            self.spectrumWorker.submit(self.spectrum, newTimes, newData)
+
+        # Share raw data. Queued for each client; never waits for them
+        if self.streamServer is not None:
+            tStart = self.monitor.now()
+            self.streamServer.publish(self.streamIndex, newTimes, newData)
+            self.monitor.lap('publish', tStart, len(newData))
+
+        # Filter input data. The whole batch is filtered in one call, with
+        # filter state carried over from the previous batch
+        tStart = self.monitor.now()
+        filteredIn = self.signalFilter.process(newData)
+        tStart = self.monitor.lap('filter', tStart, len(newData))
+
+        # Hand raw and filtered data to the recorder's writer thread, unless
+        # it has failed (reported by recordingError)
+        if self.sessionRecorder is not None and self.sessionRecorder.errorMessage is None:
+            self.sessionRecorder.write(newTimes, newData, filteredIn)
+            tStart = self.monitor.lap('record', tStart, len(newData))
+
+        # Append the whole batch to the history and its index
+        self.pyramid.extend(newTimes, filteredIn)
+        tStart = self.monitor.lap('buffer', tStart, len(newData))
+
+        # Update the windowed statistics, power and energy
+        self.statistics.update(newTimes, filteredIn)
+        self.powerMeter.update(newTimes, filteredIn)
+        self.monitor.lap('statistics', tStart, len(newData))
+        self.monitor.countSamples(self.name, len(newData), self.expectedRate)
+
+        self.latestVolts = filteredIn[-1]
+        self.maxVolts = max(self.maxVolts, filteredIn.max())
+        return len(newData)
+
+#------------------------------------------------------------------------------
+    def stop(self):
+        """Stop acquisition, close the port and finish the recording"""
+        # stop reader thread before closing com port to arduino
+        self.dataSource.stop()
+        if self.serialPort is not None:
+            self.serialPort.close()
+
+        # Take in whatever the reader received before it stopped
+        self.process()
+
+        # write remaining samples and close output file
+        if self.sessionRecorder is not None:
+            self.sessionRecorder.close()
+            self.sessionRecorder = None
+
+#------------------------------------------------------------------------------
+    def reset(self):
+        """Discard history and peak, ready for the next run"""
+        self.pyramid.clear()
+        self.signalFilter.reset()
+        self.latestVolts = 0.0
+        self.maxVolts = 0.0
+        self.statistics.reset()
+        self.powerMeter.reset()
+
+#------------------------------------------------------------------------------
+    def recordingError(self):
+        """Return a description of any recording failure, or None"""
+        if self.sessionRecorder is None:
+            return None
+        return self.sessionRecorder.errorMessage